@@ -0,0 +1,99 @@
+"""Module for the menu API client of the bot."""
+import asyncio
+import logging
+
+import aiohttp
+
+
+class ApiClient:
+    """
+    Pooled asynchronous client for the Django menu API.
+
+    A single keep-alive session is shared by every handler, so requests
+    never block the event loop and reuse open connections.
+
+    Attributes:
+        base_url (str): The base URL of the API, ending with a slash.
+        headers (dict): Headers sent with every request.
+        limit (int): The maximum number of simultaneous connections.
+        timeout (float): The total timeout of a request in seconds.
+        session (aiohttp.ClientSession): The shared session, if started.
+    """
+
+    def __init__(
+        self, base_url: str, headers: dict,
+        limit: int = 100, timeout: float = 1,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            base_url (str): The base URL of the API, ending with a slash.
+            headers (dict): Headers sent with every request.
+            limit (int): The maximum number of simultaneous connections.
+            timeout (float): The total timeout of a request in seconds.
+        """
+        self.base_url = base_url
+        self.headers = headers
+        self.limit = limit
+        self.timeout = timeout
+        self.session = None
+
+    async def start(self) -> None:
+        """Open the shared session with its connection pool."""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit, limit_per_host=self.limit,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+
+    async def close(self) -> None:
+        """Close the shared session and its connections."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def fetch(self, path: str, etag: str = None) -> tuple:
+        """
+        Fetch a JSON document from the API, conditionally on an ETag.
+
+        Args:
+            path (str): The path relative to the base URL.
+            etag (str, optional): The ETag of the copy held by the caller.
+
+        Returns:
+            tuple: The response status (0 if the request failed), the
+            decoded document (None unless the status is 200) and the
+            ETag of the document.
+        """
+        await self.start()
+        request_headers = {'If-None-Match': etag} if etag else {}
+        try:
+            async with self.session.get(
+                self.base_url + path, headers=request_headers,
+            ) as response:
+                if response.status != 200:
+                    if response.status != 304:
+                        logging.warning(f'{path}: status {response.status}')
+                    return response.status, None, etag
+                data = await response.json()
+                return response.status, data, response.headers.get('ETag')
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            logging.warning(f'{path}: {error!r}')
+            return 0, None, etag
+
+    async def get_json(self, path: str):
+        """
+        Fetch a JSON document from the API.
+
+        Args:
+            path (str): The path relative to the base URL.
+
+        Returns:
+            Any: The decoded document, or None if the request failed.
+        """
+        _, data, _ = await self.fetch(path)
+        return data
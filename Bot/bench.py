@@ -0,0 +1,314 @@
+"""Module for the bot navigation benchmark."""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import random
+import tracemalloc
+from datetime import datetime
+from statistics import quantiles
+from time import perf_counter
+
+from aiogram import Bot, types
+from aiogram.client.session.base import BaseSession
+from aiohttp import web
+
+from Bot.api import ApiClient
+from Bot.menu import MenuCache, encode_callback
+from Bot.sender import Sender
+
+
+CHAT_ID = 1
+
+
+def generate_tree(depth: int, fanout: int) -> list:
+    """
+    Generate a synthetic nested menu tree.
+
+    Args:
+        depth (int): The number of levels.
+        fanout (int): The number of roots and of children of every
+            button above the deepest level.
+
+    Returns:
+        list: The root buttons, with nested 'buttons' lists.
+    """
+    next_id = 1
+
+    def build(level: int) -> list:
+        nonlocal next_id
+        nodes = []
+        for _ in range(fanout if level < depth else 0):
+            node = {'id': next_id, 'title': f'Button {next_id}',
+                    'description': f'Level {level + 1} button {next_id}.'}
+            next_id += 1
+            node['buttons'] = build(level + 1)
+            nodes.append(node)
+        return nodes
+
+    return build(0)
+
+
+def create_api_app(tree: list) -> web.Application:
+    """
+    Create a local stand-in for the menu API.
+
+    Serves the tree at /api/masters/ with an ETag and counts requests
+    in app['counters'].
+
+    Args:
+        tree (list): The root buttons to serve.
+
+    Returns:
+        web.Application: The stand-in application.
+    """
+    body = json.dumps(tree, ensure_ascii=False).encode()
+    etag = '"1"'
+
+    async def masters(request: web.Request) -> web.Response:
+        request.app['counters']['requests'] += 1
+        if request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304, headers={'ETag': etag})
+        return web.Response(
+            body=body, content_type='application/json',
+            headers={'ETag': etag},
+        )
+
+    app = web.Application()
+    app['counters'] = {'requests': 0}
+    app.router.add_get('/api/masters/', masters)
+    return app
+
+
+class FakeSession(BaseSession):
+    """Bot session answering every method locally and counting calls."""
+
+    def __init__(self):
+        """Initialize the session."""
+        super().__init__()
+        self.calls = 0
+
+    async def make_request(self, bot, method, timeout=None):
+        """
+        Answer a method with a sent message.
+
+        Args:
+            bot (Bot): The bot calling the method.
+            method: The Telegram method.
+            timeout (int, optional): Unused request timeout.
+
+        Returns:
+            types.Message: The message the method would have sent.
+        """
+        self.calls += 1
+        return types.Message(
+            message_id=self.calls, date=datetime.now(),
+            chat=types.Chat(id=CHAT_ID, type='private'),
+            text=getattr(method, 'text', None),
+        )
+
+    async def stream_content(self, url, headers=None, timeout=30,
+                             chunk_size=65536, raise_for_status=True):
+        """
+        Stream nothing, files are never downloaded by the benchmark.
+
+        Args:
+            url (str): Unused URL.
+            headers (dict, optional): Unused headers.
+            timeout (int): Unused timeout.
+            chunk_size (int): Unused chunk size.
+            raise_for_status (bool): Unused flag.
+
+        Yields:
+            bytes: Nothing.
+        """
+        return
+        yield b''
+
+    async def close(self):
+        """Close the session, which holds no connections."""
+
+
+def get_walks(tree: list, count: int, rng: random.Random) -> list:
+    """
+    Pick random walks from a root down to a leaf.
+
+    Args:
+        tree (list): The root buttons.
+        count (int): The number of walks.
+        rng (random.Random): The random generator.
+
+    Returns:
+        list: The button ids pressed along every walk.
+    """
+    walks = []
+    for _ in range(count):
+        walk, nodes = [], tree
+        while nodes:
+            node = rng.choice(nodes)
+            walk.append(node['id'])
+            nodes = node['buttons']
+        walks.append(walk)
+    return walks
+
+
+def make_callback(bot: Bot, btn_id) -> types.CallbackQuery:
+    """
+    Build the callback query of a button press.
+
+    Args:
+        bot (Bot): The bot the message is bound to.
+        btn_id: The id of the pressed button.
+
+    Returns:
+        types.CallbackQuery: The callback query.
+    """
+    user = types.User(id=CHAT_ID, is_bot=False, first_name='Benchmark')
+    message = types.Message(
+        message_id=1, date=datetime.now(),
+        chat=types.Chat(id=CHAT_ID, type='private'), from_user=user,
+    ).as_(bot)
+    return types.CallbackQuery(
+        id='1', from_user=user, chat_instance='1', message=message,
+        data=encode_callback(btn_id),
+    ).as_(bot)
+
+
+def to_ms(seconds: float) -> float:
+    """
+    Convert seconds to rounded milliseconds.
+
+    Args:
+        seconds (float): The duration in seconds.
+
+    Returns:
+        float: The duration in milliseconds.
+    """
+    return round(seconds * 1000, 3)
+
+
+async def run_benchmark(botik, depth: int, fanout: int,
+                        walks: int, seed: int) -> dict:
+    """
+    Measure handle_button over a synthetic tree.
+
+    Args:
+        botik: The imported bot module.
+        depth (int): The number of levels of the tree.
+        fanout (int): The number of children of every button.
+        walks (int): The number of root to leaf walks.
+        seed (int): The seed of the random walks.
+
+    Returns:
+        dict: The tree shape with cold, revalidation and per press
+        measurements.
+    """
+    tree = generate_tree(depth, fanout)
+    app = create_api_app(tree)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    api = ApiClient(f'http://127.0.0.1:{port}/api/', {}, timeout=60)
+    session = FakeSession()
+    bot = Bot('42:BENCHMARK', session=session)
+    botik.menu = MenuCache(api)
+    botik.sender = Sender(global_rate=1e9, chat_rate=1e9, chat_burst=1e9)
+    presses = get_walks(tree, walks, random.Random(seed))
+    try:
+        tracemalloc.start()
+        start = perf_counter()
+        await botik.handle_button(make_callback(bot, presses[0][0]))
+        cold = perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        start = perf_counter()
+        await botik.menu.refresh()
+        revalidate = perf_counter() - start
+
+        sent, latencies = session.calls, []
+        for walk in presses:
+            for btn_id in walk:
+                callback = make_callback(bot, btn_id)
+                start = perf_counter()
+                await botik.handle_button(callback)
+                latencies.append(perf_counter() - start)
+    finally:
+        await api.close()
+        await runner.cleanup()
+
+    cuts = quantiles(latencies, n=100)
+    return {
+        'depth': depth,
+        'fanout': fanout,
+        'buttons': len(botik.menu.index.nodes),
+        'cold_ms': to_ms(cold),
+        'cold_peak_bytes': peak,
+        'revalidate_ms': to_ms(revalidate),
+        'api_requests': app['counters']['requests'],
+        'presses': len(latencies),
+        'messages': session.calls - sent,
+        'press_p50_ms': to_ms(cuts[49]),
+        'press_p95_ms': to_ms(cuts[94]),
+    }
+
+
+def parse_shape(tree: str) -> tuple:
+    """
+    Parse a tree shape such as '3x10'.
+
+    Args:
+        tree (str): The depth and fanout separated by 'x'.
+
+    Returns:
+        tuple: The depth and the fanout.
+
+    Raises:
+        argparse.ArgumentTypeError: If the shape is malformed.
+    """
+    depth, _, fanout = tree.partition('x')
+    if not (depth.isdigit() and fanout.isdigit()):
+        raise argparse.ArgumentTypeError(f'invalid tree shape: {tree}')
+    return int(depth), int(fanout)
+
+
+async def main():
+    """
+    Run the benchmark and print or write its JSON results.
+
+    The bot module is imported with a placeholder token, a fake Bot
+    session and a local API stand-in, so nothing leaves the machine.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--tree', action='append', type=parse_shape, metavar='DEPTHxFANOUT',
+        help='Tree shape, may be repeated. Defaults to 3x10 and 5x10.',
+    )
+    parser.add_argument('--walks', type=int, default=200,
+                        help='Number of root to leaf walks.')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed of the random walks.')
+    parser.add_argument('--output',
+                        help='Output file, standard output by default.')
+    args = parser.parse_args()
+
+    os.environ.setdefault('BOT_TOKEN', '42:BENCHMARK')
+    botik = importlib.import_module('Bot.botik')
+    results = [
+        await run_benchmark(botik, depth, fanout, args.walks, args.seed)
+        for depth, fanout in args.tree or [(3, 10), (5, 10)]
+    ]
+    document = json.dumps({'bot': results}, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            output.write(document)
+    else:
+        print(document)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -4,12 +4,20 @@ import logging
 import sys
 from os import getenv
 
-import requests
 from aiogram import Bot, Dispatcher, F, types
 from aiogram.filters.command import Command
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from dotenv import load_dotenv
 
+from Bot.api import ApiClient
+from Bot.menu import (
+    CALLBACK_BACK, MenuCache, SnapshotLoader, decode_callback, encode_callback,
+)
+from Bot.notify import create_notify_app, start_notify_server
+from Bot.sender import Sender
+from Bot.webhook import UpdateLimiter, create_webhook_app, run_app
+from Bot.workers import run_ingress
+
 
 load_dotenv()
 USER_TOKEN = getenv('USER_TOKEN')
@@ -19,6 +27,43 @@ headers = {
     'User-Agent': 'Bot User Agent',
     'Authorization': f'Token {USER_TOKEN}',
 }
+api = ApiClient(
+    getenv('API_URL', 'http://host.docker.internal:8000/api/'),
+    headers,
+    limit=int(getenv('API_CONNECTIONS', '100')),
+    timeout=float(getenv('API_TIMEOUT', '1')),
+)
+menu = MenuCache(
+    SnapshotLoader(getenv('MENU_SNAPSHOT_PATH'))
+    if getenv('MENU_SNAPSHOT_PATH') else api,
+    interval=float(getenv('MENU_REFRESH_INTERVAL', '30')),
+)
+sender = Sender(
+    global_rate=float(getenv('SEND_GLOBAL_RATE', '30')),
+    chat_rate=float(getenv('SEND_CHAT_RATE', '1')),
+    chat_burst=float(getenv('SEND_CHAT_BURST', '3')),
+)
+notify_runner = None
+MESSAGE_LENGTH_MAX = 4096
+limiter = UpdateLimiter(int(getenv('BOT_CONCURRENCY', '64')))
+dp.update.outer_middleware(limiter)
+
+
+async def answer(message: types.Message, text: str, **kwargs):
+    """
+    Answer a message through the rate-limited sender.
+
+    Args:
+        message (types.Message): The message to answer in the chat of.
+        text (str): The text of the answer.
+        **kwargs: Additional arguments of Message.answer.
+
+    Returns:
+        types.Message: The sent message.
+    """
+    return await sender.send(
+        message.chat.id, message.answer, text, **kwargs,
+    )
 
 
 @dp.message(Command('start'))
@@ -37,37 +82,21 @@ async def cmd_start(message: types.Message):
 
 async def send_initial_buttons(message_or_callback):
     """
-    Send initial buttons to the user based on data fetched from API.
+    Send initial buttons to the user based on the cached menu tree.
 
     Args:
         message_or_callback (Union[types.Message, types.CallbackQuery]):
         The incoming message or callback query from the user.
     """
-    builder = InlineKeyboardBuilder()
-
-    response = requests.get(
-        'http://host.docker.internal:8000/api/masters/',
-        headers=headers,
-        timeout=1,
-    )
-    if response.status_code == 200:
-        buttons_data = response.json()
-        for button in buttons_data:
-            button_id = button.get('id')
-            button_title = button.get('title')
-            builder.row(types.InlineKeyboardButton(
-                text=button_title, callback_data=f'btn:{button_id}'),
-            )
-        builder.row(types.InlineKeyboardButton(
-            text='НАЗАД', callback_data='btn:back'),
-        )
+    index = await menu.get_index()
+    if index is not None:
+        markup = index.render(None, build_keyboard)
         if isinstance(message_or_callback, types.Message):
-            await message_or_callback.answer('Выберите кнопку:',
-                                             reply_markup=builder.as_markup())
+            await answer(message_or_callback, 'Выберите кнопку:',
+                         reply_markup=markup)
         elif isinstance(message_or_callback, types.CallbackQuery):
-            await message_or_callback.message.answer(
-                'Выберите кнопку:',
-                reply_markup=builder.as_markup())
+            await answer(message_or_callback.message, 'Выберите кнопку:',
+                         reply_markup=markup)
 
 
 @dp.callback_query(F.data.startswith('btn'))
@@ -78,85 +107,140 @@ async def handle_button(callback: types.CallbackQuery):
     Args:
         callback (types.CallbackQuery): Object containing button press data.
 
-    Processes button presses, displays descriptions and buttons fetched from
-    an API. If 'back' button pressed, sends initial buttons.
+    Processes button presses, displays descriptions and buttons from
+    the cached menu tree. If 'back' button pressed, sends initial buttons.
+    A description short enough for one message carries the keyboard.
     """
-    btn_ids = callback.data.split(':')[1:]
-    if 'back' in btn_ids:
+    btn_id = decode_callback(callback.data)
+    if btn_id == CALLBACK_BACK:
         await send_initial_buttons(callback)
         return
 
-    logging.info(btn_ids)
+    logging.info(btn_id)
 
-    response = requests.get(
-        'http://host.docker.internal:8000/api/masters/',
-        headers=headers,
-        timeout=1,
-    )
-    if response.status_code != 200:
-        await callback.message.answer('Не удалось получить список кнопок.')
+    index = await menu.get_index()
+    if index is None:
+        await answer(callback.message, 'Не удалось получить список кнопок.')
         return
 
-    btn = None
-    child_btns = response.json()
-    for btn_id in btn_ids:
-        btn = get_btn_by_id(btn_id, child_btns)
-        if btn is None:
-            await callback.message.answer('Кнопка не найдена.')
-            return
-        child_btns = btn.get('buttons', [])
+    btn = index.get(btn_id) if btn_id else None
+    if btn is None:
+        await answer(callback.message, 'Кнопка не найдена.')
+        return
+    child_btns = btn.get('buttons', [])
+
+    markup = index.render(btn['id'], build_keyboard) if child_btns else None
+    description = btn.get('description', '')
+    if description and child_btns and len(description) <= MESSAGE_LENGTH_MAX:
+        await answer(callback.message, description, parse_mode='markdown',
+                     reply_markup=markup)
+        return
 
-    description = btn.get('description', '') if btn else ''
     if description:
-        await callback.message.answer(description, parse_mode='markdown')
+        await answer(callback.message, description, parse_mode='markdown')
 
     if child_btns:
-        builder = InlineKeyboardBuilder()
-        for child_btn in child_btns:
-            button_id = child_btn.get('id')
-            button_title = child_btn.get('title')
-            builder.row(types.InlineKeyboardButton(
-                text=button_title,
-                callback_data=f'{callback.data}:{button_id}'),
-            )
-        builder.row(types.InlineKeyboardButton(
-            text='НАЗАД', callback_data='btn:back'),
-        )
-        await callback.message.answer('Выберите кнопку:',
-                                      reply_markup=builder.as_markup())
+        await answer(callback.message, 'Выберите кнопку:',
+                     reply_markup=markup)
     elif not description:
-        await callback.message.answer('Описание отсутствует.')
+        await answer(callback.message, 'Описание отсутствует.')
 
 
-def get_btn_by_id(btn_id, data):
+def build_keyboard(child_btns):
     """
-    Retrieve a button from a list of button data based on its ID.
+    Build the inline keyboard of a button.
+
+    Keyboards are memoized per button by the index of the menu tree,
+    so this only runs once per button and tree version.
 
     Args:
-        btn_id (int): The ID of the button to retrieve.
-        data (list): List of dictionaries containing button data.
+        child_btns (list): The child buttons to show.
 
     Returns:
-        dict or None: If a button with the specified ID is found, returns
-        the dictionary representing that button. Otherwise, returns None.
+        types.InlineKeyboardMarkup: One row per child and a back row.
+    """
+    builder = InlineKeyboardBuilder()
+    for child_btn in child_btns:
+        button_id = child_btn.get('id')
+        button_title = child_btn.get('title')
+        builder.row(types.InlineKeyboardButton(
+            text=button_title,
+            callback_data=encode_callback(button_id)),
+        )
+    builder.row(types.InlineKeyboardButton(
+        text='НАЗАД', callback_data=encode_callback(CALLBACK_BACK)),
+    )
+    return builder.as_markup()
+
+
+async def on_startup():
     """
-    for btn_dct in data:
-        btn_full_id = btn_dct.get('id')
-        if int(btn_full_id) == int(btn_id):
-            logging.info(f'{btn_full_id} / id: {btn_id}')
-            return btn_dct
-    return None
+    Open the API session and start refreshing the menu tree.
+
+    Also serves change notifications from Django if MENU_NOTIFY_PORT
+    is set.
+    """
+    global notify_runner
+    await api.start()
+    menu.start()
+    if getenv('MENU_NOTIFY_PORT'):
+        notify_runner = await start_notify_server(
+            create_notify_app(menu, getenv('MENU_NOTIFY_TOKEN', '')),
+            int(getenv('MENU_NOTIFY_PORT')),
+        )
+
+
+async def on_shutdown():
+    """Stop refreshing the menu tree and close the API session."""
+    if notify_runner is not None:
+        await notify_runner.cleanup()
+    await menu.stop()
+    await api.close()
+
+
+dp.startup.register(on_startup)
+dp.shutdown.register(on_shutdown)
 
 
 async def main():
     """
-    Start polling the bot.
+    Start the bot.
 
     Sets up logging, configures logging level to INFO.
-    Initiates bot polling to start receiving updates.
+    Serves updates through a webhook if BOT_MODE is 'webhook', fans
+    them out to BOT_WORKERS processes if BOT_MODE is 'workers' (through
+    a webhook if WEBHOOK_INGRESS is set), otherwise initiates bot
+    polling to start receiving updates.
     """
     logging.basicConfig(level=logging.INFO, stream=sys.stdout)
-    await dp.start_polling(bot)
+    mode = getenv('BOT_MODE', 'polling')
+    webhook = {
+        'path': getenv('WEBHOOK_PATH', '/webhook'),
+        'secret': getenv('WEBHOOK_SECRET'),
+        'url': getenv('WEBHOOK_URL'),
+        'host': getenv('WEBHOOK_HOST', '0.0.0.0'),
+        'port': int(getenv('WEBHOOK_PORT', '8080')),
+    }
+    if mode == 'workers':
+        await run_ingress(
+            bot,
+            workers=int(getenv('BOT_WORKERS', '2')),
+            maxsize=int(getenv('BOT_QUEUE_SIZE', '1000')),
+            retries=int(getenv('BOT_RETRIES', '3')),
+            webhook=webhook if getenv('WEBHOOK_INGRESS') else None,
+            dead_letter_path=getenv('BOT_DEAD_LETTERS'),
+        )
+        return
+
+    if mode == 'webhook':
+        app = create_webhook_app(
+            dp, bot, menu, limiter,
+            path=webhook['path'], secret=webhook['secret'],
+            url=webhook['url'], sender=sender,
+        )
+        await run_app(app, webhook['host'], webhook['port'])
+    else:
+        await dp.start_polling(bot)
 
 if __name__ == '__main__':
     asyncio.run(main())
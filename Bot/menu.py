@@ -0,0 +1,348 @@
+"""Module for the menu tree held by the bot."""
+import asyncio
+import json
+import logging
+import os
+from time import monotonic, time
+
+
+CALLBACK_PREFIX = 'btn'
+CALLBACK_BACK = 'back'
+
+
+def encode_callback(btn_id) -> str:
+    """
+    Encode the callback data of a button.
+
+    Only the target id is encoded, so the size does not grow with
+    the navigation depth.
+
+    Args:
+        btn_id (int or str): The id of the button, or CALLBACK_BACK.
+
+    Returns:
+        str: The callback data, e.g. 'btn:15'.
+    """
+    return f'{CALLBACK_PREFIX}:{btn_id}'
+
+
+def decode_callback(data: str):
+    """
+    Decode the callback data of a button.
+
+    Also accepts the legacy path format 'btn:2:7:15' of keyboards
+    still sitting in chats, whose last element is the target id.
+
+    Args:
+        data (str): The callback data.
+
+    Returns:
+        str or None: The target id, CALLBACK_BACK, or None if the data
+        carries no target.
+    """
+    parts = data.split(':')[1:]
+    if CALLBACK_BACK in parts:
+        return CALLBACK_BACK
+    return parts[-1] if parts else None
+
+
+class MenuIndex:
+    """
+    Id-indexed view of a menu tree.
+
+    Built once per loaded tree, it resolves any button and its parent
+    with a dictionary lookup, independent of depth and fan-out. It also
+    memoizes renderings of the children of a button, such as keyboards,
+    which are thus dropped together with the tree they were built for.
+
+    Attributes:
+        roots (list): The root buttons of the tree.
+        nodes (dict): A mapping of button id to button.
+        parents (dict): A mapping of button id to parent id (None for roots).
+        rendered (dict): A mapping of button id (None for the roots) to
+            the rendering of its children.
+    """
+
+    def __init__(self, roots: list):
+        """
+        Index a tree.
+
+        Args:
+            roots (list): The root buttons of the tree.
+        """
+        self.roots = roots
+        self.nodes = {}
+        self.parents = {}
+        self.rendered = {}
+        stack = [(root, None) for root in roots]
+        while stack:
+            node, parent_id = stack.pop()
+            node_id = int(node['id'])
+            self.nodes[node_id] = node
+            self.parents[node_id] = parent_id
+            stack.extend(
+                (child, node_id) for child in node.get('buttons', [])
+            )
+
+    def get(self, btn_id):
+        """
+        Get a button by its id.
+
+        Args:
+            btn_id (int or str): The id of the button.
+
+        Returns:
+            dict or None: The button, or None if the id is unknown.
+        """
+        try:
+            return self.nodes.get(int(btn_id))
+        except ValueError:
+            return None
+
+    def parent(self, btn_id):
+        """
+        Get the parent of a button.
+
+        Args:
+            btn_id (int or str): The id of the button.
+
+        Returns:
+            dict or None: The parent button, or None for roots and
+            unknown ids.
+        """
+        node = self.get(btn_id)
+        if node is None:
+            return None
+        return self.nodes.get(self.parents[int(node['id'])])
+
+    def render(self, btn_id, build):
+        """
+        Get the memoized rendering of the children of a button.
+
+        Args:
+            btn_id (int or None): The id of a known button, or None for
+                the roots.
+            build (callable): Renders a list of buttons on first use.
+
+        Returns:
+            Any: The rendering of the children.
+        """
+        key = None if btn_id is None else int(btn_id)
+        if key not in self.rendered:
+            children = (
+                self.roots if key is None
+                else self.nodes[key].get('buttons', [])
+            )
+            self.rendered[key] = build(children)
+        return self.rendered[key]
+
+
+class SnapshotLoader:
+    """
+    Source of the menu tree reading a snapshot exported by Django.
+
+    Has the same fetch interface as the API client, so MenuCache can
+    boot from and hot-reload the snapshot without calling the API.
+    The file is only read again when its modification time changes,
+    and the content hash of the snapshot serves as the ETag.
+
+    Attributes:
+        path (str): The snapshot file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the loader.
+
+        Args:
+            path (str): The snapshot file.
+        """
+        self.path = path
+        self._mtime = None
+
+    def read(self) -> dict:
+        """
+        Read and decode the snapshot file.
+
+        Returns:
+            dict: The snapshot document with its hash and tree.
+        """
+        with open(self.path, 'rb') as snapshot:
+            return json.load(snapshot)
+
+    async def fetch(self, path: str, etag: str = None) -> tuple:
+        """
+        Load the snapshot if it changed.
+
+        Args:
+            path (str): Unused, kept for the API client interface.
+            etag (str, optional): The hash of the copy held by the caller.
+
+        Returns:
+            tuple: The status (200, 304, or 0 if the file is unreadable),
+            the tree (None unless the status is 200) and its hash.
+        """
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            if etag is not None and mtime == self._mtime:
+                return 304, None, etag
+            document = await asyncio.to_thread(self.read)
+        except (OSError, ValueError) as error:
+            logging.warning(f'{self.path}: {error!r}')
+            return 0, None, etag
+        self._mtime = mtime
+        if document['hash'] == etag:
+            return 304, None, etag
+        return 200, document['tree'], document['hash']
+
+
+class MenuCache:
+    """
+    In-memory copy of the menu tree with background refresh.
+
+    Handlers read the cached tree immediately; a background task
+    revalidates it against the API (or a SnapshotLoader) with the ETag
+    of the held copy. A failed refresh keeps serving the stale tree.
+
+    Attributes:
+        api (ApiClient): The client used to fetch the tree.
+        path (str): The API path of the tree.
+        interval (float): Seconds between background refreshes.
+        tree (list): The cached list of root buttons, if loaded.
+        index (MenuIndex): The id index of the cached tree, if loaded.
+        etag (str): The ETag of the cached tree.
+        updated (float): Monotonic time of the last successful refresh.
+        propagation (float): Seconds between the last pushed change
+            notification being sent and the tree being refreshed.
+    """
+
+    def __init__(self, api, path: str = 'masters/', interval: float = 30):
+        """
+        Initialize the cache.
+
+        Args:
+            api (ApiClient): The client used to fetch the tree.
+            path (str): The API path of the tree.
+            interval (float): Seconds between background refreshes.
+        """
+        self.api = api
+        self.path = path
+        self.interval = interval
+        self.tree = None
+        self.index = None
+        self.etag = None
+        self.updated = None
+        self.propagation = None
+        self._lock = asyncio.Lock()
+        self._pending = False
+        self._task = None
+
+    async def refresh(self) -> bool:
+        """
+        Revalidate the tree against the API.
+
+        Concurrent callers share the request in flight. As a change may
+        have been committed after that request started, the tree is
+        then fetched once more before the callers are released.
+
+        Returns:
+            bool: True if a new tree was loaded.
+        """
+        if self._lock.locked():
+            etag, self._pending = self.etag, True
+            async with self._lock:
+                return self.etag != etag
+        async with self._lock:
+            loaded = False
+            self._pending = True
+            while self._pending:
+                self._pending = False
+                loaded = await self.fetch() or loaded
+            return loaded
+
+    async def fetch(self) -> bool:
+        """
+        Fetch the tree once, conditionally on the held ETag.
+
+        Returns:
+            bool: True if a new tree was loaded.
+        """
+        status, data, etag = await self.api.fetch(self.path, self.etag)
+        if status == 304:
+            self.updated = monotonic()
+        if status != 200:
+            return False
+        self.index = MenuIndex(data)
+        self.tree, self.etag, self.updated = data, etag, monotonic()
+        logging.info(f'menu tree loaded, etag {etag}')
+        return True
+
+    async def invalidate(self, sent: float = None) -> bool:
+        """
+        Refresh the tree after a pushed change notification.
+
+        Args:
+            sent (float, optional): The UNIX time the notification was
+                sent, used to measure the propagation latency.
+
+        Returns:
+            bool: True if a new tree was loaded.
+        """
+        loaded = await self.refresh()
+        if sent is not None:
+            self.propagation = time() - sent
+            logging.info(f'menu change propagated in {self.propagation:.3f}s')
+        return loaded
+
+    async def get_tree(self):
+        """
+        Get the cached tree, loading it on first use.
+
+        Returns:
+            list or None: The root buttons, or None if the tree has never
+            been loaded.
+        """
+        if self.tree is None:
+            await self.refresh()
+        return self.tree
+
+    async def get_index(self):
+        """
+        Get the index of the cached tree, loading it on first use.
+
+        Returns:
+            MenuIndex or None: The index, or None if the tree has never
+            been loaded.
+        """
+        if self.index is None:
+            await self.refresh()
+        return self.index
+
+    async def run(self) -> None:
+        """
+        Refresh the tree every interval until cancelled.
+
+        A failed refresh is logged and retried at the next interval, so
+        that a malformed response does not stop the refreshes for good.
+        """
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logging.exception('menu refresh failed')
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the background refresh task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Cancel the background refresh task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,66 @@
+"""Module for menu change notifications pushed to the bot."""
+import asyncio
+import hmac
+import logging
+
+from aiohttp import web
+
+
+def create_notify_app(menu, token: str) -> web.Application:
+    """
+    Create the web app receiving menu change notifications.
+
+    Django posts to /menu/changed after every committed Button change;
+    the bot then refreshes its tree in the background.
+
+    Args:
+        menu (MenuCache): The menu tree to refresh.
+        token (str): The shared secret expected in X-Menu-Token.
+
+    Returns:
+        web.Application: The notification app.
+
+    Raises:
+        ValueError: If the token is empty, which would leave the
+            endpoint open.
+    """
+    if not token:
+        raise ValueError('MENU_NOTIFY_TOKEN is required for notifications')
+    expected = token.encode()
+    tasks = set()
+
+    async def changed(request: web.Request) -> web.Response:
+        """Schedule a refresh of the menu tree."""
+        received = request.headers.get('X-Menu-Token', '').encode()
+        if not hmac.compare_digest(received, expected):
+            return web.Response(status=403)
+        try:
+            payload = await request.json()
+        except ValueError:
+            payload = {}
+        logging.info(f'menu change notified: {payload}')
+        task = asyncio.create_task(menu.invalidate(payload.get('sent')))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        return web.Response(status=202)
+
+    app = web.Application()
+    app.router.add_post('/menu/changed', changed)
+    return app
+
+
+async def start_notify_server(app: web.Application, port: int):
+    """
+    Serve the notification app.
+
+    Args:
+        app (web.Application): The notification app.
+        port (int): The port to listen on.
+
+    Returns:
+        web.AppRunner: The runner to clean up on shutdown.
+    """
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, port=port).start()
+    return runner
@@ -0,0 +1,180 @@
+"""Module for rate-limited outbound Telegram calls."""
+import asyncio
+import logging
+from time import monotonic
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at a constant rate.
+
+    Tokens are reserved ahead, so concurrent callers are spaced out
+    instead of all waking up at once.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        capacity (float): The maximum number of stored tokens (burst).
+        tokens (float): The current number of tokens, negative when
+            tokens are reserved ahead.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock=monotonic):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate (float): Tokens added per second.
+            capacity (float): The maximum number of stored tokens.
+            clock (callable): The source of the current time in seconds.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def refill(self) -> None:
+        """Add the tokens accumulated since the last update."""
+        now = self._clock()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate,
+        )
+        self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Take a token.
+
+        Returns:
+            float: Seconds to wait before the token may be used.
+        """
+        self.refill()
+        self.tokens -= 1
+        return max(0, -self.tokens / self.rate)
+
+    def is_full(self) -> bool:
+        """
+        Check whether the bucket is idle.
+
+        Returns:
+            bool: True if the bucket holds its whole capacity.
+        """
+        self.refill()
+        return self.tokens >= self.capacity
+
+
+class Sender:
+    """
+    Scheduler of outbound calls within Telegram flood limits.
+
+    Every call waits for a token of the global bucket and of the bucket
+    of its chat. Calls rejected with a retry_after (HTTP 429) are
+    retried after the requested delay.
+
+    Attributes:
+        global_bucket (TokenBucket): The bucket shared by all chats.
+        chat_rate (float): Messages per second allowed in a chat.
+        chat_burst (float): Messages a chat may send at once.
+        retries (int): The number of retries after a retry_after.
+    """
+
+    max_idle_chats = 10000
+
+    def __init__(
+        self, global_rate: float = 30, chat_rate: float = 1,
+        chat_burst: float = 3, retries: int = 3,
+    ):
+        """
+        Initialize the sender.
+
+        Args:
+            global_rate (float): Messages per second for the whole bot.
+            chat_rate (float): Messages per second allowed in a chat.
+            chat_burst (float): Messages a chat may send at once.
+            retries (int): The number of retries after a retry_after.
+        """
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.retries = retries
+        self._chats = {}
+        self._counters = dict.fromkeys(
+            ('pending', 'sent', 'throttled', 'retries'), 0,
+        )
+        self._delay = 0.0
+
+    def get_chat_bucket(self, chat_id: int) -> TokenBucket:
+        """
+        Get the bucket of a chat, dropping idle buckets when too many.
+
+        Args:
+            chat_id (int): The id of the chat.
+
+        Returns:
+            TokenBucket: The bucket of the chat.
+        """
+        if chat_id not in self._chats:
+            if len(self._chats) >= self.max_idle_chats:
+                self._chats = {
+                    key: bucket for key, bucket in self._chats.items()
+                    if not bucket.is_full()
+                }
+            self._chats[chat_id] = TokenBucket(
+                self.chat_rate, self.chat_burst,
+            )
+        return self._chats[chat_id]
+
+    async def send(self, chat_id: int, method, *args, **kwargs):
+        """
+        Call a Telegram method once both buckets allow it.
+
+        Args:
+            chat_id (int): The chat the call sends to.
+            method (callable): Coroutine function performing the call,
+                e.g. message.answer.
+            *args: Positional arguments of the method.
+            **kwargs: Keyword arguments of the method.
+
+        Returns:
+            Any: The result of the method.
+
+        Raises:
+            Exception: The error of the method, once the retries after
+                retry_after responses are exhausted.
+        """
+        self._counters['pending'] += 1
+        try:
+            for attempt in range(self.retries + 1):
+                delay = max(
+                    self.global_bucket.reserve(),
+                    self.get_chat_bucket(chat_id).reserve(),
+                )
+                if delay:
+                    self._counters['throttled'] += 1
+                    self._delay += delay
+                    await asyncio.sleep(delay)
+                try:
+                    result = await method(*args, **kwargs)
+                except Exception as error:
+                    retry_after = getattr(error, 'retry_after', None)
+                    if retry_after is None or attempt == self.retries:
+                        raise
+                    logging.warning(f'chat {chat_id}: retry in {retry_after}s')
+                    self._counters['retries'] += 1
+                    await asyncio.sleep(retry_after)
+                    continue
+                self._counters['sent'] += 1
+                return result
+        finally:
+            self._counters['pending'] -= 1
+
+    def stats(self) -> dict:
+        """
+        Get the sender metrics.
+
+        Returns:
+            dict: The queue depth (calls waiting or in progress), sent
+            calls, calls delayed by the buckets, retries after 429 and
+            the total delay in seconds.
+        """
+        return {**self._counters, 'delay': round(self._delay, 3)}
@@ -0,0 +1,221 @@
+"""Module for fanning Telegram updates out to worker processes."""
+import asyncio
+import logging
+import queue
+
+
+STOP = None
+
+
+def get_chat_id(update: dict):
+    """
+    Get the chat an update belongs to.
+
+    Args:
+        update (dict): The raw Telegram update.
+
+    Returns:
+        int or None: The chat id, the sender id for updates without
+        a chat, or None if neither is present.
+    """
+    for kind, body in update.items():
+        if not isinstance(body, dict):
+            continue
+        chat = body.get('chat') or (body.get('message') or {}).get('chat')
+        if chat:
+            return chat['id']
+        if body.get('from'):
+            return body['from']['id']
+    return None
+
+
+def partition_of(update: dict, partitions: int) -> int:
+    """
+    Get the partition of an update.
+
+    Every update of a chat lands in the same partition, so a single
+    worker handles it and the per-chat order is kept.
+
+    Args:
+        update (dict): The raw Telegram update.
+        partitions (int): The number of partitions.
+
+    Returns:
+        int: The partition index.
+    """
+    key = get_chat_id(update)
+    if key is None:
+        key = update.get('update_id', 0)
+    return key % partitions
+
+
+class QueueBackend:
+    """
+    Bounded partitioned queues of updates with a dead-letter queue.
+
+    The queue factory makes the backend pluggable: queue.Queue keeps
+    everything in process (e.g. for tests), while the Queue of a
+    multiprocessing context shares the queues with worker processes.
+
+    Attributes:
+        partitions (int): The number of partition queues.
+        queues (list): The partition queues.
+        dead_letters: The queue of updates that could not be handled.
+    """
+
+    def __init__(self, partitions: int, maxsize: int, factory=queue.Queue):
+        """
+        Initialize the backend.
+
+        Args:
+            partitions (int): The number of partition queues.
+            maxsize (int): The capacity of every partition queue.
+            factory (callable): Creates a queue from its maxsize.
+        """
+        self.partitions = partitions
+        self.queues = [factory(maxsize) for _ in range(partitions)]
+        self.dead_letters = factory(0)
+
+    def put(self, partition: int, item, timeout: float = None) -> None:
+        """
+        Enqueue an item, waiting for free capacity.
+
+        Args:
+            partition (int): The partition index.
+            item: The update, or STOP to end the worker.
+            timeout (float, optional): Seconds to wait for capacity.
+
+        Raises:
+            queue.Full: If the partition is still full after the timeout.
+        """
+        self.queues[partition].put(item, timeout=timeout)
+
+    def get(self, partition: int, timeout: float = None):
+        """
+        Dequeue an item.
+
+        Args:
+            partition (int): The partition index.
+            timeout (float, optional): Seconds to wait for an item.
+
+        Returns:
+            Any: The update, or STOP.
+
+        Raises:
+            queue.Empty: If no item arrived before the timeout.
+        """
+        return self.queues[partition].get(timeout=timeout)
+
+
+class Ingress:
+    """
+    Entry point routing incoming updates to the worker partitions.
+
+    Attributes:
+        backend (QueueBackend): The queues shared with the workers.
+        timeout (float): Seconds to wait for capacity before rejecting
+            an update, which applies back-pressure to Telegram.
+    """
+
+    def __init__(self, backend: QueueBackend, timeout: float = 5):
+        """
+        Initialize the ingress.
+
+        Args:
+            backend (QueueBackend): The queues shared with the workers.
+            timeout (float): Seconds to wait for capacity.
+        """
+        self.backend = backend
+        self.timeout = timeout
+
+    async def dispatch(self, update: dict) -> bool:
+        """
+        Route an update to the partition of its chat.
+
+        Args:
+            update (dict): The raw Telegram update.
+
+        Returns:
+            bool: False if the partition stayed full, so the update has
+            to be delivered again later.
+        """
+        partition = partition_of(update, self.backend.partitions)
+        try:
+            await asyncio.to_thread(
+                self.backend.put, partition, update, self.timeout,
+            )
+        except queue.Full:
+            logging.warning(f'partition {partition} is full')
+            return False
+        return True
+
+    async def stop(self) -> list:
+        """
+        Ask every worker to stop once its queue is drained.
+
+        Returns:
+            list: The partitions that stayed full for the timeout, whose
+            workers did not get the request, e.g. because they died.
+        """
+        stuck = []
+        for partition in range(self.backend.partitions):
+            try:
+                await asyncio.to_thread(
+                    self.backend.put, partition, STOP, self.timeout,
+                )
+            except queue.Full:
+                logging.warning(f'partition {partition} did not take STOP')
+                stuck.append(partition)
+        return stuck
+
+    def dead_letters(self) -> list:
+        """
+        Take the updates the workers gave up on.
+
+        Returns:
+            list: Tuples of the update and the last error.
+        """
+        letters = []
+        while True:
+            try:
+                letters.append(self.backend.dead_letters.get_nowait())
+            except queue.Empty:
+                return letters
+
+
+async def consume(
+    backend: QueueBackend, partition: int, handle, retries: int = 3,
+    sent=None,
+) -> None:
+    """
+    Handle the updates of a partition one by one until STOP.
+
+    An update failing every attempt goes to the dead-letter queue. So
+    does an update that failed after sending a message, without being
+    retried, as a retry would send the message again.
+
+    Args:
+        backend (QueueBackend): The queues shared with the ingress.
+        partition (int): The partition index.
+        handle (callable): Coroutine function handling a raw update.
+        retries (int): The number of attempts per update.
+        sent (callable, optional): Returns the number of messages sent
+            so far by the handlers. Every failure is retried without it.
+    """
+    while True:
+        try:
+            update = await asyncio.to_thread(backend.get, partition, 1)
+        except queue.Empty:
+            continue
+        if update is STOP:
+            return
+        for attempt in range(1, retries + 1):
+            before = sent() if sent else 0
+            try:
+                await handle(update)
+                break
+            except Exception as error:
+                logging.exception(f'update failed, attempt {attempt}')
+                if attempt == retries or (sent and sent() != before):
+                    backend.dead_letters.put((update, repr(error)))
+                    break
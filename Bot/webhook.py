@@ -0,0 +1,150 @@
+"""Module for serving the bot through a webhook."""
+import asyncio
+import logging
+import signal
+
+from aiogram import BaseMiddleware
+from aiogram.webhook.aiohttp_server import (
+    SimpleRequestHandler, setup_application,
+)
+from aiohttp import web
+
+
+class UpdateLimiter(BaseMiddleware):
+    """
+    Outer update middleware bounding the number of concurrent handlers.
+
+    Attributes:
+        limit (int): The maximum number of updates handled at once.
+        in_flight (int): The number of updates being handled or
+            waiting for a slot.
+    """
+
+    def __init__(self, limit: int):
+        """
+        Initialize the limiter.
+
+        Args:
+            limit (int): The maximum number of updates handled at once.
+        """
+        self.limit = limit
+        self.in_flight = 0
+        self._semaphore = asyncio.Semaphore(limit)
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    async def __call__(self, handler, event, data):
+        """
+        Handle an update once a slot is free.
+
+        Args:
+            handler: The next handler of the chain.
+            event: The incoming update.
+            data (dict): The context data of the update.
+
+        Returns:
+            Any: The result of the handler.
+        """
+        self.in_flight += 1
+        self._idle.clear()
+        try:
+            async with self._semaphore:
+                return await handler(event, data)
+        finally:
+            self.in_flight -= 1
+            if not self.in_flight:
+                self._idle.set()
+
+    async def drain(self, timeout: float) -> None:
+        """
+        Wait for the updates in flight to finish.
+
+        Args:
+            timeout (float): The maximum number of seconds to wait.
+        """
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            logging.warning(f'{self.in_flight} updates dropped on shutdown')
+
+
+def create_webhook_app(
+    dp, bot, menu, limiter: UpdateLimiter,
+    path: str, secret: str = None, url: str = None,
+    drain_timeout: float = 10, sender=None,
+) -> web.Application:
+    """
+    Create the aiohttp app serving the bot webhook.
+
+    Updates are acknowledged immediately and handled in background
+    tasks, bounded by the limiter. On shutdown the app stops taking
+    updates, waits for the ones in flight and then runs the
+    dispatcher shutdown hooks.
+
+    Args:
+        dp (Dispatcher): The dispatcher with the handlers.
+        bot (Bot): The bot receiving the updates.
+        menu (MenuCache): The menu tree, reported by the health check.
+        limiter (UpdateLimiter): The limiter of concurrent handlers.
+        path (str): The path of the webhook endpoint.
+        secret (str, optional): The secret token expected from Telegram.
+        url (str, optional): The public base URL to register the
+            webhook at on startup.
+        drain_timeout (float): Seconds to wait for updates on shutdown.
+        sender (Sender, optional): The outbound sender whose metrics
+            the health check reports.
+
+    Returns:
+        web.Application: The webhook app.
+    """
+    async def health(request: web.Request) -> web.Response:
+        """Report readiness: the menu tree is loaded."""
+        ready = menu.tree is not None
+        report = {'ready': ready, 'in_flight': limiter.in_flight}
+        if sender is not None:
+            report['sender'] = sender.stats()
+        return web.json_response(report, status=200 if ready else 503)
+
+    async def register_webhook(app: web.Application) -> None:
+        """Point Telegram at this webhook."""
+        await bot.set_webhook(f'{url}{path}', secret_token=secret)
+
+    async def drain(app: web.Application) -> None:
+        """Wait for the updates in flight."""
+        await limiter.drain(drain_timeout)
+
+    app = web.Application()
+    app.router.add_get('/health', health)
+    app.on_shutdown.append(drain)
+    SimpleRequestHandler(
+        dispatcher=dp, bot=bot, secret_token=secret,
+        handle_in_background=True,
+    ).register(app, path=path)
+    setup_application(app, dp, bot=bot)
+    if url:
+        app.on_startup.append(register_webhook)
+    return app
+
+
+async def run_app(app: web.Application, host: str, port: int) -> None:
+    """
+    Serve an app until SIGINT or SIGTERM, then shut it down gracefully.
+
+    Args:
+        app (web.Application): The app to serve.
+        host (str): The interface to listen on.
+        port (int): The port to listen on.
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logging.info(f'webhook listening on {host}:{port}')
+    try:
+        await stop.wait()
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,198 @@
+"""Module for running the bot as an ingress with worker processes."""
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+
+from aiogram.exceptions import (
+    TelegramNetworkError, TelegramRetryAfter, TelegramServerError,
+)
+from aiohttp import web
+
+from Bot.updates import Ingress, QueueBackend, consume
+from Bot.webhook import run_app
+
+
+def run_worker(backend: QueueBackend, partition: int, retries: int) -> None:
+    """
+    Run the handlers of the bot for one partition in this process.
+
+    Args:
+        backend (QueueBackend): The queues shared with the ingress.
+        partition (int): The partition index served by this worker.
+        retries (int): The number of attempts per update.
+    """
+    from Bot import botik
+
+    # A single port cannot serve change notifications for every worker,
+    # so workers rely on the periodic refresh of the menu tree.
+    os.environ.pop('MENU_NOTIFY_PORT', None)
+
+    async def work():
+        logging.basicConfig(level=logging.INFO)
+        await botik.dp.emit_startup(bot=botik.bot)
+        try:
+            await consume(
+                backend, partition,
+                lambda update: botik.dp.feed_raw_update(botik.bot, update),
+                retries, sent=lambda: botik.sender.stats()['sent'],
+            )
+        finally:
+            await botik.dp.emit_shutdown(bot=botik.bot)
+            await botik.bot.session.close()
+
+    asyncio.run(work())
+
+
+async def poll_updates(
+    bot, ingress: Ingress, backoff: float = 1, backoff_max: float = 60,
+) -> None:
+    """
+    Long-poll Telegram and hand every update to the ingress.
+
+    A webhook left over from the webhook mode is deleted first, as
+    Telegram refuses to poll while one is set. An update is only
+    acknowledged once it is queued, so a full partition pauses polling
+    instead of dropping updates. Network and server errors are retried
+    with exponential backoff, as aiogram's own polling does.
+
+    Args:
+        bot (Bot): The bot to poll updates for.
+        ingress (Ingress): The ingress routing the updates.
+        backoff (float): The first delay in seconds after an error.
+        backoff_max (float): The longest delay in seconds.
+    """
+    await bot.delete_webhook()
+    offset = None
+    delay = backoff
+    while True:
+        try:
+            updates = await bot.get_updates(offset=offset, timeout=30)
+        except TelegramRetryAfter as error:
+            await asyncio.sleep(error.retry_after)
+            continue
+        except (TelegramNetworkError, TelegramServerError) as error:
+            logging.warning(f'polling failed, retrying in {delay}s: {error}')
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, backoff_max)
+            continue
+        delay = backoff
+        for update in updates:
+            raw = update.model_dump(mode='json', exclude_unset=True)
+            while not await ingress.dispatch(raw):
+                await asyncio.sleep(1)
+            offset = update.update_id + 1
+
+
+def create_ingress_app(
+    ingress: Ingress, path: str, secret: str = None,
+) -> web.Application:
+    """
+    Create the webhook app of the ingress.
+
+    Args:
+        ingress (Ingress): The ingress routing the updates.
+        path (str): The path of the webhook endpoint.
+        secret (str, optional): The secret token expected from Telegram.
+
+    Returns:
+        web.Application: The ingress app. It answers 503 while the
+        target partition is full, so Telegram delivers the update again.
+    """
+    async def receive(request: web.Request) -> web.Response:
+        """Queue an update from Telegram."""
+        token = request.headers.get('X-Telegram-Bot-Api-Secret-Token')
+        if secret and token != secret:
+            return web.Response(status=401)
+        if not await ingress.dispatch(await request.json()):
+            return web.Response(status=503)
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_post(path, receive)
+    return app
+
+
+async def report_dead_letters(ingress: Ingress, path: str = None) -> None:
+    """
+    Log the updates the workers gave up on, every few seconds.
+
+    Args:
+        ingress (Ingress): The ingress owning the dead-letter queue.
+        path (str, optional): A JSON lines file to append them to.
+    """
+    while True:
+        await asyncio.sleep(5)
+        letters = ingress.dead_letters()
+        for update, error in letters:
+            logging.error(f'dead letter {update.get("update_id")}: {error}')
+        if letters and path:
+            with open(path, 'a') as dead_letters:
+                for update, error in letters:
+                    dead_letters.write(
+                        json.dumps({'update': update, 'error': error}) + '\n',
+                    )
+
+
+async def run_ingress(
+    bot, workers: int, maxsize: int, retries: int,
+    webhook: dict = None, dead_letter_path: str = None,
+    join_timeout: float = 30,
+) -> None:
+    """
+    Receive updates and fan them out to worker processes.
+
+    Args:
+        bot (Bot): The bot receiving the updates.
+        workers (int): The number of worker processes.
+        maxsize (int): The capacity of every worker queue.
+        retries (int): The number of attempts per update.
+        webhook (dict, optional): The path, secret, host, port and
+            public url of the ingress webhook. Long polling is used
+            without it.
+        dead_letter_path (str, optional): A JSON lines file for the
+            updates the workers gave up on.
+        join_timeout (float): Seconds to wait for every worker to drain
+            its queue on shutdown before terminating it.
+    """
+    context = multiprocessing.get_context('spawn')
+    backend = QueueBackend(workers, maxsize, factory=context.Queue)
+    ingress = Ingress(backend)
+    processes = [
+        context.Process(
+            target=run_worker, args=(backend, partition, retries),
+            daemon=True,
+        )
+        for partition in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    reporter = asyncio.create_task(
+        report_dead_letters(ingress, dead_letter_path),
+    )
+    try:
+        if webhook:
+            if webhook.get('url'):
+                await bot.set_webhook(
+                    f'{webhook["url"]}{webhook["path"]}',
+                    secret_token=webhook.get('secret'),
+                )
+            await run_app(
+                create_ingress_app(
+                    ingress, webhook['path'], webhook.get('secret'),
+                ),
+                webhook['host'], webhook['port'],
+            )
+        else:
+            await poll_updates(bot, ingress)
+    finally:
+        reporter.cancel()
+        await ingress.stop()
+        for process in processes:
+            await asyncio.to_thread(process.join, join_timeout)
+            if process.is_alive():
+                logging.warning(f'worker {process.pid} did not stop')
+                process.terminate()
+        await bot.session.close()
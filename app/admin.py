@@ -9,12 +9,14 @@ class ButtonAdmin(admin.ModelAdmin):
     """
     Admin configuration for the Button model.
 
-    Displays specific fields in the admin interface and marks
+    Displays specific fields in the admin interface, lets the
+    sibling position be edited from the list view and marks
     'created' field as read-only.
 
     Attributes:
         model (Button): The model associated with this admin.
         list_display (tuple): Fields to display in the admin list view.
+        list_editable (tuple): Fields editable in the admin list view.
         readonly_fields (tuple): Fields marked as
         read-only in the admin interface.
     """
@@ -34,6 +36,8 @@ class ButtonAdmin(admin.ModelAdmin):
         'title',
         'description',
         'parent_id',
+        'position',
         'created',
     )
+    list_editable = ('position',)
     readonly_fields = ('created',)
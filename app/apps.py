@@ -14,3 +14,9 @@ class AppConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app'
+
+    def ready(self):
+        """Connect the signal handlers of the app and check the cache."""
+        from . import signals  # noqa: F401
+        from .cache import check_shared_backend
+        check_shared_backend()
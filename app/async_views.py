@@ -0,0 +1,201 @@
+"""Module async_views for app."""
+from asgiref.sync import sync_to_async
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.authtoken.models import Token
+
+from .authentication import token_cache
+from .cache import tree_cache
+from .encoding import encode_body, encoded_response
+from .middleware import timed_serialization
+from .models import Button
+from .serializers import ButtonSerializer, get_children_map
+from .views import ButtonViewSet, MasterViewSet
+
+
+master_list = MasterViewSet.as_view({'get': 'list', 'post': 'create'})
+button_detail = ButtonViewSet.as_view({
+    'get': 'retrieve',
+    'put': 'update',
+    'patch': 'partial_update',
+    'delete': 'destroy',
+})
+
+
+async def call_cache(method, *args):
+    """
+    Call a tree cache method from async code.
+
+    The ASGI mode requires a shared backend, see check_shared_backend,
+    so the method runs in a thread and does not block the event loop.
+
+    Args:
+        method (callable): The bound tree cache method.
+        *args: Positional arguments of the method.
+
+    Returns:
+        Any: The result of the method.
+    """
+    return await sync_to_async(method)(*args)
+
+
+async def is_authenticated(request) -> bool:
+    """
+    Check the token of a request with the token cache or the async ORM.
+
+    Mirrors CachedTokenAuthentication with MyPermission for safe
+    methods.
+
+    Args:
+        request: The HTTP request object.
+
+    Returns:
+        bool: True if the token belongs to an active user.
+    """
+    auth = request.headers.get('Authorization', '').split()
+    if len(auth) != 2 or auth[0].lower() != 'token':
+        return False
+    if token_cache.get(auth[1]) is not None:
+        return True
+    token = await Token.objects.select_related('user').filter(
+        key=auth[1],
+    ).afirst()
+    if token is None or not token.user.is_active:
+        return False
+    token_cache.set(auth[1], (token.user, token))
+    return True
+
+
+def is_plain_read(request) -> bool:
+    """
+    Check whether a request is a plain JSON read of the tree.
+
+    Args:
+        request: The HTTP request object.
+
+    Returns:
+        bool: True for GET and HEAD without query parameters from
+        clients that do not ask for the browsable API.
+    """
+    if request.method not in ('GET', 'HEAD') or request.GET:
+        return False
+    return 'text/html' not in request.headers.get('Accept', '')
+
+
+async def load_masters():
+    """
+    Render every root button with its descendants.
+
+    Returns:
+        ReturnList: The serialized roots.
+    """
+    buttons = [button async for button in Button.objects.all()]
+    with timed_serialization():
+        children = get_children_map(buttons)
+        return ButtonSerializer(
+            children.get(None, []), many=True,
+            context={'children': children},
+        ).data
+
+
+async def load_button(pk: int):
+    """
+    Render a button with its descendants.
+
+    Args:
+        pk (int): The id of the button.
+
+    Returns:
+        ReturnDict: The serialized button.
+
+    Raises:
+        Button.DoesNotExist: If the button does not exist.
+    """
+    root = await Button.objects.aget(pk=pk)
+    descendants = [button async for button in root.descendants()]
+    with timed_serialization():
+        return ButtonSerializer(
+            root, context={'children': get_children_map(descendants)},
+        ).data
+
+
+async def cached_response(request, key: str, load):
+    """
+    Serve a tree from the tree cache, rendering it on a miss.
+
+    Entries are shared with the viewsets, which use the same keys. As
+    there, conditional requests are answered with 304 once the tree is
+    known to render, so a missing button is not hidden by a 304.
+
+    Args:
+        request: The HTTP request object.
+        key (str): The cache key within the tree version.
+        load (callable): Coroutine function rendering the tree.
+
+    Returns:
+        HttpResponse: The JSON response, or a 304 response.
+    """
+    version, modified = await call_cache(tree_cache.get_validators)
+    key = f'json:{key}'
+    encoded = await call_cache(tree_cache.lookup, key, version)
+    if encoded is None:
+        data = await load()
+        with timed_serialization():
+            encoded = encode_body(data)
+        await call_cache(tree_cache.store, key, version, encoded)
+
+    etag = quote_etag(str(version))
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=int(modified),
+    )
+    if not_modified is not None:
+        return not_modified
+    return encoded_response(request, encoded, {
+        'ETag': etag,
+        'Last-Modified': http_date(modified),
+        'Vary': 'Accept',
+    })
+
+
+@csrf_exempt
+async def masters(request):
+    """
+    Serve the root buttons on the async path.
+
+    Anything but an authenticated plain read is passed to the viewset.
+
+    Args:
+        request: The HTTP request object.
+
+    Returns:
+        HttpResponse: The response with the serialized roots.
+    """
+    if is_plain_read(request) and await is_authenticated(request):
+        return await cached_response(request, 'master:list::', load_masters)
+    return await sync_to_async(master_list)(request)
+
+
+@csrf_exempt
+async def button(request, pk: int):
+    """
+    Serve a button with its descendants on the async path.
+
+    Anything but an authenticated plain read of an existing button is
+    passed to the viewset.
+
+    Args:
+        request: The HTTP request object.
+        pk (int): The id of the button.
+
+    Returns:
+        HttpResponse: The response with the serialized button.
+    """
+    if is_plain_read(request) and await is_authenticated(request):
+        try:
+            return await cached_response(
+                request, f'button:retrieve:{pk}:', lambda: load_button(pk),
+            )
+        except Button.DoesNotExist:
+            pass
+    return await sync_to_async(button_detail)(request, pk=str(pk))
@@ -0,0 +1,146 @@
+"""Module authentication for app."""
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+from rest_framework.authentication import TokenAuthentication
+
+
+class TokenCache:
+    """
+    Bounded cache of authenticated tokens.
+
+    Entries expire after a fixed lifetime and the least recently used
+    ones are evicted first. The Token and User signals drop entries as
+    soon as a token is deleted or its user changes, but only in the
+    process handling the change: other workers keep accepting the token
+    until their entry expires, so the lifetime bounds the revocation
+    lag and is kept short.
+
+    Attributes:
+        max_entries (int): The maximum number of cached tokens.
+        timeout (float): The lifetime of an entry in seconds.
+    """
+
+    def __init__(self, max_entries: int, timeout: float):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): The maximum number of cached tokens.
+            timeout (float): The lifetime of an entry in seconds.
+        """
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._counters = dict.fromkeys(('hits', 'misses', 'evictions'), 0)
+
+    def get(self, key: str):
+        """
+        Get the cached user and token of a key.
+
+        Args:
+            key (str): The token key.
+
+        Returns:
+            tuple | None: The user and the token, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < monotonic():
+                self._entries.pop(key, None)
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            return entry[1]
+
+    def set(self, key: str, credentials: tuple) -> None:
+        """
+        Cache the user and token of a key.
+
+        Args:
+            key (str): The token key.
+            credentials (tuple): The user and the token.
+        """
+        with self._lock:
+            self._entries[key] = (monotonic() + self.timeout, credentials)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def discard(self, key: str) -> None:
+        """
+        Drop the entry of a key.
+
+        Args:
+            key (str): The token key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard_user(self, user_id: int) -> None:
+        """
+        Drop every entry of a user.
+
+        Args:
+            user_id (int): The id of the user.
+        """
+        with self._lock:
+            for key, (_, (user, _)) in list(self._entries.items()):
+                if user.pk == user_id:
+                    del self._entries[key]
+
+    def stats(self) -> dict:
+        """
+        Get the cache counters.
+
+        Returns:
+            dict: Hit, miss and eviction counters with the current size.
+        """
+        with self._lock:
+            return {**self._counters, 'size': len(self._entries)}
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            for counter in self._counters:
+                self._counters[counter] = 0
+
+
+token_cache = TokenCache(
+    settings.MENU_AUTH_CACHE_ENTRIES, settings.MENU_AUTH_CACHE_TIMEOUT,
+)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication remembering recently authenticated tokens.
+
+    Answers the same users and errors as TokenAuthentication while
+    saving the Token and User query for repeated tokens.
+    """
+
+    def authenticate_credentials(self, key):
+        """
+        Authenticate a token key, from the token cache if possible.
+
+        Args:
+            key (str): The token key.
+
+        Returns:
+            tuple: The user and the token.
+
+        Raises:
+            AuthenticationFailed: If the token is invalid or the user
+                is inactive.
+        """
+        credentials = token_cache.get(key)
+        if credentials is None:
+            credentials = super().authenticate_credentials(key)
+            token_cache.set(key, credentials)
+        return credentials
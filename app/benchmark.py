@@ -0,0 +1,162 @@
+"""Module benchmark for app."""
+import tracemalloc
+from statistics import quantiles
+from time import perf_counter
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+
+from .authentication import token_cache
+from .bulk import import_rows
+from .cache import tree_cache
+
+
+def generate_rows(depth: int, fanout: int) -> list:
+    """
+    Generate a synthetic tree as import rows.
+
+    Every button but the deepest ones has fanout children, and there
+    are fanout roots.
+
+    Args:
+        depth (int): The number of levels.
+        fanout (int): The number of children of every button.
+
+    Returns:
+        list: The rows of every button, parents first.
+    """
+    rows = []
+    parents = [None]
+    for level in range(depth):
+        children = []
+        for parent_id in parents:
+            for position in range(fanout):
+                pk = len(rows) + 1
+                rows.append({
+                    'id': pk,
+                    'title': f'Button {pk}',
+                    'description': f'Level {level + 1} button {pk}.',
+                    'parent_id': parent_id,
+                    'position': position,
+                })
+                children.append(pk)
+        parents = children
+    return rows
+
+
+def to_ms(seconds: float) -> float:
+    """
+    Convert seconds to rounded milliseconds.
+
+    Args:
+        seconds (float): The duration in seconds.
+
+    Returns:
+        float: The duration in milliseconds.
+    """
+    return round(seconds * 1000, 3)
+
+
+def clear_caches() -> None:
+    """Clear the tree and token caches before a cold request."""
+    tree_cache.clear()
+    token_cache.clear()
+
+
+def get_peak_memory(client: Client, path: str) -> int:
+    """
+    Get the peak of memory allocated by a cold request.
+
+    Args:
+        client (Client): The authenticated test client.
+        path (str): The requested path.
+
+    Returns:
+        int: The peak of allocated memory in bytes.
+    """
+    clear_caches()
+    tracemalloc.start()
+    try:
+        client.get(path)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(client: Client, path: str, repeat: int) -> dict:
+    """
+    Measure a cold request and repeated warm requests of a path.
+
+    Args:
+        client (Client): The authenticated test client.
+        path (str): The requested path.
+        repeat (int): The number of warm requests, at least 2.
+
+    Returns:
+        dict: Query counts, latencies in milliseconds, the peak of
+        allocated memory in bytes and the response size.
+    """
+    clear_caches()
+    with CaptureQueriesContext(connection) as cold_queries:
+        start = perf_counter()
+        response = client.get(path)
+        cold = perf_counter() - start
+
+    latencies = []
+    with CaptureQueriesContext(connection) as warm_queries:
+        for _ in range(repeat):
+            start = perf_counter()
+            client.get(path)
+            latencies.append(perf_counter() - start)
+    cuts = quantiles(latencies, n=100)
+    return {
+        'path': path,
+        'status': response.status_code,
+        'bytes': len(response.content),
+        'cold_queries': len(cold_queries),
+        'warm_queries': len(warm_queries) / repeat,
+        'cold_ms': to_ms(cold),
+        'warm_p50_ms': to_ms(cuts[49]),
+        'warm_p95_ms': to_ms(cuts[94]),
+        'cold_peak_bytes': get_peak_memory(client, path),
+    }
+
+
+def run_benchmark(depth: int, fanout: int, repeat: int) -> dict:
+    """
+    Load a synthetic tree and measure the tree endpoints.
+
+    Replaces every button of the current database, so it should run
+    against a scratch database.
+
+    Args:
+        depth (int): The number of levels of the tree.
+        fanout (int): The number of children of every button.
+        repeat (int): The number of warm requests per endpoint.
+
+    Returns:
+        dict: The tree shape, the import time and one result per
+        endpoint.
+    """
+    rows = generate_rows(depth, fanout)
+    start = perf_counter()
+    import_rows(rows, delete_missing=True)
+    imported = perf_counter() - start
+
+    user, _ = User.objects.get_or_create(username='benchmark')
+    token, _ = Token.objects.get_or_create(user=user)
+    client = Client(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return {
+        'depth': depth,
+        'fanout': fanout,
+        'buttons': len(rows),
+        'import_ms': to_ms(imported),
+        'results': [
+            measure(client, '/api/masters/', repeat),
+            measure(client, '/api/buttons/1/', repeat),
+            measure(client, '/api/buttons/1/children/?depth=1', repeat),
+        ],
+    }
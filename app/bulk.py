@@ -0,0 +1,305 @@
+"""Module bulk for app."""
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from .models import (
+    DEPTH_MAX, DESCRIPTION_LENGTH_MAX, ID_MAX, POSITION_MAX,
+    TITLE_LENGTH_MAX, Button, rebuild_paths,
+)
+from .signals import tree_changed
+
+
+FIELDS = ('title', 'description', 'parent_id', 'position')
+
+
+def iter_export(flat: bool = True):
+    """
+    Stream every button as a JSON document.
+
+    Args:
+        flat (bool): Emit a flat list referencing parents by id instead
+            of nested 'buttons' lists.
+
+    Yields:
+        str: Consecutive chunks of the JSON document.
+    """
+    rows = Button.objects.values('id', 'title', 'description',
+                                 'parent_id', 'position')
+    if flat:
+        yield '['
+        for index, row in enumerate(rows.iterator(chunk_size=1000)):
+            yield (',' if index else '') + json.dumps(
+                row, ensure_ascii=False,
+            )
+        yield ']'
+        return
+
+    children = {}
+    for row in rows:
+        children.setdefault(row.pop('parent_id'), []).append(row)
+    for nodes in children.values():
+        for node in nodes:
+            node['buttons'] = children.get(node['id'], [])
+    yield '['
+    for index, root in enumerate(children.get(None, [])):
+        yield (',' if index else '') + json.dumps(root, ensure_ascii=False)
+    yield ']'
+
+
+def flatten(nodes: list, parent_id=None) -> list:
+    """
+    Flatten a nested document into rows referencing parents by id.
+
+    Malformed nodes are kept as they are, for validate_rows to report.
+
+    Args:
+        nodes (list): Buttons, possibly with nested 'buttons' lists.
+        parent_id (int, optional): The parent of the given buttons.
+
+    Returns:
+        list: The rows of every button of the document.
+    """
+    rows = []
+    stack = [(node, parent_id) for node in reversed(nodes)]
+    while stack:
+        node, parent = stack.pop()
+        if not isinstance(node, dict):
+            rows.append(node)
+            continue
+        children = node.get('buttons') or []
+        if not isinstance(children, list):
+            # Left in the row for validate_row to report.
+            rows.append(node)
+            continue
+        row = {key: value for key, value in node.items() if key != 'buttons'}
+        if 'buttons' in node or parent is not None:
+            row['parent_id'] = parent
+        rows.append(row)
+        stack.extend((child, row.get('id')) for child in reversed(children))
+    return rows
+
+
+def is_in_range(value, minimum: int, maximum: int) -> bool:
+    """
+    Check that a value is an integer within a column range.
+
+    Args:
+        value: The value to check.
+        minimum (int): The smallest allowed value.
+        maximum (int): The largest allowed value.
+
+    Returns:
+        bool: True for an integer from minimum to maximum.
+    """
+    if isinstance(value, bool) or not isinstance(value, int):
+        return False
+    return minimum <= value <= maximum
+
+
+def validate_row(number: int, row: dict) -> list:
+    """
+    Validate the fields of a single import row.
+
+    Args:
+        number (int): The index of the row in the document.
+        row (dict): The row to validate.
+
+    Returns:
+        list: The error messages of the row.
+    """
+    if not isinstance(row, dict):
+        return [f'row {number}: expected an object']
+    pk = row.get('id')
+    if not is_in_range(pk, 1, ID_MAX):
+        return [f'row {number}: id must be an integer from 1 to {ID_MAX}']
+    errors = []
+    if 'buttons' in row:
+        errors.append(f'button {pk}: buttons must be a list')
+    parent_id = row.get('parent_id')
+    if parent_id is not None and not is_in_range(parent_id, 1, ID_MAX):
+        errors.append(f'button {pk}: parent_id must be null or an id')
+    if not is_in_range(row.get('position', 0), 0, POSITION_MAX):
+        errors.append(
+            f'button {pk}: position must be an integer from 0 to '
+            f'{POSITION_MAX}',
+        )
+    title = row.get('title')
+    if not isinstance(title, str) or not title:
+        errors.append(f'button {pk}: title is required')
+    elif len(title) > TITLE_LENGTH_MAX:
+        errors.append(f'button {pk}: title is too long')
+    description = row.get('description')
+    if not isinstance(description, (str, type(None))):
+        errors.append(f'button {pk}: description must be a string')
+    elif len(description or '') > DESCRIPTION_LENGTH_MAX:
+        errors.append(f'button {pk}: description is too long')
+    return errors
+
+
+def validate_parents(parents: dict, known: dict) -> list:
+    """
+    Validate the parent references of the import rows.
+
+    Args:
+        parents (dict): A mapping of imported id to parent id.
+        known (dict): A mapping of the ids of buttons kept in the
+            database to their parent ids.
+
+    Returns:
+        list: The error messages of unknown parents, cycles and
+        buttons nested deeper than DEPTH_MAX.
+    """
+    errors = []
+    chain = {**known, **parents}
+    for pk, parent_id in parents.items():
+        if parent_id is not None and parent_id not in chain:
+            errors.append(f'button {pk}: unknown parent {parent_id}')
+            continue
+        seen = {pk}
+        while parent_id is not None:
+            if parent_id in seen:
+                errors.append(f'button {pk}: parents form a cycle')
+                break
+            seen.add(parent_id)
+            parent_id = chain.get(parent_id)
+        else:
+            if len(seen) - 1 > DEPTH_MAX:
+                errors.append(
+                    f'button {pk}: nested deeper than {DEPTH_MAX} levels',
+                )
+    return errors
+
+
+def validate_rows(rows: list, known: dict) -> dict:
+    """
+    Validate import rows before anything is written.
+
+    Args:
+        rows (list): The flat rows to import.
+        known (dict): A mapping of the ids of buttons kept in the
+            database, which rows may reference as parents, to their
+            parent ids.
+
+    Returns:
+        dict: The normalized fields of the rows by id.
+
+    Raises:
+        ValidationError: If a row is malformed, an id is duplicated, a
+            parent does not exist, the parents form a cycle or the tree
+            is too deep.
+    """
+    errors = []
+    by_id = {}
+    invalid = set()
+    for number, row in enumerate(rows):
+        row_errors = validate_row(number, row)
+        errors.extend(row_errors)
+        if not isinstance(row, dict):
+            continue
+        if not is_in_range(row.get('id'), 1, ID_MAX):
+            continue
+        if row_errors:
+            invalid.add(row['id'])
+        if row['id'] in by_id:
+            errors.append(f'row {number}: duplicated id {row["id"]}')
+        by_id[row['id']] = {
+            'title': row.get('title'),
+            'description': row.get('description'),
+            'parent_id': row.get('parent_id'),
+            'position': row.get('position', 0),
+        }
+    # Malformed parent ids are already reported and cannot be followed.
+    parents = {
+        pk: None if pk in invalid else fields['parent_id']
+        for pk, fields in by_id.items()
+    }
+    errors.extend(validate_parents(parents, known))
+    if errors:
+        raise ValidationError(errors)
+    return by_id
+
+
+def get_fields(button: Button) -> dict:
+    """
+    Get the imported fields of a stored button.
+
+    Args:
+        button (Button): The stored button.
+
+    Returns:
+        dict: The fields in the normalized form of validate_rows.
+    """
+    return {
+        'title': button.title,
+        'description': button.description,
+        'parent_id': button.parent_id_id,
+        'position': button.position,
+    }
+
+
+def import_rows(rows: list, delete_missing: bool = False) -> dict:
+    """
+    Import buttons in a single transaction, skipping unchanged rows.
+
+    New buttons are inserted with bulk_create and changed ones written
+    with bulk_update; materialized paths are then rebuilt once and the
+    tree change is signalled once the import is committed.
+
+    Args:
+        rows (list): The flat rows to import, each with an id.
+        delete_missing (bool): Delete the buttons absent from the rows.
+
+    Returns:
+        dict: The numbers of created, updated, unchanged and deleted
+        buttons.
+
+    Raises:
+        ValidationError: If the rows are invalid; nothing is written.
+    """
+    with transaction.atomic():
+        existing = {button.pk: button for button in Button.objects.all()}
+        kept = {} if delete_missing else {
+            pk: button.parent_id_id for pk, button in existing.items()
+        }
+        by_id = validate_rows(rows, kept)
+
+        created, updated = [], []
+        for pk, fields in by_id.items():
+            button = existing.get(pk)
+            if button is None:
+                button = Button(pk=pk)
+                created.append(button)
+            elif get_fields(button) != fields:
+                updated.append(button)
+            else:
+                continue
+            button.title = fields['title']
+            button.description = fields['description']
+            button.parent_id_id = fields['parent_id']
+            button.position = fields['position']
+
+        missing = set(existing) - set(by_id) if delete_missing else set()
+        Button.objects.bulk_create(created)
+        Button.objects.bulk_update(updated, FIELDS)
+        Button.objects.filter(pk__in=missing).delete()
+        if created:
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(
+                    no_style(), [Button],
+                ):
+                    cursor.execute(sql)
+        if created or updated or missing:
+            rebuild_paths(Button)
+            transaction.on_commit(
+                lambda: tree_changed.send(sender=Button),
+            )
+
+    return {
+        'created': len(created),
+        'updated': len(updated),
+        'unchanged': len(by_id) - len(created) - len(updated),
+        'deleted': len(missing),
+    }
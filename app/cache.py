@@ -0,0 +1,216 @@
+"""Module cache for app."""
+from collections import OrderedDict
+from threading import Lock
+from time import time, time_ns
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+
+
+VERSION_KEY = 'menu:version'
+MODIFIED_KEY = 'menu:modified'
+
+
+class TreeCache:
+    """
+    Versioned cache of the rendered menu tree.
+
+    Rendered values are kept in a small in-process LRU in front of
+    a Django cache backend, which may be shared between workers.
+    Every key is prefixed with the tree version, so bumping the
+    version invalidates all entries at once.
+
+    Attributes:
+        alias (str): The Django cache alias of the shared backend.
+        max_entries (int): The size of the in-process LRU.
+        timeout (int): The lifetime of shared entries in seconds.
+    """
+
+    def __init__(self, alias: str, max_entries: int, timeout: int):
+        """
+        Initialize the cache.
+
+        Args:
+            alias (str): The Django cache alias of the shared backend.
+            max_entries (int): The size of the in-process LRU.
+            timeout (int): The lifetime of shared entries in seconds.
+        """
+        self.alias = alias
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._local = OrderedDict()
+        self._lock = Lock()
+        self._counters = dict.fromkeys(
+            ('local_hits', 'shared_hits', 'misses', 'evictions'), 0,
+        )
+
+    @property
+    def backend(self):
+        """
+        Get the shared cache backend.
+
+        Returns:
+            BaseCache: The Django cache for the configured alias.
+        """
+        return caches[self.alias]
+
+    def get_version(self) -> int:
+        """
+        Get the current tree version.
+
+        The version is seeded with a timestamp, so a lost version key
+        never brings back entries rendered for an older tree.
+
+        Returns:
+            int: The current tree version.
+        """
+        version = self.backend.get(VERSION_KEY)
+        if version is None:
+            self.backend.add(MODIFIED_KEY, time(), timeout=None)
+            self.backend.add(VERSION_KEY, time_ns(), timeout=None)
+            version = self.backend.get(VERSION_KEY)
+        return version
+
+    def get_validators(self) -> tuple[int, float]:
+        """
+        Get the validators of the current tree without rendering it.
+
+        Returns:
+            tuple[int, float]: The tree version and the timestamp of
+            the last change known to the cache.
+        """
+        version = self.get_version()
+        modified = self.backend.get(MODIFIED_KEY)
+        if modified is None:
+            modified = time()
+            self.backend.add(MODIFIED_KEY, modified, timeout=None)
+        return version, modified
+
+    def bump_version(self) -> None:
+        """Invalidate every cached tree by moving to a new version."""
+        self.backend.set(MODIFIED_KEY, time(), timeout=None)
+        try:
+            self.backend.incr(VERSION_KEY)
+        except ValueError:
+            self.backend.set(VERSION_KEY, time_ns(), timeout=None)
+        with self._lock:
+            self._local.clear()
+
+    def lookup(self, key: str, version: int):
+        """
+        Get a cached value of a tree version without rendering it.
+
+        Args:
+            key (str): The key of the value within the tree version.
+            version (int): The tree version the value belongs to.
+
+        Returns:
+            Any: The cached value, or None on a miss.
+        """
+        full_key = f'menu:{version}:{key}'
+        with self._lock:
+            if full_key in self._local:
+                self._local.move_to_end(full_key)
+                self._counters['local_hits'] += 1
+                return self._local[full_key]
+
+        value = self.backend.get(full_key)
+        if value is not None:
+            self._keep(full_key, value, 'shared_hits')
+        return value
+
+    def store(self, key: str, version: int, value) -> None:
+        """
+        Store a freshly rendered value of a tree version.
+
+        Args:
+            key (str): The key of the value within the tree version.
+            version (int): The tree version the value was rendered for.
+            value: The rendered value.
+        """
+        full_key = f'menu:{version}:{key}'
+        self.backend.set(full_key, value, timeout=self.timeout)
+        self._keep(full_key, value, 'misses')
+
+    def _keep(self, full_key: str, value, counter: str) -> None:
+        """
+        Keep a value in the in-process LRU.
+
+        Args:
+            full_key (str): The versioned key of the value.
+            value: The value to keep.
+            counter (str): The counter to increment.
+        """
+        with self._lock:
+            self._counters[counter] += 1
+            self._local[full_key] = value
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def get_or_render(self, key: str, render):
+        """
+        Get a cached value or render and store it.
+
+        Args:
+            key (str): The key of the value within the tree version.
+            render (callable): Callable producing the value on a miss.
+
+        Returns:
+            Any: The cached or freshly rendered value.
+        """
+        version = self.get_version()
+        value = self.lookup(key, version)
+        if value is None:
+            value = render()
+            self.store(key, version, value)
+        return value
+
+    def stats(self) -> dict:
+        """
+        Get the cache counters.
+
+        Returns:
+            dict: Hit, miss and eviction counters with the current size
+            of the in-process LRU.
+        """
+        with self._lock:
+            return {**self._counters, 'local_size': len(self._local)}
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self.backend.delete_many([VERSION_KEY, MODIFIED_KEY])
+        with self._lock:
+            self._local.clear()
+            for counter in self._counters:
+                self._counters[counter] = 0
+
+
+def check_shared_backend() -> None:
+    """
+    Check that every worker sees the same tree version.
+
+    The version lives in the menu cache backend, so with a per-process
+    backend a write would only invalidate the worker that handled it.
+    A single worker, WSGI or ASGI, may keep the version in process.
+
+    Raises:
+        ImproperlyConfigured: If several workers use a LocMemCache.
+    """
+    if not isinstance(caches[settings.MENU_CACHE_ALIAS], LocMemCache):
+        return
+    if settings.WEB_CONCURRENCY > 1:
+        raise ImproperlyConfigured(
+            'WEB_CONCURRENCY > 1 requires a shared MENU_CACHE_BACKEND, '
+            'such as django.core.cache.backends.db.DatabaseCache, whose table '
+            'MENU_CACHE_LOCATION is created by the startup command.',
+        )
+
+
+tree_cache = TreeCache(
+    settings.MENU_CACHE_ALIAS,
+    settings.MENU_CACHE_LOCAL_ENTRIES,
+    settings.MENU_CACHE_TIMEOUT,
+)
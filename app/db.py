@@ -0,0 +1,109 @@
+"""Module db for app."""
+from threading import Lock
+
+from django.conf import settings
+from django.db import connections
+
+
+def prepare_db(self):
+    """
+    Prepare the database.
+
+    Connects to the database and creates the 'django_db'
+    schema if it does not exist. Installed as the prepare_database
+    hook of connections before test databases are created.
+
+    Args:
+        self: The database wrapper to prepare.
+    """
+    self.connect()
+    self.connection.cursor().execute('CREATE SCHEMA IF NOT EXISTS django_db;')
+
+
+def get_connection_info(connection) -> dict:
+    """
+    Get the persistence settings and the state of a connection.
+
+    Args:
+        connection: The database wrapper of an alias.
+
+    Returns:
+        dict: The connection settings and whether it is open.
+    """
+    settings_dict = connection.settings_dict
+    return {
+        'conn_max_age': settings_dict['CONN_MAX_AGE'],
+        'conn_health_checks': settings_dict['CONN_HEALTH_CHECKS'],
+        'server_side_cursors': not settings_dict.get(
+            'DISABLE_SERVER_SIDE_CURSORS', False,
+        ),
+        'connected': connection.connection is not None,
+    }
+
+
+class ConnectionStats:
+    """
+    Counters of database connections opened by this process.
+
+    With persistent connections most requests reuse the connection of
+    their worker, so the number of opened connections should stay far
+    below the number of served requests. The counters are kept per
+    process, as are the connections themselves.
+    """
+
+    def __init__(self):
+        """Initialize the counters."""
+        self._lock = Lock()
+        self._counters = dict.fromkeys(('opened', 'requests'), 0)
+
+    def connection_opened(self, sender, **kwargs) -> None:
+        """
+        Count a new connection, connected to connection_created.
+
+        Args:
+            sender: The database wrapper class that sent the signal.
+            **kwargs: Additional keyword arguments of the signal.
+        """
+        with self._lock:
+            self._counters['opened'] += 1
+
+    def request_finished(self, sender, **kwargs) -> None:
+        """
+        Count a served request, connected to request_finished.
+
+        Args:
+            sender: The handler class that sent the signal.
+            **kwargs: Additional keyword arguments of the signal.
+        """
+        with self._lock:
+            self._counters['requests'] += 1
+
+    def stats(self) -> dict:
+        """
+        Get the connection counters and settings.
+
+        Returns:
+            dict: Opened connections, served requests, the share of
+            requests which reused a connection, and the connection
+            settings of every database alias.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+        requests = counters['requests']
+        reused = requests - min(counters['opened'], requests)
+        counters['reuse_ratio'] = reused / requests if requests else 0.0
+        counters['databases'] = {
+            alias: get_connection_info(connections[alias])
+            for alias in settings.DATABASES
+        }
+        counters['pooler'] = settings.POSTGRES_POOLER or None
+        return counters
+
+    def clear(self) -> None:
+        """Reset the counters."""
+        with self._lock:
+            for counter in self._counters:
+                self._counters[counter] = 0
+
+
+connection_stats = ConnectionStats()
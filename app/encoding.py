@@ -0,0 +1,116 @@
+"""Module encoding for app."""
+import gzip
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def encode_body(data) -> dict:
+    """
+    Encode data once for every supported content coding.
+
+    Bodies shorter than MENU_COMPRESS_MIN_SIZE are kept uncompressed.
+
+    Args:
+        data: The serialized data.
+
+    Returns:
+        dict: A mapping of content coding to the encoded JSON body,
+        'identity' being the uncompressed one.
+    """
+    body = JSONRenderer().render(data)
+    encoded = {'identity': body}
+    if not settings.MENU_COMPRESS:
+        return encoded
+    if len(body) >= settings.MENU_COMPRESS_MIN_SIZE:
+        encoded['gzip'] = gzip.compress(body, mtime=0)
+        if brotli is not None:
+            encoded['br'] = brotli.compress(body)
+    return encoded
+
+
+def get_qualities(header: str) -> dict:
+    """
+    Parse the quality values of an Accept-Encoding header.
+
+    Args:
+        header (str): The Accept-Encoding header.
+
+    Returns:
+        dict: A mapping of lowercase content coding to its quality,
+        a malformed quality counting as 0.
+    """
+    qualities = {}
+    for item in header.split(','):
+        coding, *params = item.split(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities
+
+
+def get_encoding(request, encoded: dict) -> str:
+    """
+    Choose the content coding of a response.
+
+    The accepted coding with the highest quality wins, br before gzip
+    on a tie. Codings with a quality of 0 are never chosen, and the
+    uncompressed body is the fallback.
+
+    Args:
+        request: The HTTP request object.
+        encoded (dict): The encoded bodies by content coding.
+
+    Returns:
+        str: The preferred coding accepted by the client.
+    """
+    qualities = get_qualities(request.headers.get('Accept-Encoding', ''))
+    chosen, best = 'identity', 0.0
+    for coding in ('br', 'gzip'):
+        quality = qualities.get(coding, qualities.get('*', 0.0))
+        if coding in encoded and quality > best:
+            chosen, best = coding, quality
+    return chosen
+
+
+def encoded_response(request, encoded: dict, headers: dict) -> HttpResponse:
+    """
+    Build a JSON response from a pre-encoded body.
+
+    Compressed responses get a weak ETag, as their bytes differ from
+    the uncompressed representation.
+
+    Args:
+        request: The HTTP request object.
+        encoded (dict): The encoded bodies by content coding.
+        headers (dict): Extra headers, with the ETag of the tree.
+
+    Returns:
+        HttpResponse: The response with the chosen body.
+    """
+    coding = get_encoding(request, encoded)
+    response = HttpResponse(
+        encoded[coding], content_type='application/json', headers=headers,
+    )
+    if len(encoded) > 1:
+        patch_vary_headers(response, ['Accept-Encoding'])
+    if coding != 'identity':
+        response['Content-Encoding'] = coding
+        response['ETag'] = f'W/{response["ETag"]}'
+    return response
@@ -0,0 +1 @@
+"""Module for init in management."""
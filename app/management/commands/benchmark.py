@@ -0,0 +1,119 @@
+"""Module for the benchmark command."""
+import json
+from types import MethodType
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from app.benchmark import run_benchmark
+from app.db import prepare_db
+from app.models import DEPTH_MAX, ID_MAX
+
+
+class Command(BaseCommand):
+    """Measure the tree endpoints on synthetic trees."""
+
+    help = (
+        'Measure query counts, latency and memory of the tree endpoints '
+        'on synthetic trees, in a throwaway benchmark_<NAME> database.'
+    )
+
+    def add_arguments(self, parser):
+        """
+        Add the arguments of the command.
+
+        Args:
+            parser: The argument parser of the command.
+        """
+        parser.add_argument(
+            '--tree', action='append', metavar='DEPTHxFANOUT',
+            help='Tree shape, may be repeated. Defaults to 3x10 and 4x10, '
+                 f'about 1k and 11k buttons; at most {ID_MAX} buttons.',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='Number of warm requests per endpoint.',
+        )
+        parser.add_argument(
+            '--output', help='Output file, standard output by default.',
+        )
+        parser.add_argument(
+            '--noinput', '--no-input', action='store_false',
+            dest='interactive',
+            help='Delete a leftover benchmark database without asking.',
+        )
+
+    def get_shapes(self, trees: list) -> list:
+        """
+        Parse the requested tree shapes.
+
+        Args:
+            trees (list): Shapes such as '3x10', or None.
+
+        Returns:
+            list: Tuples of depth and fanout.
+
+        Raises:
+            CommandError: If a shape is malformed or does not fit the
+                id range or the depth limit of buttons.
+        """
+        shapes = []
+        for tree in trees or ('3x10', '4x10'):
+            depth, _, fanout = tree.partition('x')
+            if not (depth.isdigit() and fanout.isdigit()):
+                raise CommandError(f'Invalid tree shape: {tree}')
+            depth, fanout = int(depth), int(fanout)
+            if not (1 <= depth <= DEPTH_MAX + 1 and fanout >= 1):
+                raise CommandError(
+                    f'Invalid tree shape: {tree}, the depth must be from 1 '
+                    f'to {DEPTH_MAX + 1} and the fanout at least 1.',
+                )
+            count = sum(fanout ** level for level in range(1, depth + 1))
+            if count > ID_MAX:
+                raise CommandError(
+                    f'Tree shape {tree} has {count} buttons, more than '
+                    f'the {ID_MAX} ids of buttons.',
+                )
+            shapes.append((depth, fanout))
+        return shapes
+
+    def handle(self, *args, **options):
+        """
+        Run the command.
+
+        The benchmark replaces every button, so it runs in a dedicated
+        benchmark_<NAME> database, created with the django_db schema
+        and destroyed afterwards.
+
+        Args:
+            *args: Positional arguments of the command.
+            **options: Options of the command.
+
+        Raises:
+            CommandError: If fewer than 2 warm requests are asked for.
+        """
+        if options['repeat'] < 2:
+            raise CommandError('--repeat must be at least 2.')
+        shapes = self.get_shapes(options['tree'])
+        test_settings = connection.settings_dict['TEST']
+        test_settings['NAME'] = (
+            f'benchmark_{connection.settings_dict["NAME"]}'
+        )
+        connection.prepare_database = MethodType(prepare_db, connection)
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=not options['interactive'],
+        )
+        try:
+            results = [
+                run_benchmark(depth, fanout, options['repeat'])
+                for depth, fanout in shapes
+            ]
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        document = json.dumps({'api': results}, indent=2)
+        if not options['output']:
+            self.stdout.write(document)
+            return
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            output.write(document)
@@ -0,0 +1,39 @@
+"""Module for the export_menu command."""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app.snapshot import write_snapshot
+
+
+class Command(BaseCommand):
+    """Export the rendered menu tree into a snapshot file for the bot."""
+
+    help = 'Export the rendered menu tree into a snapshot file for the bot.'
+
+    def add_arguments(self, parser):
+        """
+        Add the arguments of the command.
+
+        Args:
+            parser: The argument parser of the command.
+        """
+        parser.add_argument(
+            '--output', default=settings.MENU_SNAPSHOT_PATH,
+            help='Snapshot file, MENU_SNAPSHOT_PATH by default.',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Run the command.
+
+        Args:
+            *args: Positional arguments of the command.
+            **options: Options of the command.
+
+        Raises:
+            CommandError: If no output file is configured.
+        """
+        if not options['output']:
+            raise CommandError('set --output or MENU_SNAPSHOT_PATH')
+        content_hash = write_snapshot(options['output'])
+        self.stdout.write(f'Exported {options["output"]} ({content_hash}).')
@@ -0,0 +1,42 @@
+"""Module for the export_tree command."""
+import sys
+
+from django.core.management.base import BaseCommand
+
+from app.bulk import iter_export
+
+
+class Command(BaseCommand):
+    """Export every button as a JSON document for import_tree."""
+
+    help = 'Export every button as a JSON document for import_tree.'
+
+    def add_arguments(self, parser):
+        """
+        Add the arguments of the command.
+
+        Args:
+            parser: The argument parser of the command.
+        """
+        parser.add_argument(
+            '--output', help='Output file, standard output by default.',
+        )
+        parser.add_argument(
+            '--nested', action='store_true',
+            help='Nest children instead of referencing parents by id.',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Run the command.
+
+        Args:
+            *args: Positional arguments of the command.
+            **options: Options of the command.
+        """
+        chunks = iter_export(flat=not options['nested'])
+        if not options['output']:
+            sys.stdout.writelines(chunks)
+            return
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            output.writelines(chunks)
@@ -0,0 +1,50 @@
+"""Module for the import_tree command."""
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from app.bulk import flatten, import_rows
+
+
+class Command(BaseCommand):
+    """Import a flat or nested JSON document of buttons."""
+
+    help = 'Import a flat or nested JSON document of buttons.'
+
+    def add_arguments(self, parser):
+        """
+        Add the arguments of the command.
+
+        Args:
+            parser: The argument parser of the command.
+        """
+        parser.add_argument('input', help='The JSON document to import.')
+        parser.add_argument(
+            '--delete-missing', action='store_true',
+            help='Delete the buttons absent from the document.',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Run the command.
+
+        Args:
+            *args: Positional arguments of the command.
+            **options: Options of the command.
+
+        Raises:
+            CommandError: If the document is invalid.
+        """
+        with open(options['input'], encoding='utf-8') as document:
+            data = json.load(document)
+        try:
+            stats = import_rows(
+                flatten(data), delete_missing=options['delete_missing'],
+            )
+        except ValidationError as error:
+            raise CommandError('\n'.join(error.messages))
+        self.stdout.write(
+            'Created {created}, updated {updated}, unchanged {unchanged}, '
+            'deleted {deleted} buttons.'.format(**stats),
+        )
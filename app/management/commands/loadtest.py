@@ -0,0 +1,111 @@
+"""Module for the loadtest command."""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from statistics import quantiles
+from time import perf_counter
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand
+
+
+def run_client(url: str, token: str, requests: int) -> list[float]:
+    """
+    Send requests over one keep-alive connection.
+
+    A request failing at the connection level counts as an error, and
+    the next request opens a new connection.
+
+    Args:
+        url (str): The requested URL.
+        token (str): The API token, may be empty.
+        requests (int): The number of requests to send.
+
+    Returns:
+        list[float]: The latency of every successful request in seconds.
+    """
+    parts = urlsplit(url)
+    headers = {'Accept': 'application/json'}
+    if token:
+        headers['Authorization'] = f'Token {token}'
+    target = parts.path or '/'
+    if parts.query:
+        target += f'?{parts.query}'
+    if parts.scheme == 'https':
+        connection = HTTPSConnection(parts.hostname, parts.port or 443)
+    else:
+        connection = HTTPConnection(parts.hostname, parts.port or 80)
+    latencies = []
+    for _ in range(requests):
+        start = perf_counter()
+        try:
+            connection.request('GET', target, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, HTTPException):
+            connection.close()
+            continue
+        if response.status == 200:
+            latencies.append(perf_counter() - start)
+        if response.getheader('Connection', '').lower() == 'close':
+            connection.close()
+    connection.close()
+    return latencies
+
+
+class Command(BaseCommand):
+    """Measure the throughput and latency of a running API server."""
+
+    help = (
+        'Send concurrent GET requests to a running server, e.g. to compare '
+        'the WSGI and ASGI modes at the same worker count.'
+    )
+
+    def add_arguments(self, parser):
+        """
+        Add the arguments of the command.
+
+        Args:
+            parser: The argument parser of the command.
+        """
+        parser.add_argument('urls', nargs='+', help='URLs to request.')
+        parser.add_argument('--token', default='', help='API token.')
+        parser.add_argument(
+            '--concurrency', type=int, default=16,
+            help='Number of concurrent connections per URL.',
+        )
+        parser.add_argument(
+            '--requests', type=int, default=100,
+            help='Number of requests per connection.',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Run the command and print one JSON line per URL.
+
+        Args:
+            *args: Positional arguments of the command.
+            **options: Options of the command.
+        """
+        concurrency = options['concurrency']
+        for url in options['urls']:
+            start = perf_counter()
+            with ThreadPoolExecutor(concurrency) as executor:
+                results = executor.map(
+                    run_client,
+                    [url] * concurrency,
+                    [options['token']] * concurrency,
+                    [options['requests']] * concurrency,
+                )
+                latencies = sorted(sum(results, []))
+            elapsed = perf_counter() - start
+            sent = concurrency * options['requests']
+            cuts = quantiles(latencies, n=100) if len(latencies) > 1 else []
+            self.stdout.write(json.dumps({
+                'url': url,
+                'requests': sent,
+                'errors': sent - len(latencies),
+                'rps': round(len(latencies) / elapsed, 1),
+                'p50_ms': round(cuts[49] * 1000, 2) if cuts else None,
+                'p99_ms': round(cuts[98] * 1000, 2) if cuts else None,
+            }))
@@ -0,0 +1,28 @@
+"""Module for the rebuild_paths command."""
+from django.core.management.base import BaseCommand
+
+from app.cache import tree_cache
+from app.models import Button, rebuild_paths
+
+
+class Command(BaseCommand):
+    """
+    Recompute the materialized paths of every button.
+
+    Needed after raw loads such as loaddata, which bypass Button.save.
+    """
+
+    help = 'Recompute the materialized paths of every button.'
+
+    def handle(self, *args, **options):
+        """
+        Run the command.
+
+        Args:
+            *args: Positional arguments of the command.
+            **options: Options of the command.
+        """
+        changed = rebuild_paths(Button)
+        if changed:
+            tree_cache.bump_version()
+        self.stdout.write(f'Rebuilt paths of {changed} buttons.')
@@ -0,0 +1,105 @@
+"""Module for the startup command."""
+from hashlib import sha256
+from pathlib import Path
+from time import perf_counter
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+from app.models import Button, get_datetime, rebuild_paths
+from app.signals import tree_changed
+
+
+STATE_TABLE = '"django_db"."fixture_state"'
+
+
+class Command(BaseCommand):
+    """
+    Prepare the database for serving, doing only what changed.
+
+    Migrations are applied only if some are pending and the fixture is
+    loaded only if its content hash differs from the last loaded one,
+    as recorded in the fixture_state table. The tables of database
+    cache backends are created if missing.
+    """
+
+    help = 'Apply pending migrations and load the fixture if it changed.'
+
+    def add_arguments(self, parser):
+        """
+        Add the arguments of the command.
+
+        Args:
+            parser: The argument parser of the command.
+        """
+        parser.add_argument(
+            'fixtures', nargs='*', default=['fixture.json'],
+            help='Fixture files to load when their content changed.',
+        )
+
+    def migrate(self) -> bool:
+        """
+        Apply the pending migrations.
+
+        Returns:
+            bool: True if any migration was pending.
+        """
+        executor = MigrationExecutor(connection)
+        targets = executor.loader.graph.leaf_nodes()
+        if not executor.migration_plan(targets):
+            return False
+        call_command('migrate', interactive=False, verbosity=0)
+        return True
+
+    def load(self, fixture: str) -> bool:
+        """
+        Load a fixture unless its content was already loaded.
+
+        Args:
+            fixture (str): The fixture file.
+
+        Returns:
+            bool: True if the fixture was loaded.
+        """
+        content_hash = sha256(Path(fixture).read_bytes()).hexdigest()
+        name = Path(fixture).name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT 1 FROM {STATE_TABLE} WHERE name = %s AND sha256 = %s',
+                [name, content_hash],
+            )
+            if cursor.fetchone():
+                return False
+        call_command('loaddata', fixture, ignorenonexistent=True, verbosity=0)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {STATE_TABLE} (name, sha256, loaded) '
+                'VALUES (%s, %s, %s) ON CONFLICT (name) DO UPDATE '
+                'SET sha256 = EXCLUDED.sha256, loaded = EXCLUDED.loaded',
+                [name, content_hash, get_datetime()],
+            )
+        return True
+
+    def handle(self, *args, **options):
+        """
+        Run the command.
+
+        Args:
+            *args: Positional arguments of the command.
+            **options: Options of the command.
+        """
+        started = perf_counter()
+        report = ['migrations applied' if self.migrate() else 'no migrations']
+        call_command('createcachetable', verbosity=0)
+        loaded = [fixture for fixture in options['fixtures']
+                  if self.load(fixture)]
+        if loaded:
+            rebuild_paths(Button)
+            tree_changed.send(sender=Button)
+            report.append(f'loaded {", ".join(loaded)}')
+        else:
+            report.append('fixtures unchanged')
+        elapsed = perf_counter() - started
+        self.stdout.write(f'Startup in {elapsed:.2f}s: {"; ".join(report)}.')
@@ -0,0 +1,221 @@
+"""Module metrics for app."""
+from bisect import bisect_left
+from os import getpid
+from threading import Lock
+
+from .authentication import token_cache
+from .cache import tree_cache
+from .db import connection_stats
+
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+QUERIES_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+ROWS_BUCKETS = (0, 10, 100, 1000, 10000, 100000)
+BYTES_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+HISTOGRAMS = (
+    ('http_request_duration_seconds', 'Request latency.', SECONDS_BUCKETS),
+    ('http_request_queries', 'Database queries per request.',
+     QUERIES_BUCKETS),
+    ('http_request_sql_duration_seconds', 'SQL time per request.',
+     SECONDS_BUCKETS),
+    ('http_request_serializer_duration_seconds',
+     'Serialization time per request, without SQL.', SECONDS_BUCKETS),
+    ('http_request_rows', 'Rows returned by the queries of a request.',
+     ROWS_BUCKETS),
+    ('http_response_bytes', 'Response body size.', BYTES_BUCKETS),
+)
+
+
+class Histogram:
+    """
+    Cumulative histogram in the Prometheus exposition format.
+
+    Attributes:
+        buckets (tuple): The upper bounds of the buckets.
+    """
+
+    def __init__(self, buckets: tuple):
+        """
+        Initialize the histogram.
+
+        Args:
+            buckets (tuple): The sorted upper bounds of the buckets.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Record a value.
+
+        Args:
+            value (float): The observed value.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def render(self, name: str, labels: str) -> list:
+        """
+        Render the bucket, sum and count samples.
+
+        Args:
+            name (str): The metric name.
+            labels (str): The rendered labels of the series.
+
+        Returns:
+            list: The exposition lines.
+        """
+        lines, total = [], 0
+        for bound, count in zip((*self.buckets, '+Inf'), self.counts):
+            total += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {total}')
+        lines.append(f'{name}_sum{{{labels}}} {self.sum}')
+        lines.append(f'{name}_count{{{labels}}} {total}')
+        return lines
+
+
+class RequestMetrics:
+    """
+    Per route request metrics of this process.
+
+    Every series is labelled with the route name and method. Each
+    worker process keeps its own metrics, as it serves its own
+    requests, and render_metrics labels them with the worker pid.
+    """
+
+    def __init__(self):
+        """Initialize the metrics."""
+        self._lock = Lock()
+        self._series = {}
+        self._over_budget = {}
+
+    def observe(self, route: str, method: str, values: tuple,
+                over_budget: bool) -> None:
+        """
+        Record a served request.
+
+        Args:
+            route (str): The route name of the request.
+            method (str): The HTTP method of the request.
+            values (tuple): Latency, queries, SQL time, serialization
+                time, rows and bytes, in the order of HISTOGRAMS.
+            over_budget (bool): Whether the query budget was exceeded.
+        """
+        key = route, method
+        with self._lock:
+            if key not in self._series:
+                self._series[key] = [
+                    Histogram(buckets) for _, _, buckets in HISTOGRAMS
+                ]
+            for histogram, value in zip(self._series[key], values):
+                histogram.observe(value)
+            if over_budget:
+                self._over_budget[key] = self._over_budget.get(key, 0) + 1
+
+    def render(self, worker: str) -> list:
+        """
+        Render the request metrics.
+
+        Args:
+            worker (str): The rendered worker label of every series.
+
+        Returns:
+            list: The exposition lines.
+        """
+        lines = []
+        with self._lock:
+            for position, (name, help_text, _) in enumerate(HISTOGRAMS):
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for (route, method), series in sorted(self._series.items()):
+                    labels = f'route="{route}",method="{method}",{worker}'
+                    lines.extend(series[position].render(name, labels))
+            name = 'http_request_query_budget_exceeded_total'
+            lines.append(f'# HELP {name} Requests over the query budget.')
+            lines.append(f'# TYPE {name} counter')
+            for (route, method), count in sorted(self._over_budget.items()):
+                labels = f'route="{route}",method="{method}",{worker}'
+                lines.append(f'{name}{{{labels}}} {count}')
+        return lines
+
+    def clear(self) -> None:
+        """Drop every series."""
+        with self._lock:
+            self._series.clear()
+            self._over_budget.clear()
+
+
+def get_hit_ratio(stats: dict, hits: tuple) -> float:
+    """
+    Get the hit ratio of a cache.
+
+    Args:
+        stats (dict): The counters of the cache.
+        hits (tuple): The names of the hit counters.
+
+    Returns:
+        float: The share of lookups served from the cache.
+    """
+    hit_count = sum(stats[counter] for counter in hits)
+    lookups = hit_count + stats['misses']
+    return hit_count / lookups if lookups else 0
+
+
+def render_metrics() -> str:
+    """
+    Render every metric of this worker in the Prometheus text format.
+
+    Every series carries a worker label with the process id. A scrape
+    only reaches the worker serving it, so with several workers the
+    series of the others are missing from each scrape.
+
+    Returns:
+        str: The exposition document.
+    """
+    worker = f'worker="{getpid()}"'
+    caches = {
+        'tree': (tree_cache.stats(), ('local_hits', 'shared_hits')),
+        'token': (token_cache.stats(), ('hits',)),
+    }
+    lines = request_metrics.render(worker)
+    lines.append(
+        '# HELP menu_cache_events_total Cache hits, misses and evictions.',
+    )
+    lines.append('# TYPE menu_cache_events_total counter')
+    for name, (stats, _) in caches.items():
+        lines.extend(
+            f'menu_cache_events_total{{cache="{name}",event="{stat}",'
+            f'{worker}}} {value}'
+            for stat, value in stats.items() if not stat.endswith('size')
+        )
+    lines.append('# HELP menu_cache_size Entries held in process.')
+    lines.append('# TYPE menu_cache_size gauge')
+    for name, (stats, _) in caches.items():
+        lines.extend(
+            f'menu_cache_size{{cache="{name}",{worker}}} {value}'
+            for stat, value in stats.items() if stat.endswith('size')
+        )
+    lines.append('# HELP menu_cache_hit_ratio Share of lookups served.')
+    lines.append('# TYPE menu_cache_hit_ratio gauge')
+    for name, (stats, hits) in caches.items():
+        ratio = get_hit_ratio(stats, hits)
+        lines.append(
+            f'menu_cache_hit_ratio{{cache="{name}",{worker}}} {ratio}',
+        )
+
+    connections = connection_stats.stats()
+    lines.append('# TYPE db_connections_opened_total counter')
+    lines.append(
+        f'db_connections_opened_total{{{worker}}} {connections["opened"]}',
+    )
+    lines.append('# TYPE db_connection_reuse_ratio gauge')
+    lines.append(
+        f'db_connection_reuse_ratio{{{worker}}} '
+        f'{connections["reuse_ratio"]}',
+    )
+    return '\n'.join(lines) + '\n'
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,212 @@
+"""Module middleware for app."""
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .metrics import request_metrics
+
+
+# The counter of the request being served, inherited by the threads
+# running the queries of async requests.
+current_counter = ContextVar('current_counter', default=None)
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting the queries of a request.
+
+    Rows are taken from the cursor row count, which drivers report for
+    SELECT statements with PostgreSQL but not with SQLite.
+
+    Attributes:
+        queries (int): The number of executed queries.
+        duration (float): The time spent in the database in seconds.
+        rows (int): The number of rows returned or changed.
+        serialization (float): The time spent serializing the response
+            data, without its queries, in seconds.
+    """
+
+    def __init__(self):
+        """Initialize the counters."""
+        self.queries = 0
+        self.duration = 0.0
+        self.rows = 0
+        self.serialization = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Execute a query and count it.
+
+        Args:
+            execute (callable): The next execute function.
+            sql (str): The SQL statement.
+            params: The parameters of the statement.
+            many (bool): Whether executemany is used.
+            context (dict): The connection and cursor of the query.
+
+        Returns:
+            Any: The result of the execution.
+        """
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += perf_counter() - start
+            self.queries += 1
+            self.rows += max(context['cursor'].rowcount, 0)
+
+
+def count_queries(execute, sql, params, many, context):
+    """
+    Execute a query, counting it for the current request if any.
+
+    Args:
+        execute (callable): The next execute function.
+        sql (str): The SQL statement.
+        params: The parameters of the statement.
+        many (bool): Whether executemany is used.
+        context (dict): The connection and cursor of the query.
+
+    Returns:
+        Any: The result of the execution.
+    """
+    counter = current_counter.get()
+    if counter is None:
+        return execute(sql, params, many, context)
+    return counter(execute, sql, params, many, context)
+
+
+def install_query_counter(sender, connection, **kwargs) -> None:
+    """
+    Add count_queries to a connection, connected to connection_created.
+
+    Connections are per thread, so the wrapper is installed on each of
+    them rather than around the request.
+
+    Args:
+        sender: The database wrapper class that sent the signal.
+        connection: The database wrapper of the new connection.
+        **kwargs: Additional keyword arguments of the signal.
+    """
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+@contextmanager
+def timed_serialization():
+    """
+    Add the time spent in the block to the serialization time.
+
+    Queries run by lazy querysets within the block are not counted.
+
+    Yields:
+        None: Control to the block.
+    """
+    counter = current_counter.get()
+    if counter is None:
+        yield
+        return
+    start, duration = perf_counter(), counter.duration
+    try:
+        yield
+    finally:
+        elapsed = perf_counter() - start
+        counter.serialization += elapsed - (counter.duration - duration)
+
+
+class QueryMetricsMiddleware:
+    """
+    Middleware recording per route latency, queries and response size.
+
+    Requests running more queries than MENU_QUERY_BUDGET are logged and
+    counted, so N+1 regressions show up in the metrics. Works on both
+    the sync and the async handler, so that async views are measured
+    without being adapted to a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware.
+
+        Args:
+            get_response (callable): The next handler of the chain.
+        """
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """
+        Serve a request and record its metrics.
+
+        Args:
+            request: The HTTP request object.
+
+        Returns:
+            HttpResponse: The response of the next handler.
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        counter = QueryCounter()
+        token = current_counter.set(counter)
+        start = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_counter.reset(token)
+        self.record(request, response, counter, perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        """
+        Serve a request on the async path and record its metrics.
+
+        Args:
+            request: The HTTP request object.
+
+        Returns:
+            HttpResponse: The response of the next handler.
+        """
+        counter = QueryCounter()
+        token = current_counter.set(counter)
+        start = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_counter.reset(token)
+        self.record(request, response, counter, perf_counter() - start)
+        return response
+
+    def record(self, request, response, counter: QueryCounter,
+               elapsed: float) -> None:
+        """
+        Record the metrics of a served request.
+
+        Args:
+            request: The HTTP request object.
+            response: The response of the request.
+            counter (QueryCounter): The counters of the request.
+            elapsed (float): The latency of the request in seconds.
+        """
+        match = request.resolver_match
+        route = (match.view_name or match.route) if match else 'unmatched'
+        size = 0 if response.streaming else len(response.content)
+        over_budget = counter.queries > settings.MENU_QUERY_BUDGET
+        if over_budget:
+            logging.warning(
+                f'{request.method} {request.path}: {counter.queries} '
+                f'queries, budget {settings.MENU_QUERY_BUDGET}',
+            )
+        request_metrics.observe(
+            route, request.method,
+            (elapsed, counter.queries, counter.duration,
+             counter.serialization, counter.rows, size),
+            over_budget,
+        )
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:01
+
+import app.models
+from django.db import migrations, models
+
+
+def backfill_paths(apps, schema_editor):
+    app.models.rebuild_paths(apps.get_model('app', 'Button'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0002_alter_button_description'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='button',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='depth'),
+        ),
+        migrations.AddField(
+            model_name='button',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=255, verbose_name='path'),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:08
+
+from django.db import migrations, models
+
+
+def backfill_positions(apps, schema_editor):
+    Button = apps.get_model('app', 'Button')
+    positions = {}
+    changed = []
+    for button in Button.objects.order_by('title', 'description', 'id'):
+        position = positions.get(button.parent_id_id, 0) + 1
+        positions[button.parent_id_id] = position
+        button.position = position
+        changed.append(button)
+    Button.objects.bulk_update(changed, ['position'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0003_button_path'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='button',
+            options={'ordering': ['position', 'id'], 'verbose_name': 'button', 'verbose_name_plural': 'buttons'},
+        ),
+        migrations.AddField(
+            model_name='button',
+            name='position',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='position'),
+        ),
+        migrations.RunPython(backfill_positions, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='button',
+            index=models.Index(fields=['parent_id', 'position', 'id'], name='button_parent_position_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0004_button_position'),
+    ]
+
+    # A plain table rather than a model: a new model would add a content
+    # type and clash with the content type pks stored in fixture.json.
+    operations = [
+        migrations.RunSQL(
+            'CREATE TABLE "django_db"."fixture_state" ('
+            'name text PRIMARY KEY, '
+            'sha256 varchar(64) NOT NULL, '
+            'loaded timestamp with time zone NOT NULL)',
+            'DROP TABLE "django_db"."fixture_state"',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_fixture_state'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='button',
+            name='position',
+            field=models.PositiveSmallIntegerField(blank=True, default=None, verbose_name='position'),
+        ),
+    ]
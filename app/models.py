@@ -2,11 +2,33 @@
 from datetime import datetime, timezone
 
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Max, Value
+from django.db.models.functions import Concat, Substr
 
 
 TITLE_LENGTH_MAX = 50
 DESCRIPTION_LENGTH_MAX = 10000
+PATH_LENGTH_MAX = 255
+PATH_STEP = 6
+# The largest values of the smallint id and position columns.
+ID_MAX = 32767
+POSITION_MAX = 32767
+# The deepest level whose path still fits in PATH_LENGTH_MAX.
+DEPTH_MAX = PATH_LENGTH_MAX // PATH_STEP - 1
+
+
+def get_path_segment(pk: int) -> str:
+    """
+    Get the materialized path segment of a button.
+
+    Args:
+        pk (int): The primary key of the button.
+
+    Returns:
+        str: The zero-padded id followed by a slash, e.g. '00007/'.
+    """
+    return f'{pk:05d}/'
 
 
 def get_datetime() -> datetime:
@@ -61,15 +83,98 @@ class CreatedMixin(models.Model):
         abstract = True
 
 
+def rebuild_paths(model) -> int:
+    """
+    Recompute the materialized paths of every button.
+
+    Used by the backfill migration and after raw loads such as
+    loaddata, which bypass Button.save.
+
+    Args:
+        model: The Button model class, possibly a historical one.
+
+    Returns:
+        int: The number of buttons whose path changed.
+    """
+    buttons = {button.pk: button for button in model.objects.all()}
+    children = {}
+    for button in buttons.values():
+        children.setdefault(button.parent_id_id, []).append(button)
+
+    paths = {}
+    stack = [
+        (button, '') for button in buttons.values()
+        if button.parent_id_id not in buttons
+    ]
+    while stack:
+        button, parent_path = stack.pop()
+        paths[button.pk] = parent_path + get_path_segment(button.pk)
+        stack.extend(
+            (child, paths[button.pk])
+            for child in children.get(button.pk, [])
+            if child.pk not in paths
+        )
+
+    changed = []
+    for pk, button in buttons.items():
+        path = paths.get(pk, get_path_segment(pk))
+        if button.path != path:
+            button.path = path
+            button.depth = len(path) // PATH_STEP - 1
+            changed.append(button)
+    model.objects.bulk_update(changed, ['path', 'depth'])
+    return len(changed)
+
+
+class ButtonQuerySet(models.QuerySet):
+    """QuerySet of buttons with helpers over the materialized path."""
+
+    def subtree(self, pk, depth=None):
+        """
+        Get a button and its descendants.
+
+        The path of the root is read first, so that the subtree is
+        matched by a literal prefix, which the path index serves.
+
+        Args:
+            pk (int): The primary key of the subtree root.
+            depth (int, optional): The number of levels below the root
+                to include. Defaults to the whole subtree.
+
+        Returns:
+            ButtonQuerySet: The root and its descendants, none if the
+            root does not exist.
+        """
+        node = Button.objects.filter(pk=pk).values_list(
+            'path', 'depth',
+        ).order_by().first()
+        if node is None or not node[0]:
+            return self.none()
+        path, root_depth = node
+        subtree = self.filter(path__startswith=path)
+        if depth is not None:
+            subtree = subtree.filter(depth__lte=root_depth + depth)
+        return subtree
+
+
 class Button(CreatedMixin):
     """
     Model class for buttons.
 
+    The hierarchy is indexed by a materialized path of zero-padded
+    ancestor ids, e.g. '00002/00007/' for button 7 under root 2,
+    maintained on every save.
+
     Attributes:
         id (SmallAutoField): The primary key field.
         title (TextField): The title of the button.
         description (TextField): The description of the button.
         parent_id (ForeignKey): The foreign key referencing the parent button.
+        position (PositiveSmallIntegerField): The place of the button
+            among its siblings, after the last one if not given.
+        path (CharField): The materialized path ending with the button.
+        depth (PositiveSmallIntegerField): The level of the button,
+            0 for roots.
     """
 
     id = models.SmallAutoField(primary_key=True, editable=False)
@@ -84,6 +189,150 @@ class Button(CreatedMixin):
     )
     parent_id = models.ForeignKey(
         'button', on_delete=models.DO_NOTHING, null=True, blank=True)
+    position = models.PositiveSmallIntegerField(
+        'position', default=None, blank=True)
+    path = models.CharField(
+        'path', max_length=PATH_LENGTH_MAX, default='', blank=True,
+        editable=False, db_index=True,
+    )
+    depth = models.PositiveSmallIntegerField(
+        'depth', default=0, editable=False)
+
+    objects = ButtonQuerySet.as_manager()
+
+    def get_paths(self) -> dict:
+        """
+        Get the stored paths of the button and of its parent.
+
+        Returns:
+            dict: A mapping of id to path for the saved ones.
+        """
+        return dict(Button.objects.filter(
+            pk__in=[pk for pk in (self.pk, self.parent_id_id) if pk],
+        ).values_list('pk', 'path'))
+
+    def validate_parent(self, paths: dict) -> None:
+        """
+        Check that the button can be placed under its parent.
+
+        Args:
+            paths (dict): The stored paths of the button and its parent.
+
+        Raises:
+            ValidationError: If the button is moved under itself or one
+                of its descendants, or if its subtree would be nested
+                deeper than DEPTH_MAX.
+        """
+        parent_path = paths.get(self.parent_id_id, '')
+        old_path = paths.get(self.pk, '')
+        if old_path and old_path[:-PATH_STEP] == parent_path:
+            return
+        if self.pk and f'/{get_path_segment(self.pk)}' in f'/{parent_path}':
+            raise ValidationError(
+                {'parent_id': 'button cannot be moved under itself'},
+            )
+        height = 0
+        if old_path:
+            deepest = Button.objects.filter(
+                path__startswith=old_path,
+            ).aggregate(depth=Max('depth'))['depth']
+            height = deepest - (len(old_path) // PATH_STEP - 1)
+        if len(parent_path) // PATH_STEP + height > DEPTH_MAX:
+            raise ValidationError(
+                {'parent_id': f'buttons are nested at most {DEPTH_MAX} '
+                              'levels deep'},
+            )
+
+    def get_next_position(self) -> int:
+        """
+        Get the position after the last sibling of the button.
+
+        Returns:
+            int: The next free position, capped at POSITION_MAX.
+        """
+        last = Button.objects.filter(
+            parent_id=self.parent_id_id,
+        ).exclude(pk=self.pk).aggregate(position=Max('position'))['position']
+        return min(POSITION_MAX, 0 if last is None else last + 1)
+
+    def clean(self):
+        """
+        Validate the parent, so that forms report a misplaced button.
+
+        Raises:
+            ValidationError: If the parent is invalid, see
+                validate_parent.
+        """
+        super().clean()
+        self.validate_parent(self.get_paths())
+
+    def save(self, *args, **kwargs):
+        """
+        Save the button and keep the materialized paths consistent.
+
+        Moving a button rewrites the paths of its whole subtree
+        with a single UPDATE. The parent is checked again, as callers
+        may save without clean().
+
+        Args:
+            *args: Positional arguments of Model.save.
+            **kwargs: Keyword arguments of Model.save.
+
+        Raises:
+            ValidationError: If the parent is invalid, see
+                validate_parent.
+        """
+        paths = self.get_paths()
+        parent_path = paths.get(self.parent_id_id, '')
+        old_path = paths.get(self.pk, '')
+        self.validate_parent(paths)
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.path = parent_path + get_path_segment(self.pk)
+            self.depth = len(self.path) // PATH_STEP - 1
+            if self.path == old_path:
+                return
+            Button.objects.filter(pk=self.pk).update(
+                path=self.path, depth=self.depth,
+            )
+            if old_path:
+                shift = (len(self.path) - len(old_path)) // PATH_STEP
+                self.descendants(old_path).update(
+                    path=Concat(
+                        Value(self.path), Substr('path', len(old_path) + 1),
+                    ),
+                    depth=F('depth') + shift,
+                )
+
+    def descendants(self, path=None):
+        """
+        Get every descendant of the button.
+
+        Args:
+            path (str, optional): The path to look under. Defaults to
+                the path of the button.
+
+        Returns:
+            ButtonQuerySet: The descendants of the button, none if it
+            has no path yet.
+        """
+        path = path or self.path
+        if not path:
+            return Button.objects.none()
+        return Button.objects.filter(
+            path__startswith=path,
+        ).exclude(pk=self.pk)
+
+    def ancestors(self):
+        """
+        Get the ancestors of the button, from the root down.
+
+        Returns:
+            ButtonQuerySet: The ancestors of the button.
+        """
+        ids = [int(segment) for segment in self.path.split('/')[:-2]]
+        return Button.objects.filter(pk__in=ids).order_by('depth')
 
     def __str__(self) -> str:
         """
@@ -100,13 +349,21 @@ class Button(CreatedMixin):
 
         Attributes:
             db_table (str): The name of the database table.
-            ordering (list): The default ordering for the model instances.
+            ordering (list): The default ordering for the model instances,
+                siblings by position.
+            indexes (list): The index serving ordered children lookups.
             verbose_name (str): The human-readable name of the model.
             verbose_name_plural (str):
             The human-readable plural name of the model.
         """
 
         db_table = '"django_db"."button"'
-        ordering = ['title', 'description']
+        ordering = ['position', 'id']
+        indexes = [
+            models.Index(
+                fields=['parent_id', 'position', 'id'],
+                name='button_parent_position_idx',
+            ),
+        ]
         verbose_name = ('button')
         verbose_name_plural = ('buttons')
@@ -0,0 +1,54 @@
+"""Module notify for app."""
+import json
+import logging
+from threading import Thread
+from time import time
+from urllib.error import URLError
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+
+from .cache import tree_cache
+
+
+def send_notification(url: str, token: str, payload: dict) -> int:
+    """
+    Post a menu change notification to the bot.
+
+    Args:
+        url (str): The notification endpoint of the bot.
+        token (str): The shared secret sent in the X-Menu-Token header.
+        payload (dict): The JSON body of the notification.
+
+    Returns:
+        int: The HTTP status of the response, or 0 if the bot could
+        not be reached.
+    """
+    request = Request(
+        url, data=json.dumps(payload).encode(), method='POST',
+        headers={'Content-Type': 'application/json', 'X-Menu-Token': token},
+    )
+    try:
+        with urlopen(request, timeout=settings.MENU_NOTIFY_TIMEOUT) as resp:
+            return resp.status
+    except (URLError, OSError) as error:
+        logging.warning(f'menu notification failed: {error!r}')
+        return 0
+
+
+def notify_bot() -> None:
+    """
+    Tell the bot that the menu changed, without blocking the request.
+
+    The payload carries the tree version and the sending time, so the
+    bot can measure the propagation latency. Does nothing unless
+    MENU_NOTIFY_URL is configured.
+    """
+    if not settings.MENU_NOTIFY_URL:
+        return
+    payload = {'version': tree_cache.get_version(), 'sent': time()}
+    Thread(
+        target=send_notification,
+        args=(settings.MENU_NOTIFY_URL, settings.MENU_NOTIFY_TOKEN, payload),
+        daemon=True,
+    ).start()
@@ -0,0 +1,45 @@
+"""Module pagination for app."""
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Opt-in keyset pagination over the primary key.
+
+    Pages are cut with an indexed 'id > cursor' range instead of an
+    OFFSET. Listings are only paginated when the request passes a
+    cursor or a page_size, so existing clients keep the plain list.
+    The next and previous links are relative to the host.
+
+    Attributes:
+        ordering (str): The indexed, unique key of the pages.
+        page_size (int): The default number of items per page.
+        page_size_query_param (str): The parameter overriding page_size.
+        max_page_size (int): The upper bound of page_size.
+    """
+
+    ordering = 'id'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Paginate the queryset if the request asks for pages.
+
+        Args:
+            queryset: The queryset to paginate.
+            request: The HTTP request object.
+            view: The view being paginated.
+
+        Returns:
+            list or None: The items of the page, or None for the whole
+            listing.
+        """
+        params = {self.cursor_query_param, self.page_size_query_param}
+        if not params & set(request.query_params):
+            return None
+        page = super().paginate_queryset(queryset, request, view)
+        # Pages are cached for every host, so their links stay relative.
+        self.base_url = request.get_full_path()
+        return page
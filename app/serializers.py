@@ -1,14 +1,78 @@
 """Module serializers for app."""
+from collections import defaultdict
+
 from rest_framework import serializers
 
 from .models import Button
 
 
-class ButtonSerializer(serializers.HyperlinkedModelSerializer):
+def get_children_map(queryset=None) -> dict:
+    """
+    Group buttons by their parent id using a single query.
+
+    Args:
+        queryset (QuerySet, optional): The buttons to group.
+            Defaults to every button.
+
+    Returns:
+        dict: A mapping of parent id to the list of its child buttons,
+        kept in the default model ordering.
+    """
+    if queryset is None:
+        queryset = Button.objects.all()
+    children = defaultdict(list)
+    for button in queryset:
+        children[button.parent_id_id].append(button)
+    return children
+
+
+def defer_unrequested(queryset, fields):
+    """
+    Defer the description of buttons when it is not requested.
+
+    Args:
+        queryset (QuerySet): The buttons to load.
+        fields (list or None): The requested field names, or None for
+            every field.
+
+    Returns:
+        QuerySet: The queryset, without the description column if it
+        is not requested.
+    """
+    if fields and 'description' not in fields:
+        return queryset.defer('description')
+    return queryset
+
+
+class DynamicFieldsMixin:
+    """Serializer mixin keeping only the fields listed in context['fields']."""
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize the serializer and drop the unrequested fields.
+
+        Args:
+            *args: Positional arguments of the serializer.
+            **kwargs: Keyword arguments of the serializer.
+        """
+        super().__init__(*args, **kwargs)
+        requested = self.context.get('fields')
+        if requested:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+
+
+class ButtonSerializer(
+    DynamicFieldsMixin, serializers.HyperlinkedModelSerializer,
+):
     """
     Serializer for the Button model.
 
     Serializes Button instances and includes nested button data.
+    The tree (or the subtree of a single button) is loaded once per
+    serialization and shared between nested serializers through
+    the context. An optional
+    'depth' in the context limits the number of nested levels.
     """
 
     class Meta:
@@ -21,10 +85,31 @@ class ButtonSerializer(serializers.HyperlinkedModelSerializer):
         """
 
         model = Button
-        fields = ['id', 'title', 'description', 'buttons']
+        fields = ['id', 'title', 'description', 'position', 'buttons']
 
     buttons = serializers.SerializerMethodField()
 
+    def get_children_map(self) -> dict:
+        """
+        Get the parent to children map shared by the serializer tree.
+
+        Nested buttons are loaded without the columns the requested
+        fields leave out, as the listed ones are.
+
+        Returns:
+            dict: A mapping of parent id to the list of its child buttons.
+        """
+        if 'children' not in self.context:
+            root = self.root.instance
+            if isinstance(root, Button):
+                queryset = root.descendants()
+            else:
+                queryset = Button.objects.all()
+            self.context['children'] = get_children_map(
+                defer_unrequested(queryset, self.context.get('fields')),
+            )
+        return self.context['children']
+
     def get_buttons(self, obj):
         """
         Get the child buttons of the current button.
@@ -35,5 +120,34 @@ class ButtonSerializer(serializers.HyperlinkedModelSerializer):
         Returns:
             list: A list of serialized child buttons.
         """
-        children = Button.objects.filter(parent_id=obj.id)
-        return ButtonSerializer(children, many=True).data
+        children = self.get_children_map().get(obj.id, [])
+        context = self.context
+        depth = context.get('depth')
+        if depth is not None:
+            if depth <= 0:
+                return []
+            context = {**context, 'depth': depth - 1}
+        return ButtonSerializer(children, many=True, context=context).data
+
+
+class FlatButtonSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Serializer for the Button model without nesting.
+
+    Every button references its parent by id instead of embedding its
+    children.
+    """
+
+    class Meta:
+        """
+        Meta options for FlatButtonSerializer.
+
+        Attributes:
+            model (Button): The model class to serialize.
+            fields (list): The fields to include in the serialization.
+        """
+
+        model = Button
+        fields = [
+            'id', 'title', 'description', 'parent_id', 'position', 'depth',
+        ]
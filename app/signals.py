@@ -0,0 +1,158 @@
+"""Module signals for app."""
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.signals import request_finished
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import token_cache
+from .cache import tree_cache
+from .db import connection_stats
+from .middleware import install_query_counter
+from .models import Button
+from .notify import notify_bot
+from .snapshot import write_snapshot
+
+
+# Sent after bulk writes, which bypass post_save and post_delete.
+tree_changed = Signal()
+
+connection_created.connect(connection_stats.connection_opened)
+connection_created.connect(install_query_counter)
+request_finished.connect(connection_stats.request_finished)
+
+
+def on_commit_once(func, robust: bool = False) -> None:
+    """
+    Run a callback when the current transaction commits, at most once.
+
+    Registrations of a callback that is already pending in the
+    transaction are ignored, so a bulk edit of many buttons runs it
+    only once.
+
+    Args:
+        func (callable): The callback. Bound methods of the same object
+            count as the same callback.
+        robust (bool): Log the errors of the callback instead of
+            raising them, see transaction.on_commit.
+    """
+    connection = transaction.get_connection()
+    for _, pending, _ in connection.run_on_commit:
+        if getattr(pending, 'func', None) == func and not pending.done:
+            return
+
+    def callback():
+        callback.done = True
+        func()
+
+    callback.func, callback.done = func, False
+    transaction.on_commit(callback, robust=robust)
+
+
+@receiver(pre_save, sender=Button)
+def place_button(sender, instance, **kwargs):
+    """
+    Place a button saved without a position after its siblings.
+
+    Covers raw saves of loaddata too, for fixtures without positions.
+
+    Args:
+        sender: The model class that sent the signal.
+        instance (Button): The saved button.
+        **kwargs: Additional keyword arguments of the signal.
+    """
+    if instance.position is None:
+        instance.position = instance.get_next_position()
+
+
+@receiver(post_save, sender=Button)
+@receiver(post_delete, sender=Button)
+@receiver(tree_changed, sender=Button)
+def invalidate_tree(sender, **kwargs):
+    """
+    Invalidate the cached menu tree once the change is committed.
+
+    Covers writes from the API viewsets as well as from the admin.
+    Bumping before the commit would let a concurrent read cache the
+    old tree under the new version.
+
+    Args:
+        sender: The model class that sent the signal.
+        **kwargs: Additional keyword arguments of the signal.
+    """
+    on_commit_once(tree_cache.bump_version)
+
+
+def write_configured_snapshot() -> None:
+    """Write the menu snapshot to MENU_SNAPSHOT_PATH."""
+    write_snapshot(settings.MENU_SNAPSHOT_PATH)
+
+
+@receiver(post_save, sender=Button)
+@receiver(post_delete, sender=Button)
+@receiver(tree_changed, sender=Button)
+def export_snapshot(sender, **kwargs):
+    """
+    Export the menu snapshot once the change is committed.
+
+    Does nothing unless MENU_SNAPSHOT_PATH is configured, nor for raw
+    saves of loaddata, which send tree_changed once done. The snapshot
+    is rendered once per transaction, however many buttons changed.
+    A failed export is logged: the change is already committed, and
+    the later callbacks, such as the bot notification, still run.
+
+    Args:
+        sender: The model class that sent the signal.
+        **kwargs: Additional keyword arguments of the signal.
+    """
+    if settings.MENU_SNAPSHOT_PATH and not kwargs.get('raw'):
+        on_commit_once(write_configured_snapshot, robust=True)
+
+
+@receiver(post_save, sender=Button)
+@receiver(post_delete, sender=Button)
+@receiver(tree_changed, sender=Button)
+def push_change(sender, **kwargs):
+    """
+    Notify the bot about the change once it is committed.
+
+    Raw saves of loaddata are skipped, and the bot is notified once
+    per transaction, as for export_snapshot.
+
+    Args:
+        sender: The model class that sent the signal.
+        **kwargs: Additional keyword arguments of the signal.
+    """
+    if not kwargs.get('raw'):
+        on_commit_once(notify_bot)
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def forget_token(sender, instance, **kwargs):
+    """
+    Drop a changed or deleted token from the token cache of the worker.
+
+    Args:
+        sender: The model class that sent the signal.
+        instance (Token): The changed token.
+        **kwargs: Additional keyword arguments of the signal.
+    """
+    token_cache.discard(instance.key)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user(sender, instance, **kwargs):
+    """
+    Drop the tokens of a changed or deleted user from the worker cache.
+
+    Args:
+        sender: The model class that sent the signal.
+        instance (User): The changed user.
+        **kwargs: Additional keyword arguments of the signal.
+    """
+    token_cache.discard_user(instance.pk)
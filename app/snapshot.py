@@ -0,0 +1,61 @@
+"""Module snapshot for app."""
+import json
+import os
+from hashlib import sha256
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+from .models import Button
+from .serializers import ButtonSerializer
+
+
+def render_snapshot() -> tuple[bytes, str]:
+    """
+    Render the full menu tree into a snapshot document.
+
+    The document holds the nested tree as served by /api/masters/
+    and the SHA-256 hash of the encoded tree.
+
+    Returns:
+        tuple[bytes, str]: The encoded document and its content hash.
+    """
+    roots = Button.objects.filter(parent_id=None)
+    tree = json.dumps(
+        ButtonSerializer(roots, many=True).data,
+        ensure_ascii=False, separators=(',', ':'),
+    ).encode()
+    content_hash = sha256(tree).hexdigest()
+    document = b'{"hash":"%s","tree":%s}' % (content_hash.encode(), tree)
+    return document, content_hash
+
+
+def write_snapshot(path) -> str:
+    """
+    Write the menu snapshot atomically.
+
+    The document is written to a uniquely named temporary file and
+    moved over the target, so readers never see a partial snapshot,
+    even while several workers export at once.
+
+    Args:
+        path (str or Path): The snapshot file.
+
+    Returns:
+        str: The content hash of the written snapshot.
+    """
+    path = Path(path)
+    document, content_hash = render_snapshot()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = NamedTemporaryFile(
+        dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp',
+        delete=False,
+    )
+    try:
+        with temp:
+            temp.write(document)
+        os.chmod(temp.name, 0o644)
+        os.replace(temp.name, path)
+    except OSError:
+        os.unlink(temp.name)
+        raise
+    return content_hash
@@ -1,4 +1,5 @@
 """Module for urls."""
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
@@ -10,5 +11,21 @@ router.register(r'buttons', views.ButtonViewSet)
 router.register(r'masters', views.MasterViewSet, basename='master')
 
 urlpatterns = [
+    path('metrics', views.metrics, name='metrics'),
+    path(
+        'api/stats/connections/', views.ConnectionStatsView.as_view(),
+        name='connection-stats',
+    ),
     path('api/', include(router.urls), name='api'),
 ]
+
+if settings.MENU_ASYNC_READS:
+    from . import async_views
+
+    urlpatterns = [
+        path('api/masters/', async_views.masters, name='master-list'),
+        path(
+            'api/buttons/<int:pk>/', async_views.button,
+            name='button-detail',
+        ),
+    ] + urlpatterns
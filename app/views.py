@@ -1,11 +1,32 @@
 """Module views for app."""
+import hmac
+import json
 
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
 from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
-from rest_framework.permissions import BasePermission
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import BasePermission, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from .authentication import CachedTokenAuthentication
+from .bulk import flatten, import_rows, iter_export
+from .cache import tree_cache
+from .db import connection_stats
+from .encoding import encode_body, encoded_response
+from .metrics import render_metrics
+from .middleware import timed_serialization
 from .models import Button
-from .serializers import ButtonSerializer
+from .pagination import KeysetPagination
+from .serializers import (
+    ButtonSerializer, FlatButtonSerializer, defer_unrequested,
+    get_children_map,
+)
 
 
 safe_methods = 'GET', 'HEAD', 'OPTIONS'
@@ -39,7 +60,331 @@ class MyPermission(BasePermission):
         return False
 
 
-class MasterViewSet(viewsets.ModelViewSet):
+class CachedTreeMixin:
+    """
+    Mixin serving rendered trees from the versioned tree cache.
+
+    Read actions are cached per view, action, object and query string.
+    Writes invalidate the cache through the Button signals. Responses
+    carry ETag and Last-Modified validators taken from the tree version,
+    so conditional requests are answered with 304 from a cache hit.
+    """
+
+    def get_tree_cache_key(self, request, *args, **kwargs) -> str:
+        """
+        Build the cache key of a read action.
+
+        Args:
+            request: The HTTP request object.
+            *args: Positional arguments of the action.
+            **kwargs: Keyword arguments of the action.
+
+        Returns:
+            str: The cache key within the current tree version.
+        """
+        lookup = kwargs.get(self.lookup_url_kwarg or self.lookup_field, '')
+        query = request.GET.urlencode()
+        return f'{self.basename}:{self.action}:{lookup}:{query}'
+
+    def render_body(self, action, request, *args, **kwargs) -> dict:
+        """
+        Render a read action and encode its data.
+
+        The whole action is timed as serialization, without the time
+        of its queries, since serializers evaluate querysets lazily.
+
+        Args:
+            action (callable): The uncached action to render.
+            request: The HTTP request object.
+            *args: Positional arguments of the action.
+            **kwargs: Keyword arguments of the action.
+
+        Returns:
+            dict: The encoded bodies, see encode_body.
+        """
+        with timed_serialization():
+            return encode_body(action(request, *args, **kwargs).data)
+
+    def cached_response(self, action, request, *args, **kwargs):
+        """
+        Serve the data of a read action from the tree cache.
+
+        The JSON body is cached pre-encoded, so JSON responses skip
+        serialization and rendering on hits. Other renderers, such as
+        the browsable API, get the decoded data, hence the responses
+        vary on Accept. Conditional requests are only answered with 304
+        once the request rendered, so that a missing button or invalid
+        parameters still get their error.
+
+        Args:
+            action (callable): The uncached action to render on a miss.
+            request: The HTTP request object.
+            *args: Positional arguments of the action.
+            **kwargs: Keyword arguments of the action.
+
+        Returns:
+            HttpResponse: The response with the cached data.
+        """
+        version, modified = tree_cache.get_validators()
+        key = f'json:{self.get_tree_cache_key(request, *args, **kwargs)}'
+        encoded = tree_cache.lookup(key, version)
+        if encoded is None:
+            encoded = self.render_body(action, request, *args, **kwargs)
+            tree_cache.store(key, version, encoded)
+
+        etag = quote_etag(str(version))
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=int(modified),
+        )
+        if not_modified is not None:
+            return not_modified
+        headers = {'ETag': etag, 'Last-Modified': http_date(modified)}
+        if request.accepted_renderer.format == 'json':
+            response = encoded_response(request, encoded, headers)
+        else:
+            response = Response(
+                json.loads(encoded['identity']), headers=headers,
+            )
+        patch_vary_headers(response, ['Accept'])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        """
+        List instances through the tree cache.
+
+        Args:
+            request: The HTTP request object.
+            *args: Positional arguments of the action.
+            **kwargs: Keyword arguments of the action.
+
+        Returns:
+            Response: The response with the serialized instances.
+        """
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Retrieve an instance through the tree cache.
+
+        Args:
+            request: The HTTP request object.
+            *args: Positional arguments of the action.
+            **kwargs: Keyword arguments of the action.
+
+        Returns:
+            Response: The response with the serialized instance.
+        """
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs,
+        )
+
+
+class SubtreeMixin:
+    """Mixin adding a depth-limited subtree action to a button viewset."""
+
+    def get_depth(self, request) -> int:
+        """
+        Get the requested subtree depth.
+
+        Args:
+            request: The HTTP request object.
+
+        Returns:
+            int: The number of nested levels, 1 by default.
+
+        Raises:
+            ValidationError: If the depth is not a non-negative integer.
+        """
+        depth = request.query_params.get('depth', '1')
+        if not depth.isdigit():
+            raise ValidationError({'depth': 'must be a non-negative integer'})
+        return int(depth)
+
+    def render_children(self, request, *args, **kwargs):
+        """
+        Render a button with its descendants down to the requested depth.
+
+        The subtree is loaded by a prefix query over the materialized
+        path of the button and nested from the in-memory children map.
+
+        Args:
+            request: The HTTP request object.
+            *args: Positional arguments of the action.
+            **kwargs: Keyword arguments of the action.
+
+        Returns:
+            Response: The response with the serialized subtree.
+
+        Raises:
+            Http404: If the id is not an integer or the button does not
+                exist.
+        """
+        depth = self.get_depth(request)
+        try:
+            lookup = int(kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except ValueError:
+            raise Http404
+        buttons = list(self.get_queryset().subtree(lookup, depth))
+        node = next((btn for btn in buttons if btn.pk == lookup), None)
+        if node is None:
+            raise Http404
+        self.check_object_permissions(request, node)
+        context = {
+            **self.get_serializer_context(),
+            'children': get_children_map(buttons),
+            'depth': depth,
+        }
+        return Response(self.get_serializer(node, context=context).data)
+
+    @action(detail=True)
+    def children(self, request, *args, **kwargs):
+        """
+        Retrieve a button with its children down to the depth parameter.
+
+        Args:
+            request: The HTTP request object.
+            *args: Positional arguments of the action.
+            **kwargs: Keyword arguments of the action.
+
+        Returns:
+            Response: The response with the serialized subtree.
+        """
+        return self.cached_response(
+            self.render_children, request, *args, **kwargs,
+        )
+
+
+class ListingMixin:
+    """
+    Mixin for lightweight button listings.
+
+    Adds opt-in keyset pagination, a 'fields' parameter selecting the
+    serialized fields of read requests and a 'flat' list mode without
+    nesting. A listing without 'description' does not load that column.
+    """
+
+    pagination_class = KeysetPagination
+
+    def get_requested_fields(self):
+        """
+        Get the fields requested by a read request.
+
+        Returns:
+            list or None: The field names, or None for every field.
+
+        Raises:
+            ValidationError: If a field is not one of the serializer.
+        """
+        if self.request.method not in safe_methods:
+            return None
+        fields = self.request.query_params.get('fields', '')
+        requested = [name for name in fields.split(',') if name]
+        valid = self.get_serializer_class().Meta.fields
+        unknown = [name for name in requested if name not in valid]
+        if unknown:
+            raise ValidationError({'fields': (
+                f'unknown fields: {", ".join(unknown)}; '
+                f'valid fields: {", ".join(valid)}'
+            )})
+        return requested or None
+
+    def is_flat(self) -> bool:
+        """
+        Check whether a flat listing is requested.
+
+        Returns:
+            bool: True for a list request with flat=1 or flat=true.
+        """
+        flat = self.request.query_params.get('flat', '').lower()
+        return self.action == 'list' and flat in {'1', 'true'}
+
+    def get_serializer_class(self):
+        """
+        Get the serializer class of the request.
+
+        Returns:
+            type: FlatButtonSerializer for flat listings, otherwise the
+            serializer class of the viewset.
+        """
+        if self.is_flat():
+            return FlatButtonSerializer
+        return super().get_serializer_class()
+
+    def get_serializer_context(self):
+        """
+        Get the serializer context with the requested fields.
+
+        Returns:
+            dict: The serializer context.
+        """
+        context = super().get_serializer_context()
+        context['fields'] = self.get_requested_fields()
+        return context
+
+    def get_queryset(self):
+        """
+        Get the queryset, deferring the description if not requested.
+
+        Returns:
+            QuerySet: The buttons to list.
+        """
+        return defer_unrequested(
+            super().get_queryset(), self.get_requested_fields(),
+        )
+
+
+class BulkMixin:
+    """Mixin adding bulk export and import actions to a button viewset."""
+
+    @action(detail=False, url_path='export')
+    def export_tree(self, request, *args, **kwargs):
+        """
+        Stream every button as a flat or, with nested=1, nested document.
+
+        Args:
+            request: The HTTP request object.
+            *args: Positional arguments of the action.
+            **kwargs: Keyword arguments of the action.
+
+        Returns:
+            StreamingHttpResponse: The streamed JSON document.
+        """
+        nested = request.query_params.get('nested', '').lower()
+        return StreamingHttpResponse(
+            iter_export(flat=nested not in {'1', 'true'}),
+            content_type='application/json',
+        )
+
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_tree(self, request, *args, **kwargs):
+        """
+        Import a flat or nested document of buttons in one transaction.
+
+        Args:
+            request: The HTTP request object.
+            *args: Positional arguments of the action.
+            **kwargs: Keyword arguments of the action.
+
+        Returns:
+            Response: The numbers of created, updated, unchanged and
+            deleted buttons.
+
+        Raises:
+            ValidationError: If the document is invalid.
+        """
+        if not isinstance(request.data, list):
+            raise ValidationError('expected a list of buttons')
+        delete = request.query_params.get('delete_missing', '').lower()
+        try:
+            stats = import_rows(
+                flatten(request.data), delete_missing=delete in {'1', 'true'},
+            )
+        except DjangoValidationError as error:
+            raise ValidationError(error.messages)
+        return Response(stats)
+
+
+class MasterViewSet(CachedTreeMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing masters.
 
@@ -53,21 +398,22 @@ class MasterViewSet(viewsets.ModelViewSet):
     queryset = Button.objects.filter(parent_id=None)
     serializer_class = ButtonSerializer
     permission_classes = [MyPermission]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
 
-def create_viewset(model_class, serializer):
+def create_viewset(model_class, serializer, mixins=()):
     """
     Create a custom ViewSet for a given model and serializer.
 
     Args:
         model_class: The model class to create the ViewSet for.
         serializer: The serializer class to use for the ViewSet.
+        mixins (tuple): Extra base classes placed before ModelViewSet.
 
     Returns:
         ViewSet: A custom ViewSet class for the specified model and serializer.
     """
-    class ViewSet(viewsets.ModelViewSet):
+    class ViewSet(*mixins, viewsets.ModelViewSet):
         """
         Custom ViewSet for managing instances of a model.
 
@@ -81,9 +427,68 @@ def create_viewset(model_class, serializer):
         queryset = model_class.objects.all()
         serializer_class = serializer
         permission_classes = [MyPermission]
-        authentication_classes = [TokenAuthentication]
+        authentication_classes = [CachedTokenAuthentication]
 
     return ViewSet
 
 
-ButtonViewSet = create_viewset(Button, ButtonSerializer)
+ButtonViewSet = create_viewset(
+    Button, ButtonSerializer,
+    mixins=(BulkMixin, ListingMixin, SubtreeMixin, CachedTreeMixin),
+)
+
+
+class ConnectionStatsView(APIView):
+    """
+    View exposing the database connection counters of the worker.
+
+    Attributes:
+        permission_classes: The permission classes for the view.
+        authentication_classes: The authentication classes for the view.
+    """
+
+    permission_classes = [IsAdminUser]
+    authentication_classes = [CachedTokenAuthentication]
+
+    def get(self, request):
+        """
+        Get the connection counters and settings.
+
+        Args:
+            request: The HTTP request object.
+
+        Returns:
+            Response: The counters of the worker serving the request.
+        """
+        return Response(connection_stats.stats())
+
+
+def metrics(request):
+    """
+    Serve the metrics of the worker in the Prometheus text format.
+
+    Requires the bearer token MENU_METRICS_TOKEN if it is set, and a
+    staff user logged in to the admin otherwise. Each scrape only
+    covers the worker serving it, see render_metrics, so complete
+    metrics need a single worker.
+
+    Args:
+        request: The HTTP request object.
+
+    Returns:
+        HttpResponse: The exposition document, or a 401 or 403 response.
+    """
+    token = settings.MENU_METRICS_TOKEN
+    if not token:
+        if not request.user.is_staff:
+            return HttpResponse(status=403)
+    elif not hmac.compare_digest(
+        request.headers.get('Authorization', '').encode(),
+        f'Bearer {token}'.encode(),
+    ):
+        response = HttpResponse(status=401)
+        response['WWW-Authenticate'] = 'Bearer'
+        return response
+    return HttpResponse(
+        render_metrics(), content_type='text/plain; version=0.0.4',
+    )
@@ -0,0 +1,19 @@
+"""Gunicorn configuration, switched to ASGI by DJANGO_SERVER=asgi."""
+from os import getenv
+
+
+bind = '0.0.0.0:8000'
+# Every worker keeps its own in-process caches. With more than one
+# worker, WSGI or ASGI, MENU_CACHE_BACKEND must name a shared backend
+# such as DatabaseCache, otherwise a change only invalidates the tree
+# of the worker that handled it. The app refuses to start with
+# LocMemCache in that case. Metrics are kept per worker as well:
+# /metrics labels its series with the worker pid and only reports the
+# worker serving the scrape, so complete metrics need a single worker.
+workers = int(getenv('WEB_CONCURRENCY', '1'))
+
+if getenv('DJANGO_SERVER', 'wsgi') == 'asgi':
+    wsgi_app = 'tgbot.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'tgbot.wsgi:application'
@@ -1 +1,9 @@
-create schema if not exists django_db;
\ No newline at end of file
+create schema if not exists django_db;
+do $$
+begin
+    execute format(
+        'alter database %I set search_path = public, django_db',
+        current_database()
+    );
+end
+$$;
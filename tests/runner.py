@@ -6,19 +6,7 @@ from django.db import connections
 from django.db.backends.base.base import BaseDatabaseWrapper
 from django.test.runner import DiscoverRunner
 
-
-def prepare_db(self):
-    """
-    Prepare the database.
-
-    Connects to the database and creates the 'django_db'
-    schema if it does not exist.
-
-    Args:
-        self: The instance of the class.
-    """
-    self.connect()
-    self.connection.cursor().execute('CREATE SCHEMA IF NOT EXISTS django_db;')
+from app.db import prepare_db
 
 
 class PostgresSchemaRunner(DiscoverRunner):
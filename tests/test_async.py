@@ -0,0 +1,106 @@
+"""Module for test on the async read views."""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import AsyncRequestFactory, TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from app import async_views
+from app.cache import tree_cache
+from app.models import Button
+
+
+class AsyncViewsTest(TestCase):
+    """Test case class for the async read views."""
+
+    def setUp(self):
+        """
+        Set up test case.
+
+        Creates a small tree, a token and a request factory.
+        """
+        tree_cache.clear()
+        self.user = User.objects.create(username='user')
+        self.token = Token.objects.create(user=self.user).key
+        self.root = Button.objects.create(title='A', description='root')
+        Button.objects.create(title='B', description='b', parent_id=self.root)
+        self.factory = AsyncRequestFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def get(self, path: str, token: str = None, **headers):
+        """
+        Build a GET request.
+
+        Args:
+            path (str): The requested path.
+            token (str, optional): The token to send.
+            **headers: Extra headers of the request.
+
+        Returns:
+            ASGIRequest: The request.
+        """
+        if token:
+            headers['Authorization'] = f'Token {token}'
+        return self.factory.get(path, headers=headers)
+
+    async def aget_sync(self, path: str):
+        """
+        Get a path through the synchronous viewsets.
+
+        Args:
+            path (str): The requested path.
+
+        Returns:
+            Response: The rendered response.
+        """
+        return await sync_to_async(self.client.get)(
+            path, HTTP_ACCEPT='application/json',
+        )
+
+    async def test_same_data_as_viewsets(self) -> None:
+        """
+        Test same data as viewsets.
+
+        Asserts that the async views render what the viewsets render
+        and answer conditional requests with 304. The cache is cleared
+        between the two renders, so that neither reads the other's entry.
+        """
+        response = await async_views.masters(
+            self.get('/api/masters/', self.token),
+        )
+        self.assertEqual(response.status_code, 200)
+        tree_cache.clear()
+        self.assertEqual(
+            response.content,
+            (await self.aget_sync('/api/masters/')).content,
+        )
+        expected = await self.aget_sync(f'/api/buttons/{self.root.pk}/')
+        tree_cache.clear()
+        response = await async_views.button(
+            self.get(f'/api/buttons/{self.root.pk}/', self.token),
+            pk=self.root.pk,
+        )
+        self.assertEqual(response.content, expected.content)
+        not_modified = await async_views.button(
+            self.get(
+                f'/api/buttons/{self.root.pk}/', self.token,
+                If_None_Match=response['ETag'],
+            ),
+            pk=self.root.pk,
+        )
+        self.assertEqual(not_modified.status_code, 304)
+
+    async def test_fallback(self) -> None:
+        """
+        Test fallback.
+
+        Asserts that unauthenticated requests and missing buttons are
+        answered by the viewsets.
+        """
+        response = await async_views.masters(self.get('/api/masters/'))
+        self.assertEqual(response.status_code, 401)
+        response = await async_views.button(
+            self.get('/api/buttons/999/', self.token), pk=999,
+        )
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,74 @@
+"""Module for test on the token authentication cache."""
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from app.authentication import TokenCache, token_cache
+from app.cache import tree_cache
+
+
+class TokenCacheTest(TestCase):
+    """Test case class for the cached token authentication."""
+
+    def setUp(self):
+        """
+        Set up test case.
+
+        Clears the caches and creates a client sending a token.
+        """
+        token_cache.clear()
+        tree_cache.clear()
+        self.user = User.objects.create(username='user')
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_repeated_token(self) -> None:
+        """
+        Test repeated token.
+
+        Asserts that a repeated token is answered without queries once
+        the tree is cached as well.
+        """
+        self.assertEqual(self.client.get('/api/masters/').status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                self.client.get('/api/masters/').status_code, 200,
+            )
+        self.assertEqual(token_cache.stats()['hits'], 1)
+
+    def test_invalidation(self) -> None:
+        """
+        Test invalidation.
+
+        Asserts that deactivating the user or deleting the token takes
+        effect on the next request.
+        """
+        self.client.get('/api/masters/')
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/masters/').status_code, 401)
+
+        self.user.is_active = True
+        self.user.save()
+        self.client.get('/api/masters/')
+        self.token.delete()
+        self.assertEqual(self.client.get('/api/masters/').status_code, 401)
+
+    def test_bounds(self) -> None:
+        """
+        Test bounds.
+
+        Asserts that entries expire and that the least recently used
+        entry is evicted.
+        """
+        cache = TokenCache(max_entries=2, timeout=60)
+        for key in 'abc':
+            cache.set(key, (self.user, key))
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+        expired = TokenCache(max_entries=2, timeout=-1)
+        expired.set('a', (self.user, 'a'))
+        self.assertIsNone(expired.get('a'))
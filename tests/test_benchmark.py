@@ -0,0 +1,51 @@
+"""Module for test on the benchmark suite."""
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from app.benchmark import generate_rows, run_benchmark
+from app.management.commands.benchmark import Command
+from app.models import ID_MAX
+
+
+class BenchmarkTest(TestCase):
+    """Test case class for the API benchmark."""
+
+    def test_generate_rows(self) -> None:
+        """
+        Test generate rows.
+
+        Asserts that the synthetic tree has fanout roots and fanout
+        children under every button above the deepest level.
+        """
+        rows = generate_rows(depth=3, fanout=2)
+        self.assertEqual(len(rows), 2 + 4 + 8)
+        roots = [row for row in rows if row['parent_id'] is None]
+        self.assertEqual(len(roots), 2)
+
+    def test_run_benchmark(self) -> None:
+        """
+        Test run benchmark.
+
+        Asserts that every endpoint answers and that warm requests are
+        served without queries.
+        """
+        result = run_benchmark(depth=2, fanout=3, repeat=2)
+        self.assertEqual(result['buttons'], 12)
+        for endpoint in result['results']:
+            self.assertEqual(endpoint['status'], 200)
+            self.assertGreater(endpoint['cold_queries'], 0)
+            self.assertEqual(endpoint['warm_queries'], 0)
+
+    def test_shapes(self) -> None:
+        """
+        Test shapes.
+
+        Asserts that the default shapes fit the id range of buttons and
+        that larger or empty shapes are refused before any database is
+        created.
+        """
+        for depth, fanout in Command().get_shapes(None):
+            self.assertLessEqual(len(generate_rows(depth, fanout)), ID_MAX)
+        for tree in ('5x10', '0x10', '3x0', '3'):
+            with self.assertRaises(CommandError):
+                call_command('benchmark', tree=[tree])
@@ -0,0 +1,134 @@
+"""Module for test on bulk import and export."""
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from app.bulk import flatten, import_rows
+from app.models import DEPTH_MAX, Button
+from app.signals import tree_changed
+
+
+class BulkTest(TestCase):
+    """Test case class for the bulk import and export of buttons."""
+
+    def setUp(self):
+        """
+        Set up test case.
+
+        Creates a root with a child and a superuser API client.
+        """
+        self.root = Button.objects.create(title='A', description='root')
+        self.child = Button.objects.create(title='B', parent_id=self.root)
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create(
+            username='admin', is_superuser=True,
+        ))
+
+    def export(self, **params):
+        """
+        Export the buttons through the API.
+
+        Args:
+            **params: Query parameters of the export.
+
+        Returns:
+            list: The decoded document.
+        """
+        response = self.client.get('/api/buttons/export/', params)
+        return json.loads(b''.join(response.streaming_content))
+
+    def test_round_trip(self) -> None:
+        """
+        Test round trip.
+
+        Asserts that importing an export changes nothing, for both the
+        flat and the nested document, and keeps null descriptions.
+        """
+        unchanged = {'created': 0, 'updated': 0, 'unchanged': 2, 'deleted': 0}
+        self.assertEqual(import_rows(flatten(self.export())), unchanged)
+        nested = self.export(nested=1)
+        self.assertEqual(nested[0]['buttons'][0]['title'], 'B')
+        self.assertEqual(import_rows(flatten(nested)), unchanged)
+
+        Button.objects.all().delete()
+        import_rows(flatten(nested))
+        self.assertIsNone(Button.objects.get(title='B').description)
+
+    def test_import(self) -> None:
+        """
+        Test import.
+
+        Asserts that new and changed buttons are written with bulk
+        queries and get their materialized paths.
+        """
+        document = [{
+            'id': self.root.pk, 'title': 'A2', 'description': 'root',
+            'buttons': [
+                {'id': self.child.pk, 'title': 'B'},
+                {'id': 100, 'title': 'C', 'buttons': [
+                    {'id': 101, 'title': 'D', 'position': 1},
+                ]},
+            ],
+        }]
+        response = self.client.post(
+            '/api/buttons/import/?delete_missing=1', document, format='json',
+        )
+        self.assertEqual(response.data, {
+            'created': 2, 'updated': 1, 'unchanged': 1, 'deleted': 0,
+        })
+        leaf = Button.objects.get(pk=101)
+        self.assertEqual(list(leaf.ancestors()), [self.root, leaf.parent_id])
+        self.assertEqual(Button.objects.create(title='E').pk, 102)
+
+    def test_invalid(self) -> None:
+        """
+        Test invalid documents.
+
+        Asserts that unknown parents, cycles, too deep trees, ids or
+        positions out of their column range and fields of the wrong
+        type are rejected before anything is written.
+        """
+        for document in (
+            [{'id': 5, 'title': 'X', 'parent_id': 99}],
+            [{'id': 5, 'title': 'X', 'parent_id': 6},
+             {'id': 6, 'title': 'Y', 'parent_id': 5}],
+            [{'id': 5, 'title': ''}],
+            [{'id': 40000, 'title': 'X'}],
+            [{'id': 5, 'title': 'X', 'position': 40000}],
+            [{'id': 5, 'title': 'X', 'position': -1}],
+            [{'id': 5, 'title': 'X', 'position': '1'}],
+            [{'id': pk, 'title': 'X', 'parent_id': pk - 1 if pk > 5 else None}
+             for pk in range(5, 5 + DEPTH_MAX + 2)],
+            ['X'],
+            [{'id': 5, 'title': 'X', 'buttons': {'id': 6}}],
+            [{'id': 5, 'title': 'X', 'description': 5}],
+            [{'id': 5, 'title': 'X', 'parent_id': [1]}],
+            [{'id': 5, 'title': 'X', 'parent_id': {}},
+             {'id': 6, 'title': 'Y', 'parent_id': 5}],
+        ):
+            response = self.client.post(
+                '/api/buttons/import/', document, format='json',
+            )
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(Button.objects.count(), 2)
+
+    def test_signal_on_commit(self) -> None:
+        """
+        Test the change signal.
+
+        Asserts that the tree change is signalled once the import is
+        committed, not before.
+        """
+        received = []
+
+        def receiver(sender, **kwargs):
+            received.append(sender)
+
+        tree_changed.connect(receiver, sender=Button)
+        self.addCleanup(tree_changed.disconnect, receiver, sender=Button)
+        with self.captureOnCommitCallbacks(execute=True):
+            import_rows([{'id': 5, 'title': 'X'}])
+            self.assertEqual(received, [])
+        self.assertEqual(received, [Button])
@@ -0,0 +1,156 @@
+"""Module for test on tree cache."""
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from app.cache import TreeCache, check_shared_backend, tree_cache
+from app.models import Button
+
+
+class TreeCacheTest(TestCase):
+    """Test case class for the versioned tree cache."""
+
+    def setUp(self):
+        """
+        Set up test case.
+
+        Clears the shared tree cache and authenticates an API client.
+        """
+        tree_cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            user=User.objects.create(username='user'),
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Button.objects.create(title='A', description='root')
+
+    def test_hits_and_invalidation(self) -> None:
+        """
+        Test hits and invalidation.
+
+        Asserts that repeated reads are served from the cache and that
+        saving a button renders the tree again once it is committed.
+        """
+        self.assertEqual(len(self.client.get('/api/masters/').json()), 1)
+        with self.assertNumQueries(0):
+            self.client.get('/api/masters/')
+        self.assertEqual(tree_cache.stats()['local_hits'], 1)
+
+        version = tree_cache.get_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            Button.objects.create(title='B', description='second root')
+            self.assertEqual(tree_cache.get_version(), version)
+        self.assertEqual(len(self.client.get('/api/masters/').json()), 2)
+        self.assertEqual(tree_cache.stats()['misses'], 2)
+
+    def test_eviction(self) -> None:
+        """
+        Test eviction.
+
+        Asserts that the in-process tier keeps at most max_entries values.
+        """
+        cache = TreeCache('menu', max_entries=2, timeout=60)
+        cache.clear()
+        for key in ('a', 'b', 'c'):
+            cache.get_or_render(key, lambda: key)
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(cache.stats()['local_size'], 2)
+
+    def test_shared_backend(self) -> None:
+        """
+        Test the shared backend check.
+
+        Asserts that several workers are refused an in-process cache,
+        unlike a single ASGI worker or the database cache the message
+        recommends.
+        """
+        check_shared_backend()
+        with override_settings(DJANGO_SERVER='asgi'):
+            check_shared_backend()
+        with override_settings(WEB_CONCURRENCY=2):
+            with self.assertRaises(ImproperlyConfigured):
+                check_shared_backend()
+        shared = {**settings.CACHES, 'menu': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'menu_cache',
+        }}
+        with override_settings(CACHES=shared, WEB_CONCURRENCY=2):
+            check_shared_backend()
+
+    def test_conditional_get(self) -> None:
+        """
+        Test conditional GET.
+
+        Asserts that a matching If-None-Match is answered with 304 and
+        that a change of the tree invalidates the ETag.
+        """
+        for url in ('/api/masters/', '/api/buttons/'):
+            etag = self.client.get(url)['ETag']
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Button.objects.create(title='B', description='second root')
+        response = self.client.get('/api/masters/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_conditional_errors(self) -> None:
+        """
+        Test conditional GET of invalid requests.
+
+        Asserts that a matching validator does not hide a missing
+        button or an invalid parameter.
+        """
+        root = Button.objects.get(title='A')
+        etag = self.client.get('/api/masters/')['ETag']
+        for url, status in (
+            ('/api/buttons/999/', 404),
+            ('/api/buttons/999/children/', 404),
+            ('/api/buttons/?fields=unknown', 400),
+            (f'/api/buttons/{root.pk}/children/?depth=x', 400),
+        ):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status)
+
+    def test_if_modified_since(self) -> None:
+        """
+        Test If-Modified-Since.
+
+        Asserts that the Last-Modified header validates later requests.
+        """
+        last_modified = self.client.get('/api/masters/')['Last-Modified']
+        response = self.client.get(
+            '/api/masters/', HTTP_IF_MODIFIED_SINCE=last_modified,
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_children(self) -> None:
+        """
+        Test the children endpoint.
+
+        Asserts that the subtree is cut at the requested depth and is
+        rendered by a lookup of the root path and one query matching
+        it as a literal prefix.
+        """
+        root = Button.objects.get(title='A')
+        child = Button.objects.create(title='B', parent_id=root)
+        Button.objects.create(title='C', parent_id=child)
+        url = f'/api/buttons/{root.id}/children/'
+
+        with self.assertNumQueries(2) as queries:
+            data = self.client.get(url).json()
+        self.assertIn(f"'{root.path}%'", queries[1]['sql'])
+        self.assertEqual(data['buttons'][0]['title'], 'B')
+        self.assertEqual(data['buttons'][0]['buttons'], [])
+
+        data = self.client.get(url, {'depth': 2}).json()
+        self.assertEqual(data['buttons'][0]['buttons'][0]['title'], 'C')
+        data = self.client.get(url, {'depth': 0}).json()
+        self.assertEqual(data['buttons'], [])
+        self.assertEqual(self.client.get(url, {'depth': 'x'}).status_code, 400)
+        for lookup in ('999', 'x'):
+            response = self.client.get(f'/api/buttons/{lookup}/children/')
+            self.assertEqual(response.status_code, 404)
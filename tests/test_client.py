@@ -0,0 +1,134 @@
+"""Module for test on the menu API client of the bot."""
+import asyncio
+from contextlib import asynccontextmanager
+from importlib.util import find_spec
+from unittest import skipUnless
+
+from django.test import SimpleTestCase
+
+
+# The bot dependencies are not part of the Django image.
+AIOHTTP_INSTALLED = find_spec('aiohttp') is not None
+if AIOHTTP_INSTALLED:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    from Bot.api import ApiClient
+
+
+TREE = [{'id': 1, 'title': 'A', 'description': '', 'buttons': []}]
+ETAG = '"1"'
+
+
+def create_app() -> 'web.Application':
+    """
+    Create a stand-in for the menu API.
+
+    Serves the tree with an ETag at masters/, a server error at
+    broken/ and a slow response at slow/, and records the headers of
+    every request in app['requests'].
+
+    Returns:
+        web.Application: The stand-in application.
+    """
+    async def masters(request: web.Request) -> web.Response:
+        request.app['requests'].append(request.headers)
+        if request.headers.get('If-None-Match') == ETAG:
+            return web.Response(status=304, headers={'ETag': ETAG})
+        return web.json_response(TREE, headers={'ETag': ETAG})
+
+    async def broken(request: web.Request) -> web.Response:
+        return web.Response(status=500)
+
+    async def slow(request: web.Request) -> web.Response:
+        await asyncio.sleep(1)
+        return web.json_response(TREE)
+
+    app = web.Application()
+    app['requests'] = []
+    app.router.add_get('/api/masters/', masters)
+    app.router.add_get('/api/broken/', broken)
+    app.router.add_get('/api/slow/', slow)
+    return app
+
+
+@asynccontextmanager
+async def serve():
+    """
+    Run the stand-in API with a client pointing at it.
+
+    Yields:
+        tuple: The test server and the client.
+    """
+    async with TestServer(create_app()) as server:
+        api = ApiClient(
+            str(server.make_url('/api/')),
+            {'Authorization': 'Token key'}, timeout=0.2,
+        )
+        try:
+            yield server, api
+        finally:
+            await api.close()
+
+
+@skipUnless(AIOHTTP_INSTALLED, 'requires the bot dependencies')
+class ApiClientTest(SimpleTestCase):
+    """Test case class for the pooled menu API client."""
+
+    async def test_pooled_session(self) -> None:
+        """
+        Test the pooled session.
+
+        Asserts that requests share one session with the default
+        headers, and that a closed client opens a new session.
+        """
+        async with serve() as (server, api):
+            self.assertEqual(await api.get_json('masters/'), TREE)
+            session = api.session
+            self.assertEqual(await api.get_json('masters/'), TREE)
+            self.assertIs(api.session, session)
+            self.assertEqual(api.session.connector.limit, 100)
+            requests = server.app['requests']
+            self.assertEqual(requests[-1]['Authorization'], 'Token key')
+
+            await api.close()
+            self.assertTrue(session.closed)
+            self.assertEqual(await api.get_json('masters/'), TREE)
+            self.assertIsNot(api.session, session)
+
+    async def test_conditional_fetch(self) -> None:
+        """
+        Test conditional fetches.
+
+        Asserts that the ETag of a document is returned and that a
+        revalidation with it is answered by 304 without a document.
+        """
+        async with serve() as (server, api):
+            self.assertEqual(await api.fetch('masters/'), (200, TREE, ETAG))
+            self.assertNotIn('If-None-Match', server.app['requests'][-1])
+            self.assertEqual(
+                await api.fetch('masters/', ETAG), (304, None, ETAG),
+            )
+            self.assertEqual(
+                server.app['requests'][-1]['If-None-Match'], ETAG,
+            )
+
+    async def test_errors(self) -> None:
+        """
+        Test errors.
+
+        Asserts that error statuses, timeouts and refused connections
+        return no document and keep the held ETag.
+        """
+        async with serve() as (server, api):
+            with self.assertLogs(level='WARNING'):
+                self.assertEqual(
+                    await api.fetch('broken/', ETAG), (500, None, ETAG),
+                )
+            with self.assertLogs(level='WARNING'):
+                self.assertEqual(
+                    await api.fetch('slow/', ETAG), (0, None, ETAG),
+                )
+            await server.close()
+            with self.assertLogs(level='WARNING'):
+                self.assertIsNone(await api.get_json('masters/'))
@@ -0,0 +1,42 @@
+"""Module for test on connection stats."""
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from app.db import connection_stats
+
+
+class ConnectionStatsTest(TestCase):
+    """Test case class for the connection stats endpoint."""
+
+    def setUp(self):
+        """
+        Set up test case.
+
+        Resets the counters and creates a regular and an admin client.
+        """
+        connection_stats.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            user=User.objects.create(username='user'),
+        )
+        self.admin = APIClient()
+        self.admin.force_authenticate(
+            user=User.objects.create(username='admin', is_staff=True),
+        )
+
+    def test_stats(self) -> None:
+        """
+        Test stats.
+
+        Asserts that served requests are counted and that the database
+        settings are reported to admins only.
+        """
+        self.assertEqual(
+            self.client.get('/api/stats/connections/').status_code, 403,
+        )
+        self.admin.get('/api/masters/')
+        stats = self.admin.get('/api/stats/connections/').data
+        self.assertEqual(stats['requests'], 2)
+        self.assertIn('conn_max_age', stats['databases']['default'])
+        self.assertTrue(0 <= stats['reuse_ratio'] <= 1)
@@ -0,0 +1,98 @@
+"""Module for test on pre-encoded responses."""
+import gzip
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from app.cache import tree_cache
+from app.models import Button
+
+
+@override_settings(MENU_COMPRESS_MIN_SIZE=0)
+class EncodedResponseTest(TestCase):
+    """Test case class for the pre-encoded tree responses."""
+
+    def setUp(self):
+        """
+        Set up test case.
+
+        Clears the tree cache and creates a small tree.
+        """
+        tree_cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            user=User.objects.create(username='user'),
+        )
+        root = Button.objects.create(title='A', description='root')
+        Button.objects.create(title='B', description='b', parent_id=root)
+
+    def test_gzip(self) -> None:
+        """
+        Test gzip.
+
+        Asserts that clients accepting gzip get the precompressed body
+        with a weak ETag usable for revalidation.
+        """
+        plain = self.client.get('/api/masters/')
+        self.assertNotIn('Content-Encoding', plain)
+        response = self.client.get(
+            '/api/masters/', HTTP_ACCEPT_ENCODING='gzip, deflate',
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(response['ETag'], f'W/{plain["ETag"]}')
+
+        not_modified = self.client.get(
+            '/api/masters/',
+            HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_quality_values(self) -> None:
+        """
+        Test quality values.
+
+        Asserts that codings refused with q=0 are not served, while
+        codings with a positive quality still are.
+        """
+        for header in ('gzip;q=0', 'gzip; q=0.0, deflate', 'gzip;q=x'):
+            response = self.client.get(
+                '/api/masters/', HTTP_ACCEPT_ENCODING=header,
+            )
+            self.assertNotIn('Content-Encoding', response)
+        response = self.client.get(
+            '/api/masters/', HTTP_ACCEPT_ENCODING='br;q=0, gzip;q=0.5',
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_same_body_on_hits(self) -> None:
+        """
+        Test same body on hits.
+
+        Asserts that cached hits serve the bytes rendered on the miss
+        and that the browsable API still gets the data.
+        """
+        first = self.client.get('/api/masters/')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/masters/')
+        self.assertEqual(first.content, second.content)
+        root = json.loads(first.content)[0]
+        self.assertEqual(root['buttons'][0]['title'], 'B')
+
+        html = self.client.get('/api/masters/', HTTP_ACCEPT='text/html')
+        self.assertEqual(html.status_code, 200)
+        self.assertEqual(html.data[0]['title'], 'A')
+
+    def test_vary_accept(self) -> None:
+        """
+        Test Vary.
+
+        Asserts that JSON and browsable responses of the same URL are
+        both marked as varying on Accept.
+        """
+        for accept in ('application/json', 'text/html'):
+            response = self.client.get('/api/masters/', HTTP_ACCEPT=accept)
+            self.assertIn('Accept', response['Vary'].split(', '))
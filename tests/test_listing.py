@@ -0,0 +1,95 @@
+"""Module for test on button listings."""
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from app.cache import tree_cache
+from app.models import Button
+
+
+URL = '/api/buttons/'
+
+
+class ListingTest(TestCase):
+    """Test case class for paginated, flat and field-selected listings."""
+
+    def setUp(self):
+        """
+        Set up test case.
+
+        Creates five roots with one child each.
+        """
+        tree_cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create(username='u'))
+        for index in range(5):
+            root = Button.objects.create(title=f'R{index}', description='x')
+            Button.objects.create(title=f'C{index}', parent_id=root)
+
+    def test_unpaginated_by_default(self) -> None:
+        """
+        Test unpaginated by default.
+
+        Asserts that a plain request still gets the whole nested list.
+        """
+        data = self.client.get(URL).json()
+        self.assertEqual(len(data), 10)
+        self.assertIn('buttons', data[0])
+
+    def test_keyset_pages(self) -> None:
+        """
+        Test keyset pages.
+
+        Asserts that following the cursors walks every button once,
+        in id order, through links relative to the host.
+        """
+        ids = []
+        response = self.client.get(URL, {'page_size': 3, 'flat': 1})
+        while True:
+            page = response.json()
+            ids.extend(button['id'] for button in page['results'])
+            if not page['next']:
+                break
+            self.assertTrue(page['next'].startswith(URL))
+            response = self.client.get(page['next'])
+        expected = Button.objects.order_by('id').values_list('id', flat=True)
+        self.assertEqual(ids, list(expected))
+
+    def test_fields_and_flat(self) -> None:
+        """
+        Test fields and flat.
+
+        Asserts that a flat listing of selected fields is a single query
+        returning only those fields, and that a nested listing does not
+        load unrequested columns of the nested buttons either.
+        """
+        with self.assertNumQueries(1):
+            data = self.client.get(
+                URL, {'flat': 'true', 'fields': 'id,parent_id'},
+            ).json()
+        self.assertEqual(set(data[0]), {'id', 'parent_id'})
+        children = [button for button in data if button['parent_id']]
+        self.assertEqual(len(children), 5)
+
+        data = self.client.get(URL, {'fields': 'id,title'}).json()
+        self.assertEqual(set(data[0]), {'id', 'title'})
+
+        tree_cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(URL, {'fields': 'id,buttons'}).json()
+        self.assertEqual(set(data[0]['buttons'][0]), {'id', 'buttons'})
+        for query in queries:
+            self.assertNotIn('description', query['sql'])
+
+    def test_unknown_fields(self) -> None:
+        """
+        Test unknown fields.
+
+        Asserts that an unknown field is rejected with the valid ones.
+        """
+        response = self.client.get(URL, {'flat': 1, 'fields': 'id,name'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('name', response.json()['fields'])
+        self.assertIn('parent_id', response.json()['fields'])
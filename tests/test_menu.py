@@ -0,0 +1,227 @@
+"""Module for test on the bot menu tree."""
+import asyncio
+from time import time
+
+from django.test import SimpleTestCase
+
+from Bot.menu import (
+    CALLBACK_BACK, MenuCache, MenuIndex, decode_callback, encode_callback,
+)
+
+
+TREE = [{'id': 1, 'title': 'A', 'description': '', 'buttons': []}]
+
+
+class FakeApi:
+    """Stand-in for the API client returning queued responses."""
+
+    def __init__(self, *responses):
+        """
+        Initialize the stand-in.
+
+        Args:
+            *responses: Tuples of status, data and ETag to return, or
+                errors to raise.
+        """
+        self.responses = list(responses)
+        self.etags = []
+        self.gate = None
+
+    async def fetch(self, path, etag=None):
+        """
+        Return the next queued response, once the gate is open if set.
+
+        Args:
+            path (str): The requested path.
+            etag (str, optional): The ETag sent by the cache.
+
+        Returns:
+            tuple: The queued status, data and ETag.
+
+        Raises:
+            Exception: The queued error, if one is queued.
+        """
+        self.etags.append(etag)
+        if self.gate is not None:
+            await self.gate.wait()
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class MenuCacheTest(SimpleTestCase):
+    """Test case class for the bot menu cache."""
+
+    async def test_stale_while_revalidate(self) -> None:
+        """
+        Test stale-while-revalidate.
+
+        Asserts that the held tree survives 304 and failed refreshes
+        and that revalidation sends the held ETag.
+        """
+        menu = MenuCache(FakeApi((200, TREE, '"1"'), (304, None, '"1"'),
+                                 (0, None, '"1"')))
+        self.assertEqual(await menu.get_tree(), TREE)
+        self.assertFalse(await menu.refresh())
+        self.assertFalse(await menu.refresh())
+        self.assertEqual(await menu.get_tree(), TREE)
+        self.assertEqual(menu.api.etags, [None, '"1"', '"1"'])
+
+    async def test_invalidate(self) -> None:
+        """
+        Test invalidate.
+
+        Asserts that a pushed notification refreshes the tree and
+        records the propagation latency.
+        """
+        menu = MenuCache(FakeApi((200, TREE, '"1"'), (200, [], '"2"')))
+        await menu.get_tree()
+        self.assertTrue(await menu.invalidate(sent=time()))
+        self.assertEqual(menu.tree, [])
+        self.assertGreaterEqual(menu.propagation, 0)
+
+    async def test_change_during_refresh(self) -> None:
+        """
+        Test a change notified during a refresh.
+
+        Asserts that a refresh requested while another is in flight
+        fetches the tree once more after it.
+        """
+        api = FakeApi((200, TREE, '"1"'), (200, [], '"2"'))
+        api.gate = asyncio.Event()
+        menu = MenuCache(api)
+        first = asyncio.create_task(menu.refresh())
+        await asyncio.sleep(0)
+        second = asyncio.create_task(menu.invalidate())
+        await asyncio.sleep(0)
+        api.gate.set()
+        self.assertTrue(await first)
+        self.assertTrue(await second)
+        self.assertEqual(menu.tree, [])
+        self.assertEqual(api.etags, [None, '"1"'])
+
+    async def test_run_survives_errors(self) -> None:
+        """
+        Test the refresh loop.
+
+        Asserts that an unexpected error of a refresh is logged and
+        that the loop keeps refreshing.
+        """
+        api = FakeApi(ValueError('bad json'), (200, TREE, '"1"'))
+        menu = MenuCache(api, interval=0)
+        with self.assertLogs(level='ERROR'):
+            menu.start()
+            while menu.tree is None:
+                await asyncio.sleep(0)
+        await menu.stop()
+        self.assertEqual(menu.tree, TREE)
+
+
+class Untouchable(list):
+    """List that fails the test when it is scanned."""
+
+    def __iter__(self):
+        """
+        Refuse iteration.
+
+        Raises:
+            AssertionError: Always, since lookups must not scan children.
+        """
+        raise AssertionError('children were scanned')
+
+
+def make_tree(depth, fan_out):
+    """
+    Build a synthetic tree.
+
+    Args:
+        depth (int): The number of levels below the roots.
+        fan_out (int): The number of children of every inner button.
+
+    Returns:
+        tuple: The root buttons and the id of the last, deepest button.
+    """
+    ids = iter(range(1, 10 ** 6))
+    roots = [{'id': next(ids), 'buttons': []} for _ in range(fan_out)]
+    level = roots
+    for _ in range(depth):
+        node = level[-1]
+        node['buttons'] = [
+            {'id': next(ids), 'buttons': []} for _ in range(fan_out)
+        ]
+        level = node['buttons']
+    return roots, level[-1]['id']
+
+
+class MenuIndexTest(SimpleTestCase):
+    """Test case class for the id index of the menu tree."""
+
+    def test_lookup_without_scans(self) -> None:
+        """
+        Test lookup cost.
+
+        Asserts that buttons and parents at any depth and fan-out are
+        resolved without scanning a single list of children.
+        """
+        for depth, fan_out in ((1, 1), (50, 3), (3, 500), (500, 20)):
+            roots, deepest = make_tree(depth, fan_out)
+            index = MenuIndex(roots)
+            for node in index.nodes.values():
+                node['buttons'] = Untouchable(node['buttons'])
+            self.assertEqual(len(index.nodes), fan_out * (depth + 1))
+            self.assertEqual(index.get(str(deepest))['id'], deepest)
+            self.assertEqual(index.parent(deepest)['id'], deepest - fan_out)
+            self.assertIsNone(index.parent(roots[0]['id']))
+            self.assertIsNone(index.get('back'))
+
+    def test_render_memoized(self) -> None:
+        """
+        Test memoized renderings.
+
+        Asserts that children are rendered once per button and tree,
+        and again for a newly loaded tree.
+        """
+        roots, _ = make_tree(2, 2)
+        calls = []
+
+        def build(children):
+            calls.append(children)
+            return [child['id'] for child in children]
+
+        index = MenuIndex(roots)
+        self.assertEqual(index.render(None, build), [1, 2])
+        self.assertIs(index.render(None, build), index.render(None, build))
+        self.assertEqual(index.render('2', build), [3, 4])
+        self.assertEqual(index.render(2, build), [3, 4])
+        self.assertEqual(len(calls), 2)
+
+        MenuIndex(roots).render(None, build)
+        self.assertEqual(len(calls), 3)
+
+
+class CallbackDataTest(SimpleTestCase):
+    """Test case class for the callback data encoding."""
+
+    def test_round_trip(self) -> None:
+        """
+        Test round trip.
+
+        Asserts that encoded ids decode back and keep a fixed size.
+        """
+        self.assertEqual(decode_callback(encode_callback(15)), '15')
+        self.assertEqual(encode_callback(15), 'btn:15')
+        self.assertEqual(
+            decode_callback(encode_callback(CALLBACK_BACK)), CALLBACK_BACK,
+        )
+
+    def test_legacy_paths(self) -> None:
+        """
+        Test legacy paths.
+
+        Asserts that path-style data of old keyboards resolves to the
+        last button of the path.
+        """
+        self.assertEqual(decode_callback('btn:2:7:15'), '15')
+        self.assertEqual(decode_callback('btn:2:back'), CALLBACK_BACK)
+        self.assertIsNone(decode_callback('btn'))
@@ -0,0 +1,159 @@
+"""Module for test on the request metrics."""
+from os import getpid
+
+from django.contrib.auth.models import User
+from django.test import AsyncClient, Client, TestCase, override_settings
+from django.urls import include, path
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from app import async_views
+from app.cache import tree_cache
+from app.metrics import Histogram, request_metrics
+from app.models import Button
+
+
+WORKER = f'worker="{getpid()}"'
+
+# The routes of MENU_ASYNC_READS, which app.urls picks at import.
+urlpatterns = [
+    path('api/masters/', async_views.masters, name='master-list'),
+    path('', include('tgbot.urls')),
+]
+
+
+class MetricsTest(TestCase):
+    """Test case class for the metrics middleware and endpoint."""
+
+    def setUp(self):
+        """
+        Set up test case.
+
+        Resets the metrics and the tree cache and creates a client, and
+        an admin client for the metrics endpoint.
+        """
+        request_metrics.clear()
+        tree_cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            user=User.objects.create(username='user'),
+        )
+        self.admin = Client()
+        self.admin.force_login(
+            User.objects.create(username='admin', is_staff=True),
+        )
+        Button.objects.create(title='A', description='root')
+
+    def test_route_histograms(self) -> None:
+        """
+        Test route histograms.
+
+        Asserts that requests are recorded per route with their query
+        counts and that cache counters and hit ratios are exposed.
+        """
+        self.client.get('/api/masters/')
+        self.client.get('/api/masters/')
+        body = self.admin.get('/metrics').content.decode()
+        labels = f'route="master-list",method="GET",{WORKER}'
+        self.assertIn(f'http_request_duration_seconds_count{{{labels}}} 2',
+                      body)
+        self.assertIn(f'http_request_queries_bucket{{{labels},le="0"}} 1',
+                      body)
+        self.assertIn(f'menu_cache_hit_ratio{{cache="tree",{WORKER}}} 0.5',
+                      body)
+        self.assertIn('# TYPE menu_cache_events_total counter', body)
+        self.assertIn(
+            f'menu_cache_events_total{{cache="tree",event="misses",'
+            f'{WORKER}}} 1',
+            body,
+        )
+
+    @override_settings(MENU_QUERY_BUDGET=0)
+    def test_query_budget(self) -> None:
+        """
+        Test query budget.
+
+        Asserts that requests over the query budget are counted.
+        """
+        with self.assertLogs(level='WARNING'):
+            self.client.get('/api/masters/')
+        body = self.admin.get('/metrics').content.decode()
+        self.assertIn(
+            'http_request_query_budget_exceeded_total'
+            f'{{route="master-list",method="GET",{WORKER}}} 1',
+            body,
+        )
+
+    def test_staff_only(self) -> None:
+        """
+        Test staff only.
+
+        Asserts that without a configured token only staff users may
+        read the metrics.
+        """
+        self.assertEqual(Client().get('/metrics').status_code, 403)
+        client = Client()
+        client.force_login(User.objects.get(username='user'))
+        self.assertEqual(client.get('/metrics').status_code, 403)
+        self.assertEqual(self.admin.get('/metrics').status_code, 200)
+
+    @override_settings(MENU_METRICS_TOKEN='secret')
+    def test_token(self) -> None:
+        """
+        Test token.
+
+        Asserts that a configured token is required.
+        """
+        for header in ({}, {'HTTP_AUTHORIZATION': 'Bearer wrong'}):
+            response = self.client.get('/metrics', **header)
+            self.assertEqual(response.status_code, 401)
+            self.assertEqual(response['WWW-Authenticate'], 'Bearer')
+        response = self.client.get(
+            '/metrics', HTTP_AUTHORIZATION='Bearer secret',
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(MENU_ASYNC_READS=True, ROOT_URLCONF=__name__)
+    async def test_async_reads(self) -> None:
+        """
+        Test async reads.
+
+        Asserts that requests served by the async views are recorded
+        with their queries and serialization time.
+        """
+        token = await Token.objects.acreate(
+            user=await User.objects.acreate(username='async'),
+        )
+        response = await AsyncClient().get(
+            '/api/masters/', headers={'Authorization': f'Token {token}'},
+        )
+        self.assertEqual(response.status_code, 200)
+        body = request_metrics.render(WORKER)
+        labels = f'route="master-list",method="GET",{WORKER}'
+        self.assertIn(
+            f'http_request_duration_seconds_count{{{labels}}} 1', body,
+        )
+        self.assertIn(f'http_request_queries_bucket{{{labels},le="0"}} 0',
+                      body)
+        self.assertIn(
+            'http_request_serializer_duration_seconds_count'
+            f'{{{labels}}} 1',
+            body,
+        )
+
+    def test_histogram(self) -> None:
+        """
+        Test histogram.
+
+        Asserts that buckets are cumulative and inclusive.
+        """
+        histogram = Histogram((1, 10))
+        for value in (1, 5, 50):
+            histogram.observe(value)
+        self.assertEqual(histogram.render('x', 'a="b"'), [
+            'x_bucket{a="b",le="1"} 1',
+            'x_bucket{a="b",le="10"} 2',
+            'x_bucket{a="b",le="+Inf"} 3',
+            'x_sum{a="b"} 56',
+            'x_count{a="b"} 3',
+        ])
@@ -0,0 +1,141 @@
+"""Module for test on menu change notifications."""
+import asyncio
+import json
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from importlib.util import find_spec
+from threading import Event, Thread
+from unittest import skipUnless
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from app.models import Button
+from app.notify import send_notification
+
+
+# The bot dependencies are not part of the Django image.
+AIOHTTP_INSTALLED = find_spec('aiohttp') is not None
+if AIOHTTP_INSTALLED:
+    from aiohttp.test_utils import TestClient, TestServer
+
+    from Bot.notify import create_notify_app
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the bot endpoint recording notifications."""
+
+    received = []
+    delivered = Event()
+
+    def do_POST(self):
+        """Record the notification and accept it."""
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.received.append((self.headers['X-Menu-Token'], json.loads(body)))
+        self.send_response(202)
+        self.end_headers()
+        self.delivered.set()
+
+    def log_message(self, *args):
+        """Keep the test output quiet."""
+
+
+class NotifyTest(TestCase):
+    """Test case class for pushing menu changes to the bot."""
+
+    def setUp(self):
+        """
+        Set up test case.
+
+        Starts the stand-in bot endpoint on a free local port.
+        """
+        StandInHandler.received = []
+        StandInHandler.delivered.clear()
+        self.server = HTTPServer(('127.0.0.1', 0), StandInHandler)
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}/menu/changed'
+
+    def tearDown(self):
+        """Stop the stand-in bot endpoint."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_send(self) -> None:
+        """
+        Test send.
+
+        Asserts that the notification reaches the bot with its token.
+        """
+        status = send_notification(self.url, 'secret', {'version': 1})
+        self.assertEqual(status, 202)
+        self.assertEqual(StandInHandler.received, [('secret', {'version': 1})])
+
+    def test_notify_on_commit(self) -> None:
+        """
+        Test notify on commit.
+
+        Asserts that a committed Button change schedules a notification
+        carrying the tree version and the sending time.
+        """
+        with override_settings(MENU_NOTIFY_URL=self.url):
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                Button.objects.create(title='A')
+        self.assertTrue(callbacks)
+        self.assertTrue(StandInHandler.delivered.wait(timeout=5))
+        self.assertEqual(len(StandInHandler.received), 1)
+        self.assertIn('sent', StandInHandler.received[0][1])
+
+    def test_unreachable(self) -> None:
+        """
+        Test unreachable bot.
+
+        Asserts that a failed notification does not raise.
+        """
+        self.server.server_close()
+        self.assertEqual(send_notification(self.url, '', {}), 0)
+
+
+class FakeMenu:
+    """Stand-in for the menu cache counting invalidations."""
+
+    def __init__(self):
+        """Initialize the stand-in."""
+        self.sent = []
+
+    async def invalidate(self, sent=None):
+        """
+        Record an invalidation.
+
+        Args:
+            sent (float, optional): The sending time of the notification.
+
+        Returns:
+            bool: Always False.
+        """
+        self.sent.append(sent)
+        return False
+
+
+@skipUnless(AIOHTTP_INSTALLED, 'requires the bot dependencies')
+class NotifyAppTest(SimpleTestCase):
+    """Test case class for the notification endpoint of the bot."""
+
+    async def test_token(self) -> None:
+        """
+        Test the token check.
+
+        Asserts that the endpoint cannot be created without a token and
+        that only the right token schedules a refresh.
+        """
+        with self.assertRaises(ValueError):
+            create_notify_app(FakeMenu(), '')
+        menu = FakeMenu()
+        app = create_notify_app(menu, 'secret')
+        async with TestClient(TestServer(app)) as client:
+            for token, status in (('', 403), ('wrong', 403),
+                                  ('secret', 202)):
+                response = await client.post(
+                    '/menu/changed', json={'sent': 1},
+                    headers={'X-Menu-Token': token},
+                )
+                self.assertEqual(response.status, status)
+            await asyncio.sleep(0)
+        self.assertEqual(menu.sent, [1])
@@ -0,0 +1,103 @@
+"""Module for test on the rate-limited sender."""
+from django.test import SimpleTestCase
+
+from Bot.sender import Sender, TokenBucket
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self):
+        """
+        Get the current time.
+
+        Returns:
+            float: The current time in seconds.
+        """
+        return self.now
+
+
+class RetryAfter(Exception):
+    """Stand-in for the flood control error of Telegram."""
+
+    def __init__(self, retry_after):
+        """
+        Initialize the error.
+
+        Args:
+            retry_after (float): Seconds to wait before retrying.
+        """
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
+class SenderTest(SimpleTestCase):
+    """Test case class for the token buckets and the sender."""
+
+    def test_bucket(self) -> None:
+        """
+        Test bucket.
+
+        Asserts that a burst is allowed up to the capacity and that
+        later tokens are spaced by the rate.
+        """
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+        self.assertEqual([bucket.reserve() for _ in range(4)], [0, 0, 0.5, 1])
+        clock.now = 10
+        self.assertTrue(bucket.is_full())
+        self.assertEqual(bucket.reserve(), 0)
+
+    async def test_chat_limit(self) -> None:
+        """
+        Test chat limit.
+
+        Asserts that calls beyond the burst of a chat are delayed while
+        other chats are not.
+        """
+        sender = Sender(global_rate=1000, chat_rate=100, chat_burst=1)
+        sent = []
+
+        async def method(text):
+            sent.append(text)
+            return text
+
+        self.assertEqual(await sender.send(1, method, 'a'), 'a')
+        await sender.send(1, method, 'b')
+        await sender.send(2, method, 'c')
+        self.assertEqual(sent, ['a', 'b', 'c'])
+        stats = sender.stats()
+        self.assertEqual((stats['sent'], stats['throttled']), (3, 1))
+        self.assertEqual(stats['pending'], 0)
+
+    async def test_retry_after(self) -> None:
+        """
+        Test retry after.
+
+        Asserts that a 429 is retried and other errors are raised.
+        """
+        sender = Sender(global_rate=1000, chat_rate=1000, retries=1)
+        errors = [RetryAfter(0.01)]
+
+        async def method():
+            if errors:
+                raise errors.pop()
+            return 'ok'
+
+        self.assertEqual(await sender.send(1, method), 'ok')
+        self.assertEqual(sender.stats()['retries'], 1)
+
+        errors.extend([RetryAfter(0.01), RetryAfter(0.01)])
+        with self.assertRaises(RetryAfter):
+            await sender.send(1, method)
+        errors.clear()
+
+        async def broken():
+            raise ValueError('broken')
+
+        with self.assertRaises(ValueError):
+            await sender.send(1, broken)
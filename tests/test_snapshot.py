@@ -0,0 +1,101 @@
+"""Module for test on menu snapshots."""
+import asyncio
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.test import TestCase, override_settings
+
+from app.models import Button
+from app.signals import write_configured_snapshot
+from app.snapshot import write_snapshot
+from Bot.menu import MenuCache, SnapshotLoader
+
+
+class SnapshotTest(TestCase):
+    """Test case class for the menu snapshot export and loading."""
+
+    def setUp(self):
+        """
+        Set up test case.
+
+        Creates a root with one child and a temporary snapshot file.
+        """
+        root = Button.objects.create(title='A', description='root')
+        Button.objects.create(title='B', parent_id=root)
+        self.directory = TemporaryDirectory()
+        self.path = Path(self.directory.name) / 'menu.json'
+
+    def tearDown(self):
+        """Remove the temporary snapshot file."""
+        self.directory.cleanup()
+
+    def test_export(self) -> None:
+        """
+        Test export.
+
+        Asserts that the snapshot holds the nested tree and its hash.
+        """
+        content_hash = write_snapshot(self.path)
+        document = json.loads(self.path.read_bytes())
+        self.assertEqual(document['hash'], content_hash)
+        self.assertEqual(document['tree'][0]['buttons'][0]['title'], 'B')
+
+    def test_export_once(self) -> None:
+        """
+        Test export once per transaction.
+
+        Asserts that changing several buttons in one transaction writes
+        the snapshot once, with every change.
+        """
+        with override_settings(MENU_SNAPSHOT_PATH=str(self.path)):
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                for title in ('C', 'D', 'E'):
+                    Button.objects.create(title=title)
+        exports = [
+            callback for callback in callbacks
+            if callback.func is write_configured_snapshot
+        ]
+        self.assertEqual(len(exports), 1)
+        document = json.loads(self.path.read_bytes())
+        self.assertEqual(len(document['tree']), 4)
+
+    def test_export_error(self) -> None:
+        """
+        Test a failed export.
+
+        Asserts that an export error is logged without failing the
+        commit nor skipping the later callbacks, and that no temporary
+        file is left behind.
+        """
+        self.path.write_bytes(b'')
+        with override_settings(MENU_SNAPSHOT_PATH=str(self.path / 'x')):
+            with self.assertLogs('django', level='ERROR'):
+                with self.captureOnCommitCallbacks(execute=True) as calls:
+                    Button.objects.create(title='C')
+        self.assertTrue(all(call.done for call in calls))
+
+        write_snapshot(self.path)
+        self.assertEqual(
+            list(self.path.parent.iterdir()), [self.path],
+        )
+
+    def test_bot_loading(self) -> None:
+        """
+        Test bot loading.
+
+        Asserts that the bot boots from the snapshot and that an
+        unchanged export is not loaded again.
+        """
+        write_snapshot(self.path)
+        menu = MenuCache(SnapshotLoader(str(self.path)))
+        tree = asyncio.run(menu.get_tree())
+        self.assertEqual(tree[0]['title'], 'A')
+        self.assertEqual(menu.index.get(tree[0]['id']), tree[0])
+
+        write_snapshot(self.path)
+        self.assertFalse(asyncio.run(menu.refresh()))
+        Button.objects.create(title='C')
+        write_snapshot(self.path)
+        self.assertTrue(asyncio.run(menu.refresh()))
+        self.assertEqual(len(menu.tree), 2)
@@ -0,0 +1,71 @@
+"""Module for test on the startup command."""
+import json
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from app.models import Button
+
+
+class StartupTest(TestCase):
+    """Test case class for the startup command."""
+
+    def setUp(self):
+        """
+        Set up test case.
+
+        Writes a fixture with a root and a child button.
+        """
+        self.directory = TemporaryDirectory()
+        self.fixture = Path(self.directory.name) / 'menu.json'
+        self.write_fixture('A')
+
+    def tearDown(self):
+        """Remove the temporary fixture."""
+        self.directory.cleanup()
+
+    def write_fixture(self, title):
+        """
+        Write the fixture.
+
+        Args:
+            title (str): The title of the root button.
+        """
+        self.fixture.write_text(json.dumps([
+            {'model': 'app.button', 'pk': 1,
+             'fields': {'title': title, 'parent_id': None}},
+            {'model': 'app.button', 'pk': 2,
+             'fields': {'title': 'B', 'parent_id': 1}},
+        ]))
+
+    def startup(self) -> str:
+        """
+        Run the startup command.
+
+        Returns:
+            str: The report of the command.
+        """
+        output = StringIO()
+        call_command('startup', str(self.fixture), stdout=output)
+        return output.getvalue()
+
+    def test_loads_only_changes(self) -> None:
+        """
+        Test loads only changes.
+
+        Asserts that the fixture is loaded once per content and that
+        migrations are not applied again.
+        """
+        report = self.startup()
+        self.assertIn('no migrations', report)
+        self.assertIn('loaded', report)
+        self.assertEqual(Button.objects.get(pk=2).depth, 1)
+
+        self.assertIn('fixtures unchanged', self.startup())
+
+        self.write_fixture('A2')
+        self.assertIn('loaded', self.startup())
+        self.assertEqual(Button.objects.get(pk=1).title, 'A2')
@@ -0,0 +1,167 @@
+"""Module for test on tree serialization."""
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from app.models import DEPTH_MAX, Button, rebuild_paths
+from app.serializers import ButtonSerializer
+
+
+class TreeSerializationTest(TestCase):
+    """Test case class for nested button serialization."""
+
+    def setUp(self):
+        """
+        Set up test case.
+
+        Creates a small menu tree with two levels of children.
+        """
+        self.root = Button.objects.create(title='A', description='root')
+        self.child = Button.objects.create(
+            title='B', description='child', parent_id=self.root)
+        Button.objects.create(
+            title='C', description='leaf', parent_id=self.child)
+        Button.objects.create(title='D', description='other root')
+
+    def test_nested_output(self) -> None:
+        """
+        Test nested output.
+
+        Asserts that children are nested under their parents.
+        """
+        data = ButtonSerializer(self.root).data
+        self.assertEqual(data['buttons'][0]['title'], 'B')
+        self.assertEqual(data['buttons'][0]['buttons'][0]['title'], 'C')
+        self.assertEqual(data['buttons'][0]['buttons'][0]['buttons'], [])
+
+    def test_single_query(self) -> None:
+        """
+        Test query count.
+
+        Asserts that the whole forest is rendered with one query
+        besides the query for the roots.
+        """
+        roots = Button.objects.filter(parent_id=None)
+        with self.assertNumQueries(2):
+            data = ButtonSerializer(roots, many=True).data
+        self.assertEqual([root['title'] for root in data], ['A', 'D'])
+
+
+class MaterializedPathTest(TestCase):
+    """Test case class for the materialized path of buttons."""
+
+    def setUp(self):
+        """
+        Set up test case.
+
+        Creates a chain of three buttons and a second root.
+        """
+        self.root = Button.objects.create(title='A')
+        self.child = Button.objects.create(title='B', parent_id=self.root)
+        self.leaf = Button.objects.create(title='C', parent_id=self.child)
+        self.other = Button.objects.create(title='D')
+
+    def test_helpers(self) -> None:
+        """
+        Test helpers.
+
+        Asserts that depth, ancestors and descendants follow the tree.
+        """
+        self.assertEqual(self.leaf.depth, 2)
+        self.assertEqual(list(self.leaf.ancestors()), [self.root, self.child])
+        self.assertEqual(
+            list(self.root.descendants()), [self.child, self.leaf],
+        )
+        subtree = Button.objects.subtree(self.root.pk, depth=1)
+        self.assertEqual(list(subtree), [self.root, self.child])
+        self.assertEqual(list(Button.objects.subtree(999)), [])
+        self.assertEqual(list(Button(title='E').descendants()), [])
+
+    def test_reparent(self) -> None:
+        """
+        Test reparent.
+
+        Asserts that moving a button rewrites the paths of its subtree
+        and that moving it under its own descendant is rejected.
+        """
+        self.child.parent_id = self.other
+        self.child.save()
+        self.leaf.refresh_from_db()
+        self.assertEqual(list(self.leaf.ancestors()), [self.other, self.child])
+        self.assertEqual(list(self.root.descendants()), [])
+
+        self.other.parent_id = self.leaf
+        with self.assertRaises(ValidationError):
+            self.other.save()
+
+    def test_clean(self) -> None:
+        """
+        Test clean.
+
+        Asserts that the admin reports a cycle on the form and that
+        buttons are not nested deeper than their paths allow.
+        """
+        self.client.force_login(User.objects.create(
+            username='admin', is_staff=True, is_superuser=True,
+        ))
+        response = self.client.post(
+            f'/admin/app/button/{self.root.pk}/change/',
+            {'title': 'A', 'parent_id': self.leaf.pk, 'position': 0},
+        )
+        self.assertEqual(response.status_code, 200)
+        form = response.context['adminform'].form
+        self.assertIn('parent_id', form.errors)
+
+        parent = self.other
+        for _ in range(DEPTH_MAX):
+            parent = Button.objects.create(title='E', parent_id=parent)
+        self.assertEqual(parent.depth, DEPTH_MAX)
+        with self.assertRaises(ValidationError):
+            Button(title='F', parent_id=parent).full_clean()
+        with self.assertRaises(ValidationError):
+            Button.objects.create(title='F', parent_id=parent)
+        self.root.parent_id = parent.parent_id.parent_id
+        with self.assertRaises(ValidationError):
+            self.root.full_clean()
+
+    def test_rebuild(self) -> None:
+        """
+        Test rebuild.
+
+        Asserts that paths lost by raw loads are recomputed.
+        """
+        Button.objects.update(path='', depth=0)
+        self.assertEqual(rebuild_paths(Button), 4)
+        self.leaf.refresh_from_db()
+        self.assertEqual(self.leaf.depth, 2)
+        self.assertEqual(rebuild_paths(Button), 0)
+
+    def test_sibling_order(self) -> None:
+        """
+        Test sibling order.
+
+        Asserts that children are served by position, not by title.
+        """
+        Button.objects.create(title='0', parent_id=self.root, position=2)
+        self.child.position = 1
+        self.child.save()
+        data = ButtonSerializer(self.root).data
+        self.assertEqual([btn['title'] for btn in data['buttons']], ['B', '0'])
+
+    def test_default_position(self) -> None:
+        """
+        Test default position.
+
+        Asserts that a button created without a position is placed
+        after its siblings.
+        """
+        self.child.position = 5
+        self.child.save()
+        button = Button.objects.create(title='E', parent_id=self.root)
+        self.assertEqual(button.position, 6)
+        self.assertEqual(
+            list(Button.objects.filter(parent_id=self.root)),
+            [self.child, button],
+        )
+        leaf = Button.objects.create(title='F', parent_id=button)
+        self.assertEqual(leaf.position, 0)
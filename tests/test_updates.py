@@ -0,0 +1,245 @@
+"""Module for test on fanning updates out to workers."""
+import asyncio
+import queue
+from importlib.util import find_spec
+from unittest import skipUnless
+
+from django.test import SimpleTestCase
+
+from Bot.updates import Ingress, QueueBackend, consume, partition_of
+
+
+# The bot dependencies are not part of the Django image.
+AIOGRAM_INSTALLED = find_spec('aiogram') is not None
+if AIOGRAM_INSTALLED:
+    from aiogram.exceptions import TelegramNetworkError
+    from aiogram.types import Update
+
+    from Bot.workers import poll_updates
+
+
+def make_update(update_id, chat_id):
+    """
+    Build a raw callback query update.
+
+    Args:
+        update_id (int): The id of the update.
+        chat_id (int): The chat the callback comes from.
+
+    Returns:
+        dict: The raw update.
+    """
+    return {
+        'update_id': update_id,
+        'callback_query': {
+            'id': str(update_id),
+            'from': {'id': chat_id},
+            'message': {'chat': {'id': chat_id}},
+            'data': 'btn:1',
+        },
+    }
+
+
+class UpdatesTest(SimpleTestCase):
+    """Test case class for the in-process update queue backend."""
+
+    def test_partitioning(self) -> None:
+        """
+        Test partitioning.
+
+        Asserts that every update of a chat goes to the same partition.
+        """
+        partitions = {partition_of(make_update(i, 42), 4) for i in range(9)}
+        self.assertEqual(partitions, {42 % 4})
+        message = {'update_id': 1, 'message': {'chat': {'id': 7}}}
+        self.assertEqual(partition_of(message, 4), 3)
+
+    async def test_per_chat_order(self) -> None:
+        """
+        Test per-chat order.
+
+        Asserts that workers handle the updates of every chat in the
+        order they arrived.
+        """
+        backend = QueueBackend(3, 100)
+        ingress = Ingress(backend)
+        handled = []
+
+        async def handle(update):
+            await asyncio.sleep(0)
+            handled.append(update['update_id'])
+
+        for update_id in range(30):
+            self.assertTrue(
+                await ingress.dispatch(make_update(update_id, update_id % 5)),
+            )
+        await ingress.stop()
+        await asyncio.gather(*(
+            consume(backend, partition, handle) for partition in range(3)
+        ))
+        self.assertEqual(len(handled), 30)
+        for chat_id in range(5):
+            chat = [i for i in handled if i % 5 == chat_id]
+            self.assertEqual(chat, sorted(chat))
+
+    async def test_back_pressure(self) -> None:
+        """
+        Test back-pressure.
+
+        Asserts that a full partition rejects updates.
+        """
+        ingress = Ingress(QueueBackend(1, 1), timeout=0.01)
+        self.assertTrue(await ingress.dispatch(make_update(1, 1)))
+        self.assertFalse(await ingress.dispatch(make_update(2, 1)))
+
+    async def test_dead_letters(self) -> None:
+        """
+        Test dead letters.
+
+        Asserts that an update failing every attempt is set aside and
+        does not block the next one.
+        """
+        backend = QueueBackend(1, 10)
+        ingress = Ingress(backend)
+        attempts = []
+
+        async def handle(update):
+            attempts.append(update['update_id'])
+            if update['update_id'] == 1:
+                raise ValueError('broken')
+
+        await ingress.dispatch(make_update(1, 1))
+        await ingress.dispatch(make_update(2, 1))
+        await ingress.stop()
+        with self.assertLogs(level='ERROR'):
+            await consume(backend, 0, handle, retries=2)
+        self.assertEqual(attempts, [1, 1, 2])
+        letters = ingress.dead_letters()
+        self.assertEqual(letters[0][0]['update_id'], 1)
+        self.assertEqual(letters[0][1], "ValueError('broken')")
+        with self.assertRaises(queue.Empty):
+            backend.get(0, timeout=0)
+
+    async def test_no_retry_after_send(self) -> None:
+        """
+        Test failures after a send.
+
+        Asserts that an update failing after it sent a message is set
+        aside without a retry, while earlier failures are retried.
+        """
+        backend = QueueBackend(1, 10)
+        ingress = Ingress(backend)
+        messages = []
+
+        async def handle(update):
+            if update['update_id'] == 1:
+                messages.append(update['update_id'])
+            raise ValueError('broken')
+
+        await ingress.dispatch(make_update(1, 1))
+        await ingress.dispatch(make_update(2, 1))
+        await ingress.stop()
+        with self.assertLogs(level='ERROR') as logs:
+            await consume(backend, 0, handle, retries=3,
+                          sent=lambda: len(messages))
+        self.assertEqual(messages, [1])
+        self.assertEqual(len(logs.records), 4)
+        letters = ingress.dead_letters()
+        self.assertEqual([letter[0]['update_id'] for letter in letters],
+                         [1, 2])
+
+    async def test_stop_full_partition(self) -> None:
+        """
+        Test stopping with a full partition.
+
+        Asserts that stopping does not hang when a worker stopped
+        taking updates, and reports its partition.
+        """
+        ingress = Ingress(QueueBackend(2, 1), timeout=0.01)
+        await ingress.dispatch(make_update(1, 1))
+        with self.assertLogs(level='WARNING'):
+            self.assertEqual(await ingress.stop(), [1])
+
+
+class FakeBot:
+    """Stand-in for the bot returning queued polling results."""
+
+    def __init__(self, *results):
+        """
+        Initialize the stand-in.
+
+        Args:
+            *results: Lists of updates to return or errors to raise.
+        """
+        self.results = list(results)
+        self.calls = []
+
+    async def delete_webhook(self):
+        """Record the deletion of the webhook."""
+        self.calls.append('delete_webhook')
+
+    async def get_updates(self, offset=None, timeout=None):
+        """
+        Return the next queued result.
+
+        Args:
+            offset (int, optional): The first update to return.
+            timeout (int, optional): The long-polling timeout.
+
+        Returns:
+            list: The queued updates.
+
+        Raises:
+            Exception: The queued error, or CancelledError once the
+                results are exhausted.
+        """
+        self.calls.append(offset)
+        if not self.results:
+            raise asyncio.CancelledError
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class FakeIngress:
+    """Stand-in for the ingress accepting every update."""
+
+    def __init__(self):
+        """Initialize the stand-in."""
+        self.updates = []
+
+    async def dispatch(self, update):
+        """
+        Accept an update.
+
+        Args:
+            update (dict): The raw update.
+
+        Returns:
+            bool: Always True.
+        """
+        self.updates.append(update)
+        return True
+
+
+@skipUnless(AIOGRAM_INSTALLED, 'requires the bot dependencies')
+class PollingTest(SimpleTestCase):
+    """Test case class for polling updates into the ingress."""
+
+    async def test_errors(self) -> None:
+        """
+        Test polling errors.
+
+        Asserts that the webhook is deleted before polling and that a
+        network error is retried instead of ending the polling.
+        """
+        error = TelegramNetworkError(method=None, message='down')
+        bot = FakeBot(error, error, [Update(update_id=7)])
+        ingress = FakeIngress()
+        with self.assertLogs(level='WARNING') as logs:
+            with self.assertRaises(asyncio.CancelledError):
+                await poll_updates(bot, ingress, backoff=0.01)
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(bot.calls, ['delete_webhook', None, None, None, 8])
+        self.assertEqual(ingress.updates, [{'update_id': 7}])
@@ -0,0 +1,57 @@
+"""Module for test on the webhook mode of the bot."""
+from importlib.util import find_spec
+from types import SimpleNamespace
+from unittest import skipUnless
+
+from django.test import SimpleTestCase
+
+
+# The bot dependencies are not part of the Django image.
+AIOGRAM_INSTALLED = find_spec('aiogram') is not None
+if AIOGRAM_INSTALLED:
+    from aiogram import Bot, Dispatcher
+    from aiohttp.test_utils import TestClient, TestServer
+
+    from Bot.webhook import UpdateLimiter, create_webhook_app
+
+
+class FakeSender:
+    """Stand-in for the outbound sender reporting fixed metrics."""
+
+    def stats(self) -> dict:
+        """
+        Get the metrics of the sender.
+
+        Returns:
+            dict: The fixed metrics.
+        """
+        return {'queued': 0}
+
+
+@skipUnless(AIOGRAM_INSTALLED, 'requires the bot dependencies')
+class HealthTest(SimpleTestCase):
+    """Test case class for the health check of the webhook app."""
+
+    async def test_health(self) -> None:
+        """
+        Test the health check.
+
+        Asserts that the app reports not ready until the menu tree is
+        loaded, along with the updates in flight and sender metrics.
+        """
+        menu = SimpleNamespace(tree=None)
+        app = create_webhook_app(
+            Dispatcher(), Bot('42:TEST'), menu, UpdateLimiter(4),
+            '/webhook', sender=FakeSender(),
+        )
+        async with TestClient(TestServer(app)) as client:
+            response = await client.get('/health')
+            self.assertEqual(response.status, 503)
+            self.assertFalse((await response.json())['ready'])
+
+            menu.tree = []
+            response = await client.get('/health')
+            self.assertEqual(response.status, 200)
+            self.assertEqual(await response.json(), {
+                'ready': True, 'in_flight': 0, 'sender': {'queued': 0},
+            })
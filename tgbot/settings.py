@@ -38,6 +38,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'app.middleware.QueryMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -66,12 +67,24 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'tgbot.wsgi.application'
+ASGI_APPLICATION = 'tgbot.asgi.application'
+
+# Set to 'asgi' when served by tgbot.asgi, see gunicorn.conf.py.
+DJANGO_SERVER = getenv('DJANGO_SERVER', 'wsgi')
+# Serve plain tree reads from async views under ASGI.
+MENU_ASYNC_READS = DJANGO_SERVER == 'asgi'
+# The number of server processes, also read by gunicorn.conf.py.
+WEB_CONCURRENCY = int(getenv('WEB_CONCURRENCY', '1'))
 
 
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
 
+# Set to 'transaction' behind a transaction-mode pooler such as
+# PgBouncer, or to 'session' behind a session-mode one.
+POSTGRES_POOLER = getenv('POSTGRES_POOLER', '')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -80,7 +93,21 @@ DATABASES = {
         'PASSWORD': getenv('POSTGRES_PASSWORD'),
         'HOST': getenv('POSTGRES_HOST'),
         'PORT': getenv('POSTGRES_PORT'),
-        'OPTIONS': {'options': '-c search_path=public,django_db'},
+        # Under ASGI every request runs its queries in its own thread,
+        # so persistent connections are not reused there.
+        'CONN_MAX_AGE': int(getenv(
+            'POSTGRES_CONN_MAX_AGE', '0' if MENU_ASYNC_READS else '60',
+        )),
+        'CONN_HEALTH_CHECKS': getenv(
+            'POSTGRES_CONN_HEALTH_CHECKS', 'True',
+        ) == 'True',
+        # Server-side cursors do not survive transaction pooling.
+        'DISABLE_SERVER_SIDE_CURSORS': POSTGRES_POOLER == 'transaction',
+        # Poolers reject startup options, the search_path is then taken
+        # from the database defaults set in init_db.sql.
+        'OPTIONS': {} if POSTGRES_POOLER else {
+            'options': '-c search_path=public,django_db',
+        },
         'TEST': {
             'NAME': 'test_db',
         },
@@ -88,6 +115,45 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+# The menu cache holds the tree version, so it must be shared by
+# several workers, e.g. django.core.cache.backends.db.DatabaseCache
+# with MENU_CACHE_LOCATION naming its table.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'menu': {
+        'BACKEND': getenv(
+            'MENU_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': getenv('MENU_CACHE_LOCATION', 'menu'),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(getenv('MENU_CACHE_MAX_ENTRIES', '1000')),
+        },
+    },
+}
+MENU_CACHE_ALIAS = 'menu'
+MENU_CACHE_LOCAL_ENTRIES = int(getenv('MENU_CACHE_LOCAL_ENTRIES', '128'))
+MENU_CACHE_TIMEOUT = int(getenv('MENU_CACHE_TIMEOUT', '3600'))
+MENU_COMPRESS = getenv('MENU_COMPRESS', 'True') == 'True'
+MENU_COMPRESS_MIN_SIZE = int(getenv('MENU_COMPRESS_MIN_SIZE', '1024'))
+MENU_AUTH_CACHE_ENTRIES = int(getenv('MENU_AUTH_CACHE_ENTRIES', '1024'))
+# Tokens are cached per worker, so a revoked token is still accepted by
+# other workers for up to MENU_AUTH_CACHE_TIMEOUT seconds.
+MENU_AUTH_CACHE_TIMEOUT = float(getenv('MENU_AUTH_CACHE_TIMEOUT', '10'))
+MENU_QUERY_BUDGET = int(getenv('MENU_QUERY_BUDGET', '10'))
+# Bearer token of /metrics; without it only staff users may read them.
+MENU_METRICS_TOKEN = getenv('MENU_METRICS_TOKEN', '')
+MENU_SNAPSHOT_PATH = getenv('MENU_SNAPSHOT_PATH')
+MENU_NOTIFY_URL = getenv('MENU_NOTIFY_URL')
+MENU_NOTIFY_TOKEN = getenv('MENU_NOTIFY_TOKEN', '')
+MENU_NOTIFY_TIMEOUT = float(getenv('MENU_NOTIFY_TIMEOUT', '1'))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 